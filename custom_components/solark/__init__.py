@@ -2,7 +2,9 @@
 from __future__ import annotations
 
 import asyncio
+import inspect
 import logging
+import time
 from datetime import timedelta
 from typing import Any, TYPE_CHECKING
 
@@ -22,11 +24,17 @@ from .const import (
     CONF_API_URL,
     CONF_SCAN_INTERVAL,
     CONF_ALLOW_WRITE,
+    CONF_WORKDATA_FIELDS,
+    CONF_EXTENDED_GROUPS,
+    CONF_EXTENDED_INTERVAL,
     DEFAULT_BASE_URL,
     DEFAULT_API_URL,
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_ALLOW_WRITE,
+    DEFAULT_EXTENDED_INTERVAL,
     PLATFORMS,
+    POLL_DEADLINE_FRACTION,
+    POLL_DEADLINE_MIN,
 )
 from .services import CONFIGURE_INVERTER_SCHEMA, build_api_updates
 
@@ -38,6 +46,26 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     return True
 
 
+def _cycle_budget(coordinator: DataUpdateCoordinator) -> float | None:
+    """Deadline for one update cycle, derived from the coordinator interval."""
+    if coordinator.update_interval is None:
+        return None
+    return max(
+        coordinator.update_interval.total_seconds() * POLL_DEADLINE_FRACTION,
+        POLL_DEADLINE_MIN,
+    )
+
+
+def _update_failed(err: Exception) -> Exception:
+    """UpdateFailed for an API error, honoring a rate limit's Retry-After."""
+    from homeassistant.helpers.update_coordinator import UpdateFailed
+
+    retry_after = getattr(err, "retry_after", None)
+    if retry_after and "retry_after" in inspect.signature(UpdateFailed).parameters:
+        return UpdateFailed(str(err), retry_after=retry_after)
+    return UpdateFailed(str(err))
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up SolArk from a config entry."""
     from homeassistant.helpers.aiohttp_client import async_get_clientsession
@@ -46,8 +74,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         UpdateFailed,
     )
 
-    from .solark_client import SolArkCloudAPI
+    from .backfill import SolArkHistoryBackfill
+    from .coordinator import SolArkDataUpdateCoordinator
+    from .energy_import import SolArkEnergyImport
+    from .gateway import SolArkGatewayMonitor
+    from .snapshot_store import SolArkSnapshotStore
+    from .solark_blocking import BlockingMonitor
+    from .solark_client import LEG_OK, SolArkCloudAPI
+    from .solark_deadline import deadline_scope
     from .solark_errors import SolArkCloudAPIError
+    from .solark_snapshot import PlantSnapshot
     hass.data.setdefault(DOMAIN, {})
 
     username = entry.data[CONF_USERNAME]
@@ -85,32 +121,70 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         session=session,
         timezone=hass.config.time_zone,
     )
-    await api.prime_inverters_cache()
 
-    async def async_update_data() -> dict[str, Any]:
+    snapshot_store = SolArkSnapshotStore(hass, entry.entry_id)
+    await snapshot_store.async_load()
+    backfill = SolArkHistoryBackfill(hass, entry, api)
+    await backfill.async_load()
+    energy_import = SolArkEnergyImport(hass, entry, api)
+    await energy_import.async_load()
+    # Flags callbacks that hold the event loop (reported in diagnostics)
+    blocking = BlockingMonitor()
+    entry.async_on_unload(blocking.close)
+
+    @blocking.coroutine("async_update_data")
+    async def async_update_data() -> PlantSnapshot:
         """Fetch and parse data from SolArk."""
+        if gateway.offline and coordinator.data is not None:
+            # Dongle offline: the cloud only has frozen data, skip the legs.
+            return api.stale_snapshot(coordinator.data)
         try:
-            raw = await api.get_plant_data()
-            parsed = api.parse_plant_data(raw)
-            return parsed
+            # Bound the whole cycle (auth included) so it never overruns a tick.
+            with api.tracer.trace("poll_cycle"):
+                with deadline_scope(_cycle_budget(coordinator)):
+                    raw = await api.get_plant_data()
+                legs = raw.get("legStatus", {})
+                if LEG_OK not in legs.values():
+                    # Parsing nothing would publish (and persist) zeros.
+                    raise UpdateFailed(f"No SolArk data source answered: {legs}")
+                with blocking.section("parse_plant_data"):
+                    snapshot = api.parse_plant_snapshot(raw)
         except SolArkCloudAPIError as err:
-            raise UpdateFailed(str(err)) from err
+            raise _update_failed(err) from err
+        snapshot_store.async_set_data(
+            snapshot.to_compact(), api.export_status_cache()
+        )
+        if api.export_workdata_catalogs() != snapshot_store.catalogs:
+            snapshot_store.async_set_catalogs(api.export_workdata_catalogs())
+        if gap := raw.get("workdataGap"):
+            # Workdata records skipped by a cursor reseed never reach the
+            # integrated energy sensors; rebuild them from history instead.
+            backfill.async_note_gap(*gap)
+        backfill.async_note_success(snapshot.sampled_at)
+        return snapshot
 
     async def async_update_settings() -> dict[str, Any]:
         """Fetch master inverter settings for configuration entities."""
         try:
-            sn, settings = await api.get_master_common_settings()
-            return {"sn": sn, "settings": settings}
+            with deadline_scope(_cycle_budget(settings_coordinator)):
+                sn, settings = await api.get_master_common_settings()
         except SolArkCloudAPIError as err:
-            raise UpdateFailed(str(err)) from err
+            raise _update_failed(err) from err
+        result = {"sn": sn, "settings": settings}
+        snapshot_store.async_set_settings(result)
+        return result
 
-    coordinator = DataUpdateCoordinator(
+    coordinator = SolArkDataUpdateCoordinator(
         hass,
         _LOGGER,
         name=f"SolArk {plant_id}",
         update_method=async_update_data,
         update_interval=timedelta(seconds=scan_interval),
+        # Skip listener fan-out when a poll returns an identical snapshot.
+        always_update=False,
+        blocking=blocking,
     )
+    gateway = SolArkGatewayMonitor(hass, entry, api, coordinator)
     settings_coordinator = DataUpdateCoordinator(
         hass,
         _LOGGER,
@@ -119,13 +193,88 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         update_interval=timedelta(seconds=max(scan_interval, 300)),
     )
 
-    await coordinator.async_config_entry_first_refresh()
-    await settings_coordinator.async_config_entry_first_refresh()
+    # Opt-in extended telemetry tier (dy/store live data) on its own interval
+    extended_groups = list(entry.options.get(CONF_EXTENDED_GROUPS, []))
+    extended_coordinator: DataUpdateCoordinator | None = None
+    if extended_groups:
+
+        async def async_update_extended() -> dict[str, float]:
+            """Fetch the enabled extended telemetry groups."""
+            try:
+                with deadline_scope(_cycle_budget(extended_coordinator)):
+                    return await api.get_extended_data(extended_groups)
+            except SolArkCloudAPIError as err:
+                raise _update_failed(err) from err
+
+        extended_coordinator = DataUpdateCoordinator(
+            hass,
+            _LOGGER,
+            name=f"SolArk {plant_id} Extended",
+            update_method=async_update_extended,
+            update_interval=timedelta(
+                seconds=int(
+                    entry.options.get(CONF_EXTENDED_INTERVAL, DEFAULT_EXTENDED_INTERVAL)
+                )
+            ),
+            **coordinator_kwargs,
+        )
+        entry.async_create_background_task(
+            hass,
+            extended_coordinator.async_refresh(),
+            f"{DOMAIN}_{entry.entry_id}_extended_refresh",
+        )
+
+    # Restore the retained status values so parse_plant_data keeps riding
+    # through data gaps across restarts.
+    api.restore_status_cache(snapshot_store.status_cache)
+    api.restore_workdata_catalogs(snapshot_store.catalogs)
+    api.set_workdata_fields(list(entry.options.get(CONF_WORKDATA_FIELDS, [])))
+    data_age = snapshot_store.age("data")
+    cached_data = PlantSnapshot.restore(
+        snapshot_store.data,
+        sampled_at=None if data_age is None else time.time() - data_age,
+    )
+    cached_settings = snapshot_store.settings
+    if cached_data is not None:
+        # Warm start: publish the last snapshot right away and let the first
+        # refreshes (and inverter/master discovery) run in the background.
+        _LOGGER.debug(
+            "Warm starting SolArk entry %s from snapshot (data age %ds, settings age %s)",
+            entry.entry_id,
+            cached_data.age,
+            snapshot_store.age("settings"),
+        )
+        coordinator.data = api.restore_snapshot(cached_data)
+        if cached_settings is not None:
+            settings_coordinator.data = cached_settings
+            if cached_settings.get("sn"):
+                api.seed_master_sn(cached_settings["sn"])
+        entry.async_create_background_task(
+            hass, api.discover_master(), f"{DOMAIN}_{entry.entry_id}_discovery"
+        )
+        entry.async_create_background_task(
+            hass,
+            _async_refresh_all(coordinator, settings_coordinator),
+            f"{DOMAIN}_{entry.entry_id}_first_refresh",
+        )
+    else:
+        # Cold start: nothing to show yet, so wait for both refreshes (run
+        # concurrently) to keep ConfigEntryNotReady retry semantics.
+        await asyncio.gather(
+            coordinator.async_config_entry_first_refresh(),
+            settings_coordinator.async_config_entry_first_refresh(),
+        )
 
     hass.data[DOMAIN][entry.entry_id] = {
         "api": api,
         "coordinator": coordinator,
         "settings_coordinator": settings_coordinator,
+        "extended_coordinator": extended_coordinator,
+        "gateway": gateway,
+        "snapshot_store": snapshot_store,
+        "backfill": backfill,
+        "energy_import": energy_import,
+        "blocking": blocking,
         "allow_write_access": allow_write_access,
         "settings_refresh_task": None,
     }
@@ -135,6 +284,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # Continue a statistics backfill interrupted by a restart.
+    backfill.async_resume()
+    energy_import.async_start()
+    gateway.async_start()
 
     # Register the configure_inverter service
     async def handle_configure_inverter(call: ServiceCall) -> None:
@@ -199,6 +352,29 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted data when a config entry is deleted."""
+    from .backfill import SolArkHistoryBackfill
+    from .coordinator import SolArkDataUpdateCoordinator
+    from .energy_import import SolArkEnergyImport
+    from .snapshot_store import SolArkSnapshotStore
+
+    await SolArkSnapshotStore(hass, entry.entry_id).async_remove()
+    await SolArkHistoryBackfill(hass, entry, None).async_remove()
+    await SolArkEnergyImport(hass, entry, None).async_remove()
+
+
+async def _async_refresh_all(
+    coordinator: DataUpdateCoordinator,
+    settings_coordinator: DataUpdateCoordinator,
+) -> None:
+    """Refresh plant data and settings concurrently."""
+    await asyncio.gather(
+        coordinator.async_refresh(),
+        settings_coordinator.async_refresh(),
+    )
+
+
 async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Migrate config entries to the latest version."""
     from homeassistant.helpers import entity_registry as er
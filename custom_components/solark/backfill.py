@@ -0,0 +1,357 @@
+"""Backfill long-term energy statistics after SolArk data outages."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, tzinfo
+from typing import Any, TYPE_CHECKING
+
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    BACKFILL_MAX_DAYS,
+    BACKFILL_MIN_GAP,
+    BACKFILL_STORAGE_VERSION,
+    DOMAIN,
+    SNAPSHOT_SAVE_INTERVAL,
+)
+from .solark_errors import SolArkCloudAPIError
+from .solark_history import hourly_energy, records_to_samples
+from .solark_logging import get_logger
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+    from .solark_client import SolArkCloudAPI
+
+_LOGGER = get_logger(__name__)
+
+_HOUR = timedelta(hours=1)
+
+
+def _floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil_hour(value: datetime) -> datetime:
+    floored = _floor_hour(value)
+    return floored if floored == value else floored + _HOUR
+
+
+def _compute_hourly(
+    records: list[dict[str, Any]],
+    tz: tzinfo,
+    power_keys: dict[str, str],
+    start: datetime,
+    end: datetime,
+) -> dict[str, list[tuple[datetime, float]]]:
+    """Hourly energy for whole hours in [start, end) (runs in the executor)."""
+    samples = [
+        sample
+        for sample in records_to_samples(records, tz)
+        if start <= sample[0] <= end
+    ]
+    hourly = hourly_energy(samples, power_keys)
+    return {
+        key: [(hour, kwh) for hour, kwh in rows if start <= hour and hour + _HOUR <= end]
+        for key, rows in hourly.items()
+    }
+
+
+class SolArkHistoryBackfill:
+    """Detect polling gaps and fill the integrated energy statistics.
+
+    Every successful poll records its sample time. When the next success comes
+    more than BACKFILL_MIN_GAP later, the whole hours in between are queued,
+    as are ranges reported through async_note_gap (workdata records skipped
+    while only the workdata leg failed). Separate gaps stay separate ranges
+    and are filled one after another.
+    Workdata for the gap is then fetched one local day at a time, converted to
+    hourly kWh in the executor and imported into the recorder statistics of
+    the integrated energy sensors. Later statistics are shifted by the imported
+    amount so sums stay continuous. The cursor and running sums are persisted,
+    so an interrupted backfill resumes where it stopped. Routine success
+    times are written at most once per SNAPSHOT_SAVE_INTERVAL; queue and
+    cursor changes are written right away.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, api: SolArkCloudAPI
+    ) -> None:
+        self._hass = hass
+        self._entry = entry
+        self._api = api
+        self._store: Store = Store(
+            hass,
+            BACKFILL_STORAGE_VERSION,
+            f"{DOMAIN}.{entry.entry_id}.backfill",
+        )
+        self._state: dict[str, Any] = {}
+        self._running = False
+        self._save_pending = False
+        self._last_save: datetime | None = None
+
+    async def async_load(self) -> None:
+        try:
+            stored = await self._store.async_load()
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.warning("Unable to load SolArk backfill state: %s", err)
+            stored = None
+        self._state = stored if isinstance(stored, dict) else {}
+
+    @property
+    def pending(self) -> dict[str, Any] | None:
+        pending = self._state.get("pending")
+        return pending if isinstance(pending, dict) else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """State for diagnostics."""
+        return {
+            "last_success": self._state.get("last_success"),
+            "pending": self.pending,
+            "queued": self._state.get("queued") or [],
+            "running": self._running,
+        }
+
+    def async_note_success(self, sampled_at: float) -> None:
+        """Record a successful poll and queue a backfill after a long gap."""
+        last = self._state.get("last_success")
+        self._state["last_success"] = sampled_at
+        queued = False
+        if isinstance(last, (int, float)) and sampled_at - last >= BACKFILL_MIN_GAP:
+            queued = self._queue(
+                dt_util.utc_from_timestamp(last),
+                dt_util.utc_from_timestamp(sampled_at),
+            )
+        self._async_schedule_save(immediate=queued)
+        self.async_resume()
+
+    def async_note_gap(self, start: float, end: float) -> None:
+        """Queue a range the live energy sensors missed (e.g. workdata down)."""
+        queued = self._queue(
+            dt_util.utc_from_timestamp(start), dt_util.utc_from_timestamp(end)
+        )
+        if queued:
+            self._async_schedule_save(immediate=True)
+        self.async_resume()
+
+    def async_resume(self) -> None:
+        """Start (or continue) a queued backfill in the background."""
+        if self._running or self.pending is None:
+            return
+        if "recorder" not in self._hass.config.components:
+            return
+        self._running = True
+        self._entry.async_create_background_task(
+            self._hass,
+            self._async_run(),
+            f"{DOMAIN}_{self._entry.entry_id}_backfill",
+        )
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
+
+    def _async_schedule_save(self, immediate: bool = False) -> None:
+        if immediate:
+            self._store.async_delay_save(self._data_to_save, 0)
+            return
+        if self._save_pending:
+            # A save is already queued and will pick up the newest state.
+            return
+        delay = 0.0
+        if self._last_save is not None:
+            elapsed = (dt_util.utcnow() - self._last_save).total_seconds()
+            delay = max(SNAPSHOT_SAVE_INTERVAL - elapsed, 0.0)
+        self._save_pending = True
+        self._store.async_delay_save(self._data_to_save, delay)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        self._save_pending = False
+        self._last_save = dt_util.utcnow()
+        return self._state
+
+    def _queue(self, gap_start: datetime, gap_end: datetime) -> bool:
+        """Queue the whole hours of a gap; return whether anything changed."""
+        start = _ceil_hour(
+            max(gap_start, gap_end - timedelta(days=BACKFILL_MAX_DAYS))
+        )
+        end = _floor_hour(gap_end)
+        if end <= start:
+            return False
+        pending = self.pending
+        queued: list[list[str]] = self._state.setdefault("queued", [])
+        last_end: datetime | None = None
+        if queued:
+            last_end = dt_util.parse_datetime(queued[-1][1])
+        elif pending is not None:
+            last_end = dt_util.parse_datetime(pending["end"])
+        if last_end is not None and start <= last_end:
+            # Overlaps or touches the latest range: extend it. Ranges that
+            # are apart stay separate, so the hours between them (recorded
+            # by live polling) are not imported twice.
+            end = max(end, last_end)
+            if queued:
+                queued[-1][1] = end.isoformat()
+            else:
+                pending["end"] = end.isoformat()
+            return True
+        _LOGGER.info(
+            "SolArk data gap from %s to %s; backfilling energy statistics",
+            start,
+            end,
+        )
+        if pending is not None:
+            queued.append([start.isoformat(), end.isoformat()])
+        else:
+            self._start(start, end)
+        return True
+
+    def _start(self, start: datetime, end: datetime) -> None:
+        self._state["pending"] = {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "cursor": start.isoformat(),
+            "sums": {},
+        }
+
+    def _next(self) -> None:
+        """Finish the current range and start the next queued one."""
+        self._state.pop("pending", None)
+        queued = self._state.get("queued") or []
+        while queued:
+            start, end = (dt_util.parse_datetime(value) for value in queued.pop(0))
+            if start is not None and end is not None and start < end:
+                self._start(start, end)
+                return
+
+    async def _async_run(self) -> None:
+        try:
+            while (pending := self.pending) is not None:
+                cursor = dt_util.parse_datetime(pending["cursor"])
+                end = dt_util.parse_datetime(pending["end"])
+                if cursor is None or end is None or cursor >= end:
+                    self._next()
+                else:
+                    await self._async_backfill_day(pending, cursor, end)
+                self._async_schedule_save(immediate=True)
+        except SolArkCloudAPIError as err:
+            # Keep the cursor; the next successful poll resumes the backfill.
+            _LOGGER.warning("SolArk statistics backfill paused: %s", err)
+        finally:
+            self._running = False
+
+    async def _async_backfill_day(
+        self, pending: dict[str, Any], cursor: datetime, end: datetime
+    ) -> None:
+        from .sensor import INTEGRATED_ENERGY_DESCRIPTIONS
+
+        tz = dt_util.get_time_zone(self._hass.config.time_zone) or dt_util.UTC
+        local = cursor.astimezone(tz)
+        day = local.date()
+        next_day = datetime.combine(day + timedelta(days=1), datetime.min.time(), tz)
+        window_end = min(end, next_day.astimezone(dt_util.UTC))
+
+        sn = await self._api.discover_master()
+        if not sn:
+            raise SolArkCloudAPIError("Master inverter not available for backfill")
+        records = await self._api.get_workdata_history(sn, day)
+        power_keys = {
+            desc.key: desc.source_key for desc in INTEGRATED_ENERGY_DESCRIPTIONS
+        }
+        hourly = await self._hass.async_add_executor_job(
+            _compute_hourly, records, tz, power_keys, cursor, window_end
+        )
+        _LOGGER.debug(
+            "Backfilling %s (%d records) into %s..%s",
+            day,
+            len(records),
+            cursor,
+            window_end,
+        )
+        await self._async_import(pending, cursor, window_end, hourly)
+        pending["cursor"] = window_end.isoformat()
+
+    async def _async_import(
+        self,
+        pending: dict[str, Any],
+        start: datetime,
+        end: datetime,
+        hourly: dict[str, list[tuple[datetime, float]]],
+    ) -> None:
+        from homeassistant.components.recorder import get_instance
+        from homeassistant.components.recorder.statistics import (
+            async_adjust_statistics,
+            async_import_statistics,
+            statistics_during_period,
+        )
+
+        registry = er.async_get(self._hass)
+        sums: dict[str, list[float]] = pending.setdefault("sums", {})
+        for key, rows in hourly.items():
+            entity_id = registry.async_get_entity_id(
+                "sensor", DOMAIN, f"{self._entry.entry_id}_{key}"
+            )
+            if not entity_id or not rows:
+                continue
+            if entity_id not in sums:
+                # Anchor on the last statistics row before the gap.
+                base_hour = dt_util.parse_datetime(pending["start"]) - _HOUR
+                base = await get_instance(self._hass).async_add_executor_job(
+                    statistics_during_period,
+                    self._hass,
+                    base_hour,
+                    base_hour + _HOUR,
+                    {entity_id},
+                    "hour",
+                    None,
+                    {"sum", "state"},
+                )
+                base_rows = base.get(entity_id) or []
+                if not base_rows or base_rows[-1].get("sum") is None:
+                    _LOGGER.debug("No statistics before gap for %s; skipping", entity_id)
+                    continue
+                sums[entity_id] = [
+                    float(base_rows[-1]["sum"]),
+                    float(base_rows[-1].get("state") or 0.0),
+                ]
+            total, state = sums[entity_id]
+            # Every whole hour in the window gets a row, even without samples.
+            energy = dict(rows)
+            statistics = []
+            added = 0.0
+            hour = start
+            while hour + _HOUR <= end:
+                added += energy.get(hour, 0.0)
+                statistics.append(
+                    {"start": hour, "state": state, "sum": total + added}
+                )
+                hour += _HOUR
+            async_import_statistics(
+                self._hass, statistic_metadata(entity_id), statistics
+            )
+            if added:
+                # Shift everything recorded after the window (including
+                # short-term rows) so the cumulative sum stays monotonic.
+                async_adjust_statistics(self._hass, entity_id, end, added, "kWh")
+            sums[entity_id] = [total + added, state]
+
+
+def statistic_metadata(
+    statistic_id: str, source: str = "recorder", name: str | None = None
+) -> dict[str, Any]:
+    """Metadata for a kWh sum statistic (entity or external)."""
+    metadata: dict[str, Any] = {
+        "has_mean": False,
+        "has_sum": True,
+        "name": name,
+        "source": source,
+        "statistic_id": statistic_id,
+        "unit_of_measurement": "kWh",
+    }
+    try:
+        from homeassistant.components.recorder.models import StatisticMeanType
+    except ImportError:
+        return metadata
+    metadata["mean_type"] = StatisticMeanType.NONE
+    return metadata
@@ -8,10 +8,13 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .solark_client import SolArkCloudAPI
 from .solark_errors import SolArkCloudAPIError
+from .solark_extended import EXTENDED_GROUPS
+from .solark_workdata import parse_field
 from .const import (
     DOMAIN,
     CONF_USERNAME,
@@ -21,10 +24,14 @@ from .const import (
     CONF_API_URL,
     CONF_SCAN_INTERVAL,
     CONF_ALLOW_WRITE,
+    CONF_WORKDATA_FIELDS,
+    CONF_EXTENDED_GROUPS,
+    CONF_EXTENDED_INTERVAL,
     DEFAULT_BASE_URL,
     DEFAULT_API_URL,
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_ALLOW_WRITE,
+    DEFAULT_EXTENDED_INTERVAL,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -151,13 +158,56 @@ class SolArkOptionsFlowHandler(config_entries.OptionsFlow):
                         ),
                     ),
                 ): bool,
+                vol.Optional(
+                    CONF_EXTENDED_GROUPS,
+                    default=self._config_entry.options.get(CONF_EXTENDED_GROUPS, []),
+                ): cv.multi_select(EXTENDED_GROUPS),
+                vol.Optional(
+                    CONF_EXTENDED_INTERVAL,
+                    default=self._config_entry.options.get(
+                        CONF_EXTENDED_INTERVAL, DEFAULT_EXTENDED_INTERVAL
+                    ),
+                ): int,
             }
         )
 
+        field_options = self._workdata_field_options()
+        if field_options:
+            options_schema = options_schema.extend(
+                {
+                    vol.Optional(
+                        CONF_WORKDATA_FIELDS,
+                        default=[
+                            field
+                            for field in self._config_entry.options.get(
+                                CONF_WORKDATA_FIELDS, []
+                            )
+                            if field in field_options
+                        ],
+                    ): cv.multi_select(field_options),
+                }
+            )
+
         return self.async_show_form(
             step_id="init",
             data_schema=options_schema,
         )
 
+    def _workdata_field_options(self) -> dict[str, str]:
+        """Catalog fields (from the running entry) offered as extra sensors."""
+        data = self.hass.data.get(DOMAIN, {}).get(self._config_entry.entry_id, {})
+        api = data.get("api")
+        options: dict[str, str] = {}
+        if api is not None:
+            for catalog in api.export_workdata_catalogs().values():
+                for key, meta in catalog.items():
+                    unit = meta.get("unit")
+                    name = meta.get("name") or key
+                    options[key] = f"{name} ({unit})" if unit else name
+        # Keep already selected fields even if the catalog is not loaded.
+        for key in self._config_entry.options.get(CONF_WORKDATA_FIELDS, []):
+            options.setdefault(key, parse_field(key).name)
+        return dict(sorted(options.items(), key=lambda item: item[1].lower()))
+
     def _get_config_entry(self) -> config_entries.ConfigEntry:
         return self._config_entry
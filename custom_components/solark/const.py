@@ -7,10 +7,40 @@ CONF_BASE_URL = "base_url"
 CONF_API_URL = "api_url"
 CONF_SCAN_INTERVAL = "scan_interval"
 CONF_ALLOW_WRITE = "allow_write_access"
+CONF_WORKDATA_FIELDS = "workdata_fields"
+CONF_EXTENDED_GROUPS = "extended_groups"
+CONF_EXTENDED_INTERVAL = "extended_interval"
 
 DEFAULT_BASE_URL = "https://www.mysolark.com"
 DEFAULT_API_URL = "https://ecsprod-api-new.solarkcloud.com"
+# Legacy login and workdata are served by this host for the default api_url;
+# any other api_url (a proxy or local simulator) is used for them as well
+LEGACY_API_URL = "https://api.solarkcloud.com"
 DEFAULT_SCAN_INTERVAL = 30  # seconds
 DEFAULT_ALLOW_WRITE = False
+DEFAULT_EXTENDED_INTERVAL = 300  # seconds
 
 PLATFORMS = ["sensor"]
+
+# Persisted last-known snapshot used for warm starts
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_SAVE_INTERVAL = 300  # seconds, minimum time between disk writes
+
+# Long-term statistics backfill after polling gaps
+BACKFILL_STORAGE_VERSION = 1
+BACKFILL_MIN_GAP = 3600  # seconds without a successful poll before backfilling
+BACKFILL_MAX_DAYS = 7  # never reach further back than this
+
+# Server-computed plant energy (day/month/year) imported as statistics
+ENERGY_IMPORT_STORAGE_VERSION = 1
+ENERGY_IMPORT_INTERVAL = 6 * 3600  # seconds between imports
+ENERGY_IMPORT_MONTHS = 24  # history reached on the first import
+
+# Gateway (dongle) health gating
+GATEWAY_CHECK_INTERVAL = 300  # seconds between checks while online
+GATEWAY_OFFLINE_CHECK_INTERVAL = 60  # seconds between checks while offline
+GATEWAY_OFFLINE_POLL_INTERVAL = 600  # plant data interval while offline
+
+# Poll cycle deadline: a share of the update interval, never below the minimum
+POLL_DEADLINE_FRACTION = 0.8
+POLL_DEADLINE_MIN = 10  # seconds
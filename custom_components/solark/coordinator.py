@@ -0,0 +1,24 @@
+"""Plant data coordinator for SolArk."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .solark_blocking import BlockingMonitor
+
+
+class SolArkDataUpdateCoordinator(DataUpdateCoordinator):
+    """DataUpdateCoordinator whose listener fan-out is timed by ``blocking``.
+
+    Entity callbacks run synchronously inside async_update_listeners, so a
+    slow one shows up as a ``listener_fanout`` section in diagnostics.
+    """
+
+    def __init__(self, *args: Any, blocking: BlockingMonitor, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._blocking = blocking
+
+    def async_update_listeners(self) -> None:
+        with self._blocking.section("listener_fanout"):
+            super().async_update_listeners()
@@ -8,6 +8,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN, CONF_PASSWORD, CONF_USERNAME
+from .solark_snapshot import FIELDS as SNAPSHOT_FIELDS
 
 TO_REDACT = {CONF_PASSWORD, CONF_USERNAME}
 
@@ -18,6 +19,11 @@ async def async_get_config_entry_diagnostics(
     """Return diagnostics for a config entry."""
     data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
     coordinator = data.get("coordinator")
+    snapshot_store = data.get("snapshot_store")
+    backfill = data.get("backfill")
+    energy_import = data.get("energy_import")
+    gateway = data.get("gateway")
+    blocking = data.get("blocking")
 
     diag: dict[str, Any] = {
         "entry": {
@@ -28,9 +34,37 @@ async def async_get_config_entry_diagnostics(
     }
 
     if coordinator is not None:
+        snapshot = coordinator.data
         diag["coordinator"] = {
             "last_update_success": coordinator.last_update_success,
-            "data": coordinator.data,
+            "data": snapshot.as_dict() if snapshot is not None else None,
+            "sampled_at": getattr(snapshot, "sampled_at", None),
+            "stale": [
+                key for key in SNAPSHOT_FIELDS if snapshot and snapshot.is_stale(key)
+            ],
         }
+        api = data.get("api")
+        if api is not None:
+            diag["coordinator"]["last_cycle"] = api.last_cycle
+            diag["metrics"] = api.metrics.as_dict()
+            diag["traces"] = api.tracer.as_list()
+
+    if snapshot_store is not None:
+        diag["snapshot"] = {
+            "data_age": snapshot_store.age("data"),
+            "settings_age": snapshot_store.age("settings"),
+        }
+
+    if backfill is not None:
+        diag["backfill"] = backfill.as_dict()
+
+    if energy_import is not None:
+        diag["energy_import"] = energy_import.as_dict()
+
+    if gateway is not None:
+        diag["gateway"] = gateway.as_dict()
+
+    if blocking is not None:
+        diag["blocking"] = blocking.as_dict()
 
     return diag
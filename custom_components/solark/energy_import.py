@@ -0,0 +1,202 @@
+"""Import the plant's server-computed energy totals as external statistics."""
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime, timedelta
+from typing import Any, TYPE_CHECKING
+
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .backfill import statistic_metadata
+from .const import (
+    DOMAIN,
+    ENERGY_IMPORT_INTERVAL,
+    ENERGY_IMPORT_MONTHS,
+    ENERGY_IMPORT_STORAGE_VERSION,
+)
+from .solark_errors import SolArkCloudAPIError
+from .solark_history import energy_series
+from .solark_logging import get_logger
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+    from .solark_client import SolArkCloudAPI
+
+_LOGGER = get_logger(__name__)
+
+
+def _month_start(day: date, months_back: int = 0) -> date:
+    index = day.year * 12 + day.month - 1 - months_back
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class SolArkEnergyImport:
+    """Keep ``solark:<plant>_<key>_energy`` statistics in sync with the cloud.
+
+    Every ENERGY_IMPORT_INTERVAL the previous and current month's daily kWh
+    (PV, load, grid import/export, battery charge/discharge) are fetched from
+    the plant energy month endpoint and imported in bulk as external
+    statistics, one row per day. The first run walks back up to
+    ENERGY_IMPORT_MONTHS, using the year endpoint to skip months without data.
+    Daily values are persisted so cumulative sums can be rebuilt from the
+    first changed day without refetching older months.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, api: SolArkCloudAPI
+    ) -> None:
+        self._hass = hass
+        self._entry = entry
+        self._api = api
+        self._store: Store = Store(
+            hass,
+            ENERGY_IMPORT_STORAGE_VERSION,
+            f"{DOMAIN}.{entry.entry_id}.energy",
+        )
+        self._days: dict[str, dict[str, float]] = {}
+        self._last_run: str | None = None
+        self._running = False
+
+    async def async_load(self) -> None:
+        try:
+            stored = await self._store.async_load()
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.warning("Unable to load SolArk energy import state: %s", err)
+            stored = None
+        if isinstance(stored, dict):
+            days = stored.get("days")
+            self._days = days if isinstance(days, dict) else {}
+            self._last_run = stored.get("last_run")
+
+    def async_start(self) -> None:
+        """Run now (in the background) and then every ENERGY_IMPORT_INTERVAL."""
+        if "recorder" not in self._hass.config.components:
+            return
+        self._entry.async_on_unload(
+            async_track_time_interval(
+                self._hass,
+                self._async_schedule,
+                timedelta(seconds=ENERGY_IMPORT_INTERVAL),
+            )
+        )
+        self._async_schedule()
+
+    def as_dict(self) -> dict[str, Any]:
+        """State for diagnostics."""
+        return {
+            "last_run": self._last_run,
+            "running": self._running,
+            "days": {key: len(values) for key, values in self._days.items()},
+        }
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
+
+    def statistic_id(self, key: str) -> str:
+        return f"{DOMAIN}:{self._api.plant_id}_{key}_energy".lower()
+
+    def _async_schedule(self, _now: datetime | None = None) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._entry.async_create_background_task(
+            self._hass,
+            self._async_run(),
+            f"{DOMAIN}_{self._entry.entry_id}_energy_import",
+        )
+
+    async def _async_run(self) -> None:
+        try:
+            today = dt_util.now().date()
+            if self._days:
+                months = [_month_start(today, 1), _month_start(today)]
+            else:
+                months = await self._async_months_with_data(today)
+            changed = await self._async_fetch_months(months)
+            self._async_import(changed)
+            self._last_run = dt_util.utcnow().isoformat()
+            self._store.async_delay_save(self._data_to_save, 0)
+        except SolArkCloudAPIError as err:
+            _LOGGER.warning("SolArk energy import failed: %s", err)
+        finally:
+            self._running = False
+
+    async def _async_months_with_data(self, today: date) -> list[date]:
+        """Months within ENERGY_IMPORT_MONTHS whose yearly total is non-zero."""
+        first = _month_start(today, ENERGY_IMPORT_MONTHS - 1)
+        years = range(first.year, today.year + 1)
+        results = await asyncio.gather(
+            *(self._api.get_plant_energy_year(date(year, 1, 1)) for year in years)
+        )
+        months: set[date] = set()
+        for year, data in zip(years, results):
+            for values in energy_series(data, "year", date(year, 1, 1)).values():
+                months.update(
+                    month
+                    for month, kwh in values.items()
+                    if kwh and first <= month <= today
+                )
+        # Always include the current month so today's total shows up.
+        months.add(_month_start(today))
+        return sorted(months)
+
+    async def _async_fetch_months(self, months: list[date]) -> dict[str, date]:
+        """Fetch daily values; return the earliest changed day per key."""
+        semaphore = asyncio.Semaphore(4)
+
+        async def _fetch(month: date) -> dict[str, Any]:
+            async with semaphore:
+                return await self._api.get_plant_energy_month(month)
+
+        results = await asyncio.gather(*(_fetch(month) for month in months))
+        changed: dict[str, date] = {}
+        for month, data in zip(months, results):
+            for key, values in energy_series(data, "month", month).items():
+                stored = self._days.setdefault(key, {})
+                for day, kwh in values.items():
+                    day_key = day.isoformat()
+                    if stored.get(day_key) == kwh:
+                        continue
+                    stored[day_key] = kwh
+                    if key not in changed or day < changed[key]:
+                        changed[key] = day
+        return changed
+
+    def _async_import(self, changed: dict[str, date]) -> None:
+        from homeassistant.components.recorder.statistics import (
+            async_add_external_statistics,
+        )
+
+        tz = dt_util.get_time_zone(self._hass.config.time_zone) or dt_util.UTC
+        for key, first_changed in changed.items():
+            total = 0.0
+            statistics = []
+            for day_key in sorted(self._days[key]):
+                day = date.fromisoformat(day_key)
+                total += max(self._days[key][day_key], 0.0)
+                if day < first_changed:
+                    continue
+                start = datetime.combine(day, datetime.min.time(), tz)
+                # Statistics rows must start on a UTC hour boundary.
+                start = start.astimezone(dt_util.UTC).replace(minute=0, second=0)
+                statistics.append({"start": start, "sum": total})
+            statistic_id = self.statistic_id(key)
+            _LOGGER.debug(
+                "Importing %d daily rows into %s", len(statistics), statistic_id
+            )
+            async_add_external_statistics(
+                self._hass,
+                statistic_metadata(
+                    statistic_id,
+                    source=DOMAIN,
+                    name=f"SolArk {key.replace('_', ' ')} energy",
+                ),
+                statistics,
+            )
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"days": self._days, "last_run": self._last_run}
@@ -0,0 +1,131 @@
+"""Gateway (dongle) health gating for the SolArk plant data poll."""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any, Callable, TYPE_CHECKING
+
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    GATEWAY_CHECK_INTERVAL,
+    GATEWAY_OFFLINE_CHECK_INTERVAL,
+    GATEWAY_OFFLINE_POLL_INTERVAL,
+)
+from .solark_errors import SolArkCloudAPIError
+from .solark_logging import get_logger
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+    from .solark_client import SolArkCloudAPI
+
+_LOGGER = get_logger(__name__)
+
+
+class SolArkGatewayMonitor:
+    """Pause the fast plant data poll while the inverter's dongle is offline.
+
+    The gateway is checked every GATEWAY_CHECK_INTERVAL (every
+    GATEWAY_OFFLINE_CHECK_INTERVAL while offline). While it is offline the
+    cloud only serves frozen or zeroed data, so the coordinator slows to
+    GATEWAY_OFFLINE_POLL_INTERVAL, skips its requests (see ``offline``) and
+    publishes the last snapshot flagged stale. When the gateway returns, the
+    normal interval is restored and a refresh is requested right away.
+    An unknown status (no gateway reported, or a failed check) never gates.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        api: SolArkCloudAPI,
+        coordinator: DataUpdateCoordinator,
+    ) -> None:
+        self._hass = hass
+        self._entry = entry
+        self._api = api
+        self._coordinator = coordinator
+        self._poll_interval = coordinator.update_interval
+        self.online: bool | None = None
+        self.last_check: str | None = None
+        self._unsub: Callable[[], None] | None = None
+        self._stopped = False
+
+    @property
+    def offline(self) -> bool:
+        return self.online is False
+
+    def async_start(self) -> None:
+        self._entry.async_on_unload(self._async_stop)
+        self._async_schedule(0)
+
+    def as_dict(self) -> dict[str, Any]:
+        """State for diagnostics."""
+        return {"online": self.online, "last_check": self.last_check}
+
+    def _async_stop(self) -> None:
+        self._stopped = True
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    def _async_schedule(self, delay: float) -> None:
+        self._unsub = async_call_later(self._hass, delay, self._async_fire)
+
+    def _async_fire(self, _now: Any) -> None:
+        self._unsub = None
+        self._entry.async_create_background_task(
+            self._hass,
+            self._async_check(),
+            f"{DOMAIN}_{self._entry.entry_id}_gateway_check",
+        )
+
+    async def _async_check(self) -> None:
+        try:
+            await self._async_update()
+        finally:
+            # Keep monitoring whatever happened; a lost reschedule would leave
+            # polling at the offline interval for good
+            if not self._stopped:
+                self._async_schedule(
+                    GATEWAY_OFFLINE_CHECK_INTERVAL
+                    if self.offline
+                    else GATEWAY_CHECK_INTERVAL
+                )
+
+    async def _async_update(self) -> None:
+        try:
+            online = await self._api.get_gateway_online()
+        except SolArkCloudAPIError as err:
+            _LOGGER.debug("Gateway health check failed: %s", err)
+            online = None
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.warning("Unexpected error in gateway health check: %s", err)
+            online = None
+        self.last_check = dt_util.utcnow().isoformat()
+        was_offline = self.offline
+        self.online = online
+
+        if self.offline and not was_offline:
+            _LOGGER.warning(
+                "SolArk gateway for plant %s is offline; pausing data polling",
+                self._api.plant_id,
+            )
+            self._coordinator.update_interval = timedelta(
+                seconds=GATEWAY_OFFLINE_POLL_INTERVAL
+            )
+            if self._coordinator.data is not None:
+                self._coordinator.async_set_updated_data(
+                    self._api.stale_snapshot(self._coordinator.data)
+                )
+        elif was_offline and not self.offline:
+            _LOGGER.info(
+                "SolArk gateway for plant %s is back; resuming data polling",
+                self._api.plant_id,
+            )
+            self._coordinator.update_interval = self._poll_interval
+            await self._coordinator.async_request_refresh()
@@ -4,8 +4,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime
 import asyncio
-import inspect
-from typing import Any, Iterable
+from typing import Any, Callable, Iterable
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -14,7 +13,7 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -25,13 +24,16 @@ from homeassistant.helpers.update_coordinator import (
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .const import CONF_EXTENDED_GROUPS, CONF_WORKDATA_FIELDS, DOMAIN
 from .services import (
     WORK_MODE_REVERSE,
     ENERGY_MODE_REVERSE,
     slot_mode_from_api,
 )
+from .solark_extended import EXTENDED_FIELDS_BY_KEY, ExtendedField
 from .solark_logging import get_logger
+from .solark_metrics import SolArkMetrics
+from .solark_workdata import field_slug, parse_field
 
 _LOGGER = get_logger(__name__)
 
@@ -193,17 +195,131 @@ INTEGRATED_ENERGY_DESCRIPTIONS: list[SolArkIntegratedEnergyDescription] = [
     ),
 ]
 
-try:
-    from homeassistant.components.integration.sensor import (
-        IntegrationSensor,
-        IntegrationMethod,
-    )
+@dataclass
+class SolArkWorkdataSensorDescription(SensorEntityDescription):
+    """Description for an extra sensor built from a workdata catalog entry."""
+
+    key: str
+    field_key: str = ""
+
+
+# Workdata unit -> (device class, HA unit, state class)
+WORKDATA_UNITS: dict[str, tuple[Any, str, Any]] = {
+    "W": (SensorDeviceClass.POWER, "W", SensorStateClass.MEASUREMENT),
+    "kW": (SensorDeviceClass.POWER, "kW", SensorStateClass.MEASUREMENT),
+    "V": (SensorDeviceClass.VOLTAGE, "V", SensorStateClass.MEASUREMENT),
+    "A": (SensorDeviceClass.CURRENT, "A", SensorStateClass.MEASUREMENT),
+    "Hz": (SensorDeviceClass.FREQUENCY, "Hz", SensorStateClass.MEASUREMENT),
+    "℃": (SensorDeviceClass.TEMPERATURE, "°C", SensorStateClass.MEASUREMENT),
+    "°C": (SensorDeviceClass.TEMPERATURE, "°C", SensorStateClass.MEASUREMENT),
+    "kWh": (SensorDeviceClass.ENERGY, "kWh", SensorStateClass.TOTAL_INCREASING),
+    "%": (None, "%", SensorStateClass.MEASUREMENT),
+    "Ah": (None, "Ah", SensorStateClass.MEASUREMENT),
+}
+
+
+def workdata_descriptions(
+    fields: Iterable[str], catalog: dict[str, dict[str, Any]]
+) -> list[SolArkWorkdataSensorDescription]:
+    """Generate sensor descriptions for the selected workdata fields."""
+    descriptions = []
+    for field_key in fields:
+        meta = catalog.get(field_key) or {}
+        parsed = parse_field(field_key)
+        unit = meta.get("unit", parsed.unit)
+        device_class, native_unit, state_class = WORKDATA_UNITS.get(
+            unit or "", (None, unit, None)
+        )
+        descriptions.append(
+            SolArkWorkdataSensorDescription(
+                key=f"workdata_{field_slug(field_key)}",
+                field_key=field_key,
+                name=meta.get("name") or parsed.name,
+                device_class=device_class,
+                native_unit_of_measurement=native_unit,
+                state_class=state_class,
+            )
+        )
+    return descriptions
+
+
+@dataclass
+class SolArkMetricSensorDescription(SensorEntityDescription):
+    """Description for an API metrics diagnostic sensor."""
+
+    key: str
+    value_fn: Callable[[SolArkMetrics], Any] = lambda metrics: None
+    attrs_fn: Callable[[SolArkMetrics], dict[str, Any]] | None = None
+
+
+def _group_p95(group: str) -> Callable[[SolArkMetrics], Any]:
+    def _value(metrics: SolArkMetrics) -> Any:
+        stats = metrics.groups.get(group)
+        p95 = stats.percentile(95) if stats else None
+        return None if p95 is None else round(p95 * 1000, 1)
+
+    return _value
+
+
+def _group_attrs(group: str) -> Callable[[SolArkMetrics], dict[str, Any]]:
+    def _attrs(metrics: SolArkMetrics) -> dict[str, Any]:
+        stats = metrics.groups.get(group)
+        return stats.as_dict() if stats else {}
 
-    HAS_INTEGRATION_SENSOR = True
-except Exception:  # pragma: no cover - handled at runtime in HA
-    IntegrationSensor = None  # type: ignore[assignment]
-    IntegrationMethod = None  # type: ignore[assignment]
-    HAS_INTEGRATION_SENSOR = False
+    return _attrs
+
+
+# API metrics (opt-in diagnostics; read from the client's SolArkMetrics)
+METRIC_SENSOR_DESCRIPTIONS: list[SolArkMetricSensorDescription] = [
+    *(
+        SolArkMetricSensorDescription(
+            key=f"api_{group}_latency",
+            name=f"API {label} Latency",
+            native_unit_of_measurement="ms",
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            value_fn=_group_p95(group),
+            attrs_fn=_group_attrs(group),
+        )
+        for group, label in (
+            ("auth", "Auth"),
+            ("flow", "Flow"),
+            ("workdata", "Workdata"),
+            ("inverters", "Inverters"),
+        )
+    ),
+    SolArkMetricSensorDescription(
+        key="poll_cycle_duration",
+        name="Poll Cycle Duration",
+        native_unit_of_measurement="ms",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda metrics: (
+            None
+            if metrics.cycles.last is None
+            else round(metrics.cycles.last * 1000, 1)
+        ),
+        attrs_fn=lambda metrics: metrics.cycles.as_dict(),
+    ),
+    SolArkMetricSensorDescription(
+        key="api_errors",
+        name="API Errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.error_count,
+        attrs_fn=lambda metrics: {
+            group: dict(stats.errors)
+            for group, stats in metrics.groups.items()
+            if stats.errors
+        },
+    ),
+    SolArkMetricSensorDescription(
+        key="api_logins",
+        name="API Logins",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: sum(metrics.logins.values()),
+        attrs_fn=lambda metrics: dict(metrics.logins),
+    ),
+]
 
 
 # Configuration sensors (read-only, from settings coordinator)
@@ -383,11 +499,24 @@ async def async_setup_entry(
     entities: list[SensorEntity] = [
         SolArkSensor(coordinator, entry, desc) for desc in SENSOR_DESCRIPTIONS
     ]
-    async_add_entities(entities, update_before_add=True)
+    async_add_entities(entities)
 
     energy_entities = _build_energy_entities(hass, entry, coordinator)
     if energy_entities:
-        async_add_entities(energy_entities, update_before_add=True)
+        async_add_entities(energy_entities)
+
+    workdata_entities = _build_workdata_entities(hass, entry, coordinator, data["api"])
+    if workdata_entities:
+        async_add_entities(workdata_entities)
+
+    _async_setup_extended_entities(
+        hass, entry, data.get("extended_coordinator"), async_add_entities
+    )
+
+    async_add_entities(
+        SolArkMetricSensor(data["api"], entry, desc)
+        for desc in METRIC_SENSOR_DESCRIPTIONS
+    )
 
     # Add configuration sensors (read-only, from settings coordinator)
     _LOGGER.debug(
@@ -412,7 +541,7 @@ async def async_setup_entry(
         except Exception as err:
             _LOGGER.error("Failed to create slot mode sensor %s: %s", key, err)
     _LOGGER.debug("Adding %d config entities", len(config_entities))
-    async_add_entities(config_entities, update_before_add=True)
+    async_add_entities(config_entities)
     _LOGGER.debug("Config entities added successfully")
 
     hass.async_create_task(_async_fix_grid_power_entity_id(hass, entry))
@@ -443,6 +572,112 @@ class SolArkSensor(CoordinatorEntity, SensorEntity):
         data = self.coordinator.data or {}
         return data.get(self.entity_description.key)
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Flag values retained from an earlier sample (e.g. gateway offline)."""
+        data = self.coordinator.data
+        is_stale = getattr(data, "is_stale", None)
+        if is_stale is not None and is_stale(self.entity_description.key):
+            return {"stale": True}
+        return None
+
+
+class SolArkWorkdataSensor(SolArkSensor):
+    """Extra sensor for a selected workdata field (master inverter)."""
+
+    entity_description: SolArkWorkdataSensorDescription
+
+    @property
+    def native_value(self) -> Any:
+        data = self.coordinator.data or {}
+        values = data.get("workdata_values") or {}
+        value = values.get(self.entity_description.field_key)
+        if value is None or self.entity_description.native_unit_of_measurement is None:
+            return value
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Flag values kept from an older workdata record."""
+        data = self.coordinator.data or {}
+        if data.get("workdata_stale"):
+            return {"stale": True}
+        return None
+
+
+class SolArkExtendedSensor(SolArkSensor):
+    """Extended telemetry sensor (per-string PV, per-phase meter, BMS)."""
+
+    def __init__(
+        self,
+        coordinator: DataUpdateCoordinator,
+        entry: ConfigEntry,
+        extended: ExtendedField,
+    ) -> None:
+        device_class, native_unit, state_class = WORKDATA_UNITS.get(
+            extended.unit, (None, extended.unit, None)
+        )
+        super().__init__(
+            coordinator,
+            entry,
+            SolArkSensorDescription(
+                key=f"ext_{extended.key}",
+                name=extended.name,
+                device_class=device_class,
+                native_unit_of_measurement=native_unit,
+                state_class=state_class,
+            ),
+        )
+        self._extended_key = extended.key
+
+    @property
+    def native_value(self) -> Any:
+        data = self.coordinator.data or {}
+        return data.get(self._extended_key)
+
+
+class SolArkMetricSensor(SensorEntity):
+    """API latency/error metric, polled from the client (disabled by default).
+
+    Polled rather than coordinator driven: identical snapshots skip listener
+    updates, but the metrics change on every cycle.
+    """
+
+    entity_description: SolArkMetricSensorDescription
+    _attr_should_poll = True
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        api: Any,
+        entry: ConfigEntry,
+        description: SolArkMetricSensorDescription,
+    ) -> None:
+        self._api = api
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_suggested_object_id = f"{DOMAIN}_{description.key}"
+        self._attr_has_entity_name = True
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, entry.entry_id)},
+            "name": "SolArk",
+            "manufacturer": "SolArk",
+        }
+
+    @property
+    def native_value(self) -> Any:
+        return self.entity_description.value_fn(self._api.metrics)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        if self.entity_description.attrs_fn is None:
+            return None
+        return self.entity_description.attrs_fn(self._api.metrics)
+
 
 class SolArkConfigSensor(CoordinatorEntity, SensorEntity):
     """Read-only sensor for inverter configuration values."""
@@ -512,7 +747,16 @@ class SolArkSlotModeConfigSensor(CoordinatorEntity, SensorEntity):
 
 
 class SolArkIntegratedEnergySensor(CoordinatorEntity, SensorEntity, RestoreEntity):
-    """Integrate a power sensor into a total energy sensor (kWh)."""
+    """Integrate a power sensor into a total energy sensor (kWh).
+
+    When the coordinator provides ``workdata_energy`` (energy between synced
+    workdata records, see SolArkCloudAPI.sync_workdata) the sensor adds those
+    increments instead of integrating the sampled power, so no record between
+    polls is lost. Once in record mode, polls without increments add nothing;
+    short workdata outages are caught up by the next sync, while records
+    skipped by a cursor reseed (an outage longer than BACKFILL_MIN_GAP) are
+    added to the long-term statistics by the backfill, not to this state.
+    """
 
     def __init__(
         self,
@@ -533,6 +777,8 @@ class SolArkIntegratedEnergySensor(CoordinatorEntity, SensorEntity, RestoreEntit
         self._energy_kwh: float | None = None
         self._last_power: float | None = None
         self._last_update: datetime | None = None
+        self._record_mode = False
+        self._last_sampled_at: float | None = None
 
     async def async_added_to_hass(self) -> None:
         """Restore last known energy value."""
@@ -552,6 +798,24 @@ class SolArkIntegratedEnergySensor(CoordinatorEntity, SensorEntity, RestoreEntit
 
     def _handle_coordinator_update(self) -> None:
         data = self.coordinator.data or {}
+        sampled_at = getattr(data, "sampled_at", None)
+        if sampled_at is not None and sampled_at == self._last_sampled_at:
+            # Same snapshot re-announced (e.g. a failed refresh)
+            super()._handle_coordinator_update()
+            return
+        self._last_sampled_at = sampled_at
+
+        increments = data.get("workdata_energy")
+        if isinstance(increments, dict) or self._record_mode:
+            self._record_mode = True
+            increment_kwh = (increments or {}).get(self.entity_description.source_key)
+            if increment_kwh:
+                self._energy_kwh = (self._energy_kwh or 0.0) + max(
+                    float(increment_kwh), 0.0
+                )
+            super()._handle_coordinator_update()
+            return
+
         power = data.get(self.entity_description.source_key)
         try:
             power_w = float(power) if power is not None else 0.0
@@ -590,67 +854,79 @@ def _build_energy_entities(
     entry: ConfigEntry,
     coordinator: DataUpdateCoordinator,
 ) -> list[SensorEntity]:
-    if not INTEGRATED_ENERGY_DESCRIPTIONS:
-        return []
-
-    if HAS_INTEGRATION_SENSOR:
-        registry = er.async_get(hass)
-        device_info = {
-            "identifiers": {(DOMAIN, entry.entry_id)},
-            "name": "SolArk",
-            "manufacturer": "SolArk",
-        }
-        return [
-            _create_integration_sensor(
-                hass=hass,
-                registry=registry,
-                entry=entry,
-                description=desc,
-                device_info=device_info,
-            )
-            for desc in INTEGRATED_ENERGY_DESCRIPTIONS
-        ]
-
     return [
         SolArkIntegratedEnergySensor(coordinator, entry, desc)
         for desc in INTEGRATED_ENERGY_DESCRIPTIONS
     ]
 
 
-def _create_integration_sensor(
+def _build_workdata_entities(
     hass: HomeAssistant,
-    registry: er.EntityRegistry,
     entry: ConfigEntry,
-    description: SolArkIntegratedEnergyDescription,
-    device_info: dict[str, Any],
-) -> SensorEntity:
-    source_unique_id = f"{entry.entry_id}_{description.source_key}"
-    source_entity_id = registry.async_get_entity_id(
-        "sensor", DOMAIN, source_unique_id
-    ) or f"sensor.solark_{description.source_key}"
-
-    name = description.name or description.key
-    unique_id = f"{entry.entry_id}_{description.key}"
-    integration_method = _resolve_integration_method()
-    kwargs = _build_integration_kwargs(
-        hass=hass,
-        source_entity_id=source_entity_id,
-        name=name,
-        unique_id=unique_id,
-        integration_method=integration_method,
-    )
+    coordinator: DataUpdateCoordinator,
+    api: Any,
+) -> list[SensorEntity]:
+    selected = list(entry.options.get(CONF_WORKDATA_FIELDS, []))
+    catalog: dict[str, dict[str, Any]] = {}
+    for model_catalog in api.export_workdata_catalogs().values():
+        catalog.update(model_catalog)
+    descriptions = workdata_descriptions(selected, catalog)
+
+    # Drop entities for fields that are no longer selected.
+    registry = er.async_get(hass)
+    keep = {f"{entry.entry_id}_{desc.key}" for desc in descriptions}
+    prefix = f"{entry.entry_id}_workdata_"
+    for reg_entry in er.async_entries_for_config_entry(registry, entry.entry_id):
+        if reg_entry.unique_id.startswith(prefix) and reg_entry.unique_id not in keep:
+            registry.async_remove(reg_entry.entity_id)
+
+    return [
+        SolArkWorkdataSensor(coordinator, entry, desc) for desc in descriptions
+    ]
+
+
+def _async_setup_extended_entities(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: DataUpdateCoordinator | None,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Add extended sensors as their values first appear.
 
-    sensor = IntegrationSensor(**kwargs)  # type: ignore[operator]
-    sensor._attr_device_info = device_info
-    sensor._attr_has_entity_name = True
-    sensor._attr_suggested_object_id = f"{DOMAIN}_{description.key}"
-    if not getattr(sensor, "unique_id", None):
-        sensor._attr_unique_id = unique_id
-    if getattr(sensor, "device_class", None) is None:
-        sensor._attr_device_class = SensorDeviceClass.ENERGY
-    if getattr(sensor, "state_class", None) is None:
-        sensor._attr_state_class = SensorStateClass.TOTAL_INCREASING
-    return sensor
+    Only fields the inverter reports get entities (e.g. just the PV strings
+    in use); entities of groups that were disabled are removed.
+    """
+    groups = set(entry.options.get(CONF_EXTENDED_GROUPS, [])) if coordinator else set()
+    registry = er.async_get(hass)
+    prefix = f"{entry.entry_id}_ext_"
+    for reg_entry in er.async_entries_for_config_entry(registry, entry.entry_id):
+        if not reg_entry.unique_id.startswith(prefix):
+            continue
+        extended = EXTENDED_FIELDS_BY_KEY.get(reg_entry.unique_id[len(prefix):])
+        if extended is None or extended.group not in groups:
+            registry.async_remove(reg_entry.entity_id)
+    if coordinator is None:
+        return
+
+    added: set[str] = set()
+
+    @callback
+    def _async_add_new() -> None:
+        new = [
+            key
+            for key in (coordinator.data or {})
+            if key not in added and key in EXTENDED_FIELDS_BY_KEY
+        ]
+        if not new:
+            return
+        added.update(new)
+        async_add_entities(
+            SolArkExtendedSensor(coordinator, entry, EXTENDED_FIELDS_BY_KEY[key])
+            for key in new
+        )
+
+    _async_add_new()
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_new))
 
 
 async def _async_fix_grid_power_entity_id(
@@ -674,52 +950,3 @@ async def _async_fix_grid_power_entity_id(
         )
         return
     registry.async_update_entity(entity_id, new_entity_id=desired)
-
-
-def _build_integration_kwargs(
-    *,
-    hass: HomeAssistant,
-    source_entity_id: str,
-    name: str,
-    unique_id: str,
-    integration_method: Any,
-) -> dict[str, Any]:
-    params = inspect.signature(IntegrationSensor.__init__).parameters  # type: ignore[union-attr]
-    kwargs: dict[str, Any] = {}
-
-    _set_if_present(params, kwargs, "hass", hass)
-    _set_if_present(
-        params,
-        kwargs,
-        ("source_entity_id", "source_entity", "source"),
-        source_entity_id,
-    )
-    _set_if_present(params, kwargs, "name", name)
-    _set_if_present(params, kwargs, ("round_digits", "round"), 3)
-    _set_if_present(params, kwargs, "unit_prefix", "k")
-    _set_if_present(params, kwargs, "unit_time", "h")
-    _set_if_present(params, kwargs, ("integration_method", "method"), integration_method)
-    _set_if_present(params, kwargs, "unique_id", unique_id)
-    _set_if_present(params, kwargs, "unit_of_measurement", "kWh")
-
-    return kwargs
-
-
-def _set_if_present(
-    params: Iterable[str],
-    kwargs: dict[str, Any],
-    keys: str | tuple[str, ...],
-    value: Any,
-) -> None:
-    if isinstance(keys, str):
-        keys = (keys,)
-    for key in keys:
-        if key in params:
-            kwargs[key] = value
-            return
-
-
-def _resolve_integration_method() -> Any:
-    if IntegrationMethod is None:
-        return "trapezoidal"
-    return getattr(IntegrationMethod, "TRAPEZOIDAL", "trapezoidal")
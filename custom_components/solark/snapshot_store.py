@@ -0,0 +1,113 @@
+"""Persisted last-known coordinator snapshots for fast SolArk startup."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, TYPE_CHECKING
+
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, SNAPSHOT_SAVE_INTERVAL, SNAPSHOT_STORAGE_VERSION
+from .solark_logging import get_logger
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = get_logger(__name__)
+
+
+class SolArkSnapshotStore:
+    """Keep the last parsed plant data and settings on disk per config entry.
+
+    Writes are throttled: at most one save per SNAPSHOT_SAVE_INTERVAL, always
+    containing the newest values (plus a final write on shutdown).
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store = Store(
+            hass,
+            SNAPSHOT_STORAGE_VERSION,
+            f"{DOMAIN}.{entry_id}.snapshot",
+        )
+        self._snapshot: dict[str, Any] = {}
+        self._save_pending = False
+        self._last_save: datetime | None = None
+
+    async def async_load(self) -> dict[str, Any]:
+        """Load the stored snapshot (empty dict when none exists)."""
+        try:
+            stored = await self._store.async_load()
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.warning("Unable to load SolArk snapshot: %s", err)
+            stored = None
+        self._snapshot = stored if isinstance(stored, dict) else {}
+        return self._snapshot
+
+    @property
+    def data(self) -> Any:
+        """Stored plant data (compact PlantSnapshot form), if any."""
+        return self._snapshot.get("data")
+
+    @property
+    def settings(self) -> dict[str, Any] | None:
+        settings = self._snapshot.get("settings")
+        return settings if isinstance(settings, dict) else None
+
+    @property
+    def status_cache(self) -> dict[str, Any]:
+        cache = self._snapshot.get("status_cache")
+        return cache if isinstance(cache, dict) else {}
+
+    @property
+    def catalogs(self) -> dict[str, Any]:
+        """Cached workdata field catalogs per inverter model."""
+        catalogs = self._snapshot.get("catalogs")
+        return catalogs if isinstance(catalogs, dict) else {}
+
+    def age(self, key: str) -> float | None:
+        """Return seconds since the given section was last updated."""
+        updated = self._snapshot.get(f"{key}_updated")
+        if not isinstance(updated, str):
+            return None
+        updated_at = dt_util.parse_datetime(updated)
+        if updated_at is None:
+            return None
+        return max((dt_util.utcnow() - updated_at).total_seconds(), 0.0)
+
+    def async_set_data(self, data: Any, status_cache: dict[str, Any]) -> None:
+        """Record freshly parsed plant data and the retained status cache."""
+        self._snapshot["data"] = data
+        self._snapshot["data_updated"] = dt_util.utcnow().isoformat()
+        self._snapshot["status_cache"] = status_cache
+        self._async_schedule_save()
+
+    def async_set_settings(self, settings: dict[str, Any]) -> None:
+        """Record a fresh master settings snapshot."""
+        self._snapshot["settings"] = settings
+        self._snapshot["settings_updated"] = dt_util.utcnow().isoformat()
+        self._async_schedule_save()
+
+    def async_set_catalogs(self, catalogs: dict[str, Any]) -> None:
+        """Record discovered workdata field catalogs."""
+        self._snapshot["catalogs"] = dict(catalogs)
+        self._async_schedule_save()
+
+    async def async_remove(self) -> None:
+        """Delete the stored snapshot (entry removed)."""
+        await self._store.async_remove()
+
+    def _async_schedule_save(self) -> None:
+        if self._save_pending:
+            # A save is already queued and will pick up the newest values.
+            return
+        delay = 0.0
+        if self._last_save is not None:
+            elapsed = (dt_util.utcnow() - self._last_save).total_seconds()
+            delay = max(SNAPSHOT_SAVE_INTERVAL - elapsed, 0.0)
+        self._save_pending = True
+        self._store.async_delay_save(self._data_to_save, delay)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        self._save_pending = False
+        self._last_save = dt_util.utcnow()
+        return self._snapshot
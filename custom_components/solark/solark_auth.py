@@ -2,19 +2,37 @@
 from __future__ import annotations
 
 import asyncio
+import copy
 from datetime import datetime, timedelta
 from typing import Optional
 
 import aiohttp
 
-from .solark_errors import SolArkCloudAPIError
+from .const import LEGACY_API_URL
+from .solark_deadline import DeadlineExceeded, request_timeout, timeout_error
+from .solark_errors import (
+    SolArkAuthError,
+    SolArkCloudAPIError,
+    SolArkConnectionError,
+    SolArkResponseError,
+    error_for_status,
+)
 from .solark_logging import get_logger
+from .solark_metrics import SolArkMetrics
+from .solark_trace import span
 
 _LOGGER = get_logger(__name__)
 
+OAUTH_ENDPOINT = "/oauth/token"
+LEGACY_LOGIN_ENDPOINT = "/rest/account/login"
+
 
 class SolArkAuth:
-    """Handle Sol-Ark Cloud authentication and token management."""
+    """Handle Sol-Ark Cloud authentication and token management.
+
+    Legacy login and workdata requests go to ``legacy_url``; point it at the
+    same host as ``api_url`` for a proxy or the local simulator.
+    """
 
     def __init__(
         self,
@@ -23,16 +41,22 @@ class SolArkAuth:
         base_url: str,
         api_url: str,
         session: aiohttp.ClientSession,
+        metrics: Optional[SolArkMetrics] = None,
+        legacy_url: str = LEGACY_API_URL,
     ) -> None:
         self.username = username
         self.password = password
         self.base_url = base_url.rstrip("/")
         self.api_url = api_url.rstrip("/")
+        self.legacy_url = legacy_url.rstrip("/")
         self._session = session
+        self.metrics = metrics or SolArkMetrics()
 
         self._token: Optional[str] = None
         self._refresh_token: Optional[str] = None
         self._token_expiry: Optional[datetime] = None
+        # Serialize logins so concurrent callers share one token refresh
+        self._login_lock = asyncio.Lock()
 
     def get_headers(self, strict: bool = True) -> dict[str, str]:
         headers: dict[str, str] = {
@@ -50,11 +74,35 @@ class SolArkAuth:
             headers["Authorization"] = f"Bearer {self._token}"
         return headers
 
+    @property
+    def token(self) -> Optional[str]:
+        return self._token
+
+    def invalidate(self, token: Optional[str]) -> None:
+        """Drop ``token`` after the server rejected it.
+
+        A token that was already replaced by a concurrent login is kept.
+        """
+        if token is not None and self._token == token:
+            self._token = None
+            self._token_expiry = None
+
+    def _token_valid(self) -> bool:
+        return bool(
+            self._token
+            and self._token_expiry
+            and datetime.utcnow() < self._token_expiry
+        )
+
     async def ensure_token(self) -> None:
-        if self._token and self._token_expiry and datetime.utcnow() < self._token_expiry:
+        if self._token_valid():
             return
-        _LOGGER.debug("Token missing or expired, logging in again")
-        await self.login()
+        with span("auth.ensure_token"):
+            async with self._login_lock:
+                if self._token_valid():
+                    return
+                _LOGGER.debug("Token missing or expired, logging in again")
+                await self.login()
 
     async def _oauth_login(self) -> None:
         url = f"{self.api_url}/oauth/token"
@@ -75,7 +123,7 @@ class SolArkAuth:
                 url,
                 json=payload,
                 headers=headers,
-                timeout=aiohttp.ClientTimeout(total=30),
+                timeout=aiohttp.ClientTimeout(total=request_timeout()),
             ) as resp:
                 text = await resp.text()
                 _LOGGER.debug(
@@ -86,35 +134,49 @@ class SolArkAuth:
                 try:
                     resp.raise_for_status()
                 except aiohttp.ClientResponseError as exc:
-                    raise SolArkCloudAPIError(
-                        f"OAuth login HTTP {resp.status}: {text[:500]}"
+                    raise error_for_status(
+                        resp.status,
+                        f"OAuth login HTTP {resp.status}: {text[:500]}",
+                        OAUTH_ENDPOINT,
+                        resp.headers.get("Retry-After"),
                     ) from exc
 
                 try:
                     result = await resp.json()
                 except Exception as exc:  # noqa: BLE001
-                    raise SolArkCloudAPIError(
-                        f"OAuth login invalid JSON: {text[:200]}"
+                    raise SolArkResponseError(
+                        f"OAuth login invalid JSON: {text[:200]}",
+                        endpoint=OAUTH_ENDPOINT,
+                        status=resp.status,
                     ) from exc
 
         except asyncio.TimeoutError as exc:  # noqa: BLE001
-            raise SolArkCloudAPIError("OAuth login timeout") from exc
+            raise timeout_error("OAuth login") from exc
         except aiohttp.ClientError as exc:  # noqa: BLE001
-            raise SolArkCloudAPIError(f"OAuth login client error: {exc}") from exc
+            raise SolArkConnectionError(
+                f"OAuth login client error: {exc}", endpoint=OAUTH_ENDPOINT
+            ) from exc
 
         if not isinstance(result, dict):
-            raise SolArkCloudAPIError("OAuth login response not JSON object")
+            raise SolArkResponseError(
+                "OAuth login response not JSON object", endpoint=OAUTH_ENDPOINT
+            )
 
         code = result.get("code")
         if code not in (0, "0"):
-            raise SolArkCloudAPIError(
-                f"OAuth login failed: {result.get('msg', 'Unknown error')} (code={code})"
+            raise SolArkAuthError(
+                "OAuth login failed: "
+                f"{result.get('msg', 'Unknown error')} (code={code})",
+                endpoint=OAUTH_ENDPOINT,
+                code=code,
             )
 
         data = result.get("data") or {}
         token = data.get("access_token") or data.get("token")
         if not token:
-            raise SolArkCloudAPIError("OAuth login succeeded but no access_token")
+            raise SolArkResponseError(
+                "OAuth login succeeded but no access_token", endpoint=OAUTH_ENDPOINT
+            )
 
         self._token = token
         self._refresh_token = data.get("refresh_token")
@@ -128,7 +190,7 @@ class SolArkAuth:
         )
 
     async def _legacy_login(self) -> None:
-        url = "https://api.solarkcloud.com/rest/account/login"
+        url = f"{self.legacy_url}{LEGACY_LOGIN_ENDPOINT}"
         headers = {
             "Accept": "application/json",
             "Content-Type": "application/json",
@@ -142,7 +204,7 @@ class SolArkAuth:
                 url,
                 json=payload,
                 headers=headers,
-                timeout=aiohttp.ClientTimeout(total=30),
+                timeout=aiohttp.ClientTimeout(total=request_timeout()),
             ) as resp:
                 text = await resp.text()
                 _LOGGER.debug(
@@ -153,24 +215,33 @@ class SolArkAuth:
                 try:
                     resp.raise_for_status()
                 except aiohttp.ClientResponseError as exc:
-                    raise SolArkCloudAPIError(
-                        f"Legacy login HTTP {resp.status}: {text[:500]}"
+                    raise error_for_status(
+                        resp.status,
+                        f"Legacy login HTTP {resp.status}: {text[:500]}",
+                        LEGACY_LOGIN_ENDPOINT,
+                        resp.headers.get("Retry-After"),
                     ) from exc
 
                 try:
                     result = await resp.json()
                 except Exception as exc:  # noqa: BLE001
-                    raise SolArkCloudAPIError(
-                        f"Legacy login invalid JSON: {text[:200]}"
+                    raise SolArkResponseError(
+                        f"Legacy login invalid JSON: {text[:200]}",
+                        endpoint=LEGACY_LOGIN_ENDPOINT,
+                        status=resp.status,
                     ) from exc
 
         except asyncio.TimeoutError as exc:  # noqa: BLE001
-            raise SolArkCloudAPIError("Legacy login timeout") from exc
+            raise timeout_error("legacy login") from exc
         except aiohttp.ClientError as exc:  # noqa: BLE001
-            raise SolArkCloudAPIError(f"Legacy login client error: {exc}") from exc
+            raise SolArkConnectionError(
+                f"Legacy login client error: {exc}", endpoint=LEGACY_LOGIN_ENDPOINT
+            ) from exc
 
         if not isinstance(result, dict):
-            raise SolArkCloudAPIError("Legacy login response not JSON object")
+            raise SolArkResponseError(
+                "Legacy login response not JSON object", endpoint=LEGACY_LOGIN_ENDPOINT
+            )
 
         token = (
             result.get("token")
@@ -179,7 +250,9 @@ class SolArkAuth:
             or (result.get("data") or {}).get("access_token")
         )
         if not token:
-            raise SolArkCloudAPIError("Legacy login succeeded but no token")
+            raise SolArkResponseError(
+                "Legacy login succeeded but no token", endpoint=LEGACY_LOGIN_ENDPOINT
+            )
 
         self._token = token
         self._token_expiry = datetime.utcnow() + timedelta(minutes=30)
@@ -187,20 +260,41 @@ class SolArkAuth:
         _LOGGER.debug("Legacy login successful, temporary token set")
 
     async def login(self) -> bool:
-        errors: list[str] = []
+        with span("auth.login"):
+            return await self._login()
+
+    async def _login(self) -> bool:
+        errors: list[SolArkCloudAPIError] = []
 
         try:
-            await self._oauth_login()
+            with span("auth.oauth"), self.metrics.track(OAUTH_ENDPOINT):
+                await self._oauth_login()
+            self.metrics.record_login("oauth", True)
             return True
+        except DeadlineExceeded:
+            self.metrics.record_login("oauth", False)
+            raise
         except SolArkCloudAPIError as exc:
             _LOGGER.debug("OAuth login failed: %s", exc)
-            errors.append(f"oauth: {exc}")
+            self.metrics.record_login("oauth", False)
+            errors.append(exc)
 
         try:
-            await self._legacy_login()
+            with span("auth.legacy"), self.metrics.track(LEGACY_LOGIN_ENDPOINT):
+                await self._legacy_login()
+            self.metrics.record_login("legacy", True)
             return True
         except SolArkCloudAPIError as exc:
             _LOGGER.debug("Legacy login failed: %s", exc)
-            errors.append(f"legacy: {exc}")
-
-        raise SolArkCloudAPIError("All login methods failed: " + " | ".join(errors))
+            self.metrics.record_login("legacy", False)
+            errors.append(exc)
+
+        # Report a transient failure if there was one: retrying can help then.
+        # Only when every method rejected the credentials is it an auth error.
+        primary = next((exc for exc in errors if exc.retryable), errors[0])
+        message = "All login methods failed: " + " | ".join(
+            f"{name}: {exc}" for name, exc in zip(("oauth", "legacy"), errors)
+        )
+        error = copy.copy(primary)
+        error.args = (message,)
+        raise error from primary
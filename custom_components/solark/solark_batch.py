@@ -0,0 +1,230 @@
+"""Vectorized, stateless parsing of many plant samples at once.
+
+``parse_plant_batch`` computes the same sensor values as ``PlantDataParser``
+for a columnar block of raw samples (replayed responses, backfills). Unlike
+``SolArkCloudAPI.parse_plant_data`` it keeps no last-known state, so it can be
+used freely on historical data.
+
+Columnar input maps raw API keys to equal-length sequences (or NumPy arrays).
+``None`` (or ``NaN`` in numeric columns) marks a key as absent for that
+sample; this is the one difference from the per-sample parser, where a key
+present with a ``None`` value does not fall back to the next source. Numeric
+outputs are float64 arrays with ``NaN`` where a value is absent; status outputs
+are object arrays with ``None`` where absent. NumPy is optional; check
+``HAS_NUMPY`` first.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+from .solark_parser import PV_STRING_COUNT, to_float
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+    HAS_NUMPY = False
+
+Columns = Mapping[str, Sequence[Any]]
+
+
+def rows_to_columns(rows: Iterable[Mapping[str, Any]]) -> Dict[str, List[Any]]:
+    """Convert combined-data dicts to columnar form (absent keys -> None)."""
+    rows = list(rows)
+    keys: set[str] = set()
+    for row in rows:
+        keys.update(row)
+    return {key: [row.get(key) for row in rows] for key in keys}
+
+
+def _length(columns: Columns) -> int:
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+    return lengths.pop() if lengths else 0
+
+
+def _numeric(columns: Columns, key: str, size: int) -> Tuple[Any, Any]:
+    """Return (values with 0.0 for invalid/absent, present mask)."""
+    raw = columns.get(key)
+    if raw is None:
+        return np.zeros(size), np.zeros(size, dtype=bool)
+    if isinstance(raw, np.ndarray) and raw.dtype.kind in "fiub":
+        values = raw.astype(float)
+        present = ~np.isnan(values)
+    else:
+        try:
+            # None converts to NaN, so the common case stays in C.
+            values = np.asarray(raw, dtype=float)
+            present = ~np.isnan(values)
+        except (TypeError, ValueError):
+            present = np.fromiter((v is not None for v in raw), bool, size)
+            values = np.fromiter((to_float(v) for v in raw), float, size)
+    return np.where(present, np.nan_to_num(values, nan=0.0), 0.0), present
+
+
+_IS_TRUE, _IS_FALSE, _TRUTHY, _PRESENT = 1, 2, 4, 8
+
+
+def _flag_code(value: Any) -> int:
+    if value is True:
+        return _IS_TRUE | _TRUTHY | _PRESENT
+    if value is False:
+        return _IS_FALSE | _PRESENT
+    if value is None:
+        return 0
+    return (_TRUTHY | _PRESENT) if value else _PRESENT
+
+
+def _flags(columns: Columns, key: str, size: int) -> Tuple[Any, Any, Any, Any]:
+    """Return (is True, is False, truthy, present) masks for a flag column."""
+    raw = columns.get(key)
+    if raw is None:
+        empty = np.zeros(size, dtype=bool)
+        return empty, empty, empty, empty
+    if not isinstance(raw, np.ndarray):
+        raw = np.asarray(raw)  # all-bool lists become a bool array in C
+    if raw.dtype.kind == "b":
+        return raw, ~raw, raw, np.ones(size, dtype=bool)
+    # Mixed column: one Python pass; identity checks keep ``is True`` semantics.
+    codes = np.fromiter(map(_flag_code, raw), np.int8, size)
+    return (
+        (codes & _IS_TRUE) != 0,
+        (codes & _IS_FALSE) != 0,
+        (codes & _TRUTHY) != 0,
+        (codes & _PRESENT) != 0,
+    )
+
+
+def _first_positive(columns: Columns, keys: Sequence[str], size: int) -> Any:
+    result = np.full(size, np.nan)
+    taken = np.zeros(size, dtype=bool)
+    for key in keys:
+        values, present = _numeric(columns, key, size)
+        use = present & ~taken
+        result = np.where(use & (values > 0), values, result)
+        taken |= present
+    return result
+
+
+def parse_plant_batch(columns: Columns) -> Dict[str, Any]:
+    """Compute all sensor values for a columnar block of raw samples."""
+    if not HAS_NUMPY:
+        raise RuntimeError("parse_plant_batch requires numpy")
+
+    size = _length(columns)
+    out: Dict[str, Any] = {}
+
+    # ----- Energy today / total (absent unless positive) -----
+    out["energy_today"] = _first_positive(columns, ("energyToday", "etoday"), size)
+    out["energy_total"] = _first_positive(columns, ("energyTotal", "etotal"), size)
+
+    # ----- Battery SOC with capacity fallback -----
+    soc, soc_present = _numeric(columns, "soc", size)
+    cur_cap, _ = _numeric(columns, "curCap", size)
+    batt_cap, _ = _numeric(columns, "batteryCap", size)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cap_soc = np.where(batt_cap > 0, cur_cap / batt_cap * 100.0, 0.0)
+    out["battery_soc"] = np.where(soc_present, soc, cap_soc)
+
+    # ----- PV power with per-string fallback -----
+    pv, pv_present = _numeric(columns, "pvPower", size)
+    strings = np.zeros(size)
+    for i in range(1, PV_STRING_COUNT + 1):
+        volt, _ = _numeric(columns, f"volt{i}", size)
+        current, _ = _numeric(columns, f"current{i}", size)
+        strings += volt * current
+    out["pv_power"] = np.where(pv_present, pv, strings)
+
+    # ----- Battery power (flow sign, BMS fallback) and split -----
+    batt, batt_present = _numeric(columns, "battPower", size)
+    to_bat = _flags(columns, "toBat", size)[2]
+    bat_to = _flags(columns, "batTo", size)[2]
+    flow_power = np.where(to_bat & ~bat_to, -np.abs(batt), np.abs(batt))
+    cur_volt, _ = _numeric(columns, "curVolt", size)
+    charge_current, _ = _numeric(columns, "chargeCurrent", size)
+    battery = np.where(batt_present, flow_power, cur_volt * charge_current)
+    out["battery_power"] = battery
+    out["battery_charge_power"] = np.where(battery < 0.0, -battery, 0.0)
+    out["battery_discharge_power"] = np.where(battery > 0.0, battery, 0.0)
+
+    # ----- Grid / load power -----
+    grid_flow, _ = _numeric(columns, "gridOrMeterPower", size)
+    out["grid_power"] = grid_flow
+    out["load_power"] = _numeric(columns, "loadOrEpsPower", size)[0]
+
+    # ----- Grid import/export: meters, explicit, then flow direction -----
+    net = np.zeros(size)
+    for key in ("meterA", "meterB", "meterC"):
+        net += _numeric(columns, key, size)[0]
+    explicit_import, _ = _numeric(columns, "gridImportPower", size)
+    explicit_export, _ = _numeric(columns, "gridExportPower", size)
+    grid_to, grid_to_false, grid_to_truthy, _ = _flags(columns, "gridTo", size)
+    to_grid, to_grid_false, to_grid_truthy, _ = _flags(columns, "toGrid", size)
+    exists_meter = columns.get("existsMeter")
+    if exists_meter is None:
+        no_meter = np.ones(size, dtype=bool)
+    else:
+        exists_meter = np.asarray(exists_meter)
+        if exists_meter.dtype.kind in "biuf":
+            no_meter = exists_meter == 0
+        else:
+            no_meter = np.fromiter(
+                (v in (False, 0, "0", None) for v in exists_meter), bool, size
+            )
+    flow_abs = np.abs(grid_flow)
+    flow_import = np.where(
+        grid_to & ~to_grid,
+        True,
+        np.where(to_grid & ~grid_to, False, grid_flow > 0.0),
+    )
+    use_flow = no_meter & (grid_flow != 0.0)
+    flow_in = np.where(use_flow & flow_import, flow_abs, 0.0)
+    flow_out = np.where(use_flow & ~flow_import, flow_abs, 0.0)
+
+    use_meter = net != 0.0
+    use_explicit = ~use_meter & ((explicit_import != 0.0) | (explicit_export != 0.0))
+    out["grid_import_power"] = np.where(
+        use_meter,
+        np.maximum(net, 0.0),
+        np.where(use_explicit, explicit_import, flow_in),
+    )
+    out["grid_export_power"] = np.where(
+        use_meter,
+        np.maximum(-net, 0.0),
+        np.where(use_explicit, explicit_export, flow_out),
+    )
+
+    # ----- Status sensors -----
+    grid_status = np.full(size, None, dtype=object)
+    grid_status[grid_to_truthy | to_grid_truthy] = "Active"
+    grid_status[grid_to_false & to_grid_false] = "Inactive"
+    out["grid_status"] = grid_status
+
+    relay, relay_present = _numeric(columns, "acRelayStatus", size)
+    relay_raw = columns.get("acRelayStatus")
+    if relay_raw is not None and np.asarray(relay_raw).dtype.kind not in "biuf":
+        # Non-numeric strings are invalid (absent), not 0 -> Disconnected.
+        relay_present &= np.fromiter(map(_int_like, relay_raw), bool, size)
+    ac_relay = np.full(size, None, dtype=object)
+    ac_relay[relay_present] = "Disconnected"
+    ac_relay[relay_present & (np.trunc(relay) == 1)] = "Connected"
+    out["ac_relay_status"] = ac_relay
+
+    _, _, gen_truthy, gen_present = _flags(columns, "genOn", size)
+    generator = np.full(size, None, dtype=object)
+    generator[gen_present] = "Off"
+    generator[gen_present & gen_truthy] = "Running"
+    out["generator_status"] = generator
+
+    return out
+
+
+def _int_like(value: Any) -> bool:
+    try:
+        int(value)
+    except (TypeError, ValueError):
+        return False
+    return True
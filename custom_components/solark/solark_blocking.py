@@ -0,0 +1,272 @@
+"""Event-loop blocking detector for the integration's callbacks (HA independent).
+
+``BlockingMonitor`` times the synchronous stretches of instrumented code:
+
+- ``section(name)`` times a synchronous block (parsing, listener fan-out)
+- ``coroutine(name)`` decorates an async function and times every step
+  between two awaits, i.e. each stretch that holds the event loop; the
+  network waits in between are not counted
+
+A stretch longer than the threshold is logged and kept as an event with a
+stack sample. The sample is taken by a watchdog thread from the loop thread
+while the stretch is still running, so it shows where the time goes rather
+than where the stretch ended. Per-section counts and maxima are always
+kept; recording costs a lock round trip per stretch.
+"""
+from __future__ import annotations
+
+import functools
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterator, List, Optional
+
+from .solark_logging import get_logger
+
+_LOGGER = get_logger(__name__)
+
+# Stretches holding the loop longer than this are flagged (seconds)
+BLOCKING_THRESHOLD = 0.05
+# Flagged events kept per monitor
+BLOCKING_EVENT_LIMIT = 20
+# Innermost frames kept per stack sample
+STACK_SAMPLE_DEPTH = 15
+
+
+class _Sampler(threading.Thread):
+    """Watchdog capturing the loop thread's stack once a stretch overruns."""
+
+    def __init__(self, threshold: float) -> None:
+        super().__init__(name="solark-blocking-sampler", daemon=True)
+        self._threshold = threshold
+        self._cond = threading.Condition()
+        self._armed: Optional[tuple[int, float, int]] = None
+        self._stopped = False
+        self.samples: Dict[int, List[str]] = {}
+
+    def arm(self, generation: int, thread_id: int) -> None:
+        with self._cond:
+            deadline = time.perf_counter() + self._threshold
+            self._armed = (generation, deadline, thread_id)
+            self._cond.notify()
+
+    def disarm(self, generation: int) -> Optional[List[str]]:
+        with self._cond:
+            self._armed = None
+            return self.samples.pop(generation, None)
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+
+    def run(self) -> None:
+        with self._cond:
+            while not self._stopped:
+                if self._armed is None:
+                    self._cond.wait()
+                    continue
+                generation, deadline, thread_id = self._armed
+                delay = deadline - time.perf_counter()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                self._armed = None
+                frame = sys._current_frames().get(thread_id)
+                if frame is not None:
+                    self.samples[generation] = _stack_lines(frame)
+
+
+def _stack_lines(frame: Any) -> List[str]:
+    """Innermost frames, outermost first, without reading source files."""
+    lines = []
+    for frame, lineno in traceback.walk_stack(frame):
+        code = frame.f_code
+        lines.append(f"{code.co_filename}:{lineno} in {code.co_name}")
+        if len(lines) == STACK_SAMPLE_DEPTH:
+            break
+    return lines[::-1]
+
+
+class _SectionStats:
+    __slots__ = ("count", "slow", "total", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.slow = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+class BlockingMonitor:
+    """Time synchronous stretches per section and flag the slow ones."""
+
+    def __init__(
+        self,
+        threshold: float = BLOCKING_THRESHOLD,
+        event_limit: int = BLOCKING_EVENT_LIMIT,
+        sample_stacks: bool = True,
+    ) -> None:
+        self.threshold = threshold
+        self.sections: Dict[str, _SectionStats] = {}
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=event_limit)
+        self._sampler: Optional[_Sampler] = None
+        if sample_stacks:
+            self._sampler = _Sampler(threshold)
+            self._sampler.start()
+        self._generation = 0
+        self._depth = 0
+
+    # ------------------------------------------------------------------
+    # timing
+    # ------------------------------------------------------------------
+
+    def _begin(self) -> int:
+        self._depth += 1
+        if self._depth > 1 or self._sampler is None:
+            # Nested stretches share the outermost one's stack sample
+            return self._generation
+        self._generation += 1
+        self._sampler.arm(self._generation, threading.get_ident())
+        return self._generation
+
+    def _end(self, name: str, generation: int, elapsed: float) -> None:
+        self._depth -= 1
+        stack = None
+        if self._sampler is not None:
+            if self._depth == 0:
+                stack = self._sampler.disarm(generation)
+            else:
+                stack = self._sampler.samples.get(generation)
+        stats = self.sections.get(name)
+        if stats is None:
+            stats = self.sections[name] = _SectionStats()
+        stats.count += 1
+        stats.total += elapsed
+        stats.max = max(stats.max, elapsed)
+        if elapsed < self.threshold:
+            return
+        stats.slow += 1
+        self.events.append(
+            {
+                "section": name,
+                "duration_ms": round(elapsed * 1000, 1),
+                "at": time.time(),
+                "stack": stack,
+            }
+        )
+        _LOGGER.warning(
+            "%s blocked the event loop for %.0f ms (threshold %.0f ms)",
+            name,
+            elapsed * 1000,
+            self.threshold * 1000,
+        )
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        """Time a synchronous block."""
+        generation = self._begin()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._end(name, generation, time.perf_counter() - start)
+
+    def function(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap a synchronous callable so every call is a section."""
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with self.section(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    def coroutine(
+        self, name: str
+    ) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+        """Decorate an async function; each step between awaits is timed."""
+
+        def decorate(
+            func: Callable[..., Awaitable[Any]]
+        ) -> Callable[..., Awaitable[Any]]:
+            @functools.wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                return await _TimedSteps(self, name, func(*args, **kwargs))
+
+            return wrapper
+
+        return decorate
+
+    def close(self) -> None:
+        """Stop the stack sampler; timing continues without samples."""
+        if self._sampler is not None:
+            self._sampler.stop()
+            self._sampler = None
+
+    # ------------------------------------------------------------------
+    # reporting
+    # ------------------------------------------------------------------
+
+    @property
+    def max_blocking(self) -> float:
+        """Longest stretch seen in any section (seconds)."""
+        return max((stats.max for stats in self.sections.values()), default=0.0)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "threshold_ms": round(self.threshold * 1000, 1),
+            "sections": {
+                name: {
+                    "count": stats.count,
+                    "slow": stats.slow,
+                    "max_ms": round(stats.max * 1000, 2),
+                    "mean_ms": round(stats.total / stats.count * 1000, 2),
+                }
+                for name, stats in self.sections.items()
+                if stats.count
+            },
+            "events": list(self.events),
+        }
+
+
+class _TimedSteps:
+    """Drive a coroutine, timing each synchronous step as one stretch."""
+
+    __slots__ = ("_monitor", "_name", "_coro")
+
+    def __init__(self, monitor: BlockingMonitor, name: str, coro: Any) -> None:
+        self._monitor = monitor
+        self._name = name
+        self._coro = coro
+
+    def __await__(self) -> Any:
+        coro = self._coro
+        monitor = self._monitor
+        value: Any = None
+        error: Optional[BaseException] = None
+        while True:
+            generation = monitor._begin()
+            start = time.perf_counter()
+            try:
+                if error is not None:
+                    yielded = coro.throw(error)
+                else:
+                    yielded = coro.send(value)
+            except StopIteration as stop:
+                monitor._end(self._name, generation, time.perf_counter() - start)
+                return stop.value
+            except BaseException:
+                monitor._end(self._name, generation, time.perf_counter() - start)
+                raise
+            monitor._end(self._name, generation, time.perf_counter() - start)
+            try:
+                value, error = (yield yielded), None
+            except GeneratorExit:
+                coro.close()
+                raise
+            except BaseException as exc:  # noqa: BLE001 - forwarded into coro
+                value, error = None, exc
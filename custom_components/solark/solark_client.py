@@ -2,22 +2,85 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import logging
+import math
+import time
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
 from zoneinfo import ZoneInfo
 
 import aiohttp
 
 from .solark_auth import SolArkAuth
-from .solark_errors import SolArkCloudAPIError
+from .const import BACKFILL_MIN_GAP, LEGACY_API_URL
+from .solark_deadline import (
+    DeadlineExceeded,
+    expired,
+    remaining,
+    request_timeout,
+    timeout_error,
+)
+from .solark_errors import (
+    SolArkAuthError,
+    SolArkAPICodeError,
+    SolArkCloudAPIError,
+    SolArkConnectionError,
+    SolArkRateLimitError,
+    SolArkResponseError,
+    error_for_code,
+    error_for_status,
+)
+from .solark_extended import parse_extended, projected_keys, projecting_loads
+from .solark_history import (
+    Sample,
+    interval_energy,
+    record_time,
+    records_to_samples,
+    resolve_power_fields,
+)
 from .solark_logging import get_logger
+from .solark_metrics import SolArkMetrics, normalize_endpoint
+from .solark_parser import PlantDataParser
+from .solark_snapshot import FIELDS as SNAPSHOT_FIELDS, PlantSnapshot
+from .solark_trace import SolArkTracer, span
+from .solark_workdata import build_catalog
 
 _LOGGER = get_logger(__name__)
 
+# Records per workdata page when reading history (5-minute samples)
+WORKDATA_PAGE_SIZE = 100
+AC_RELAY_FIELD = "AcRelayStatus(NA)/194"
+# A 5-minute workdata record counts as current for one interval plus upload
+# lag; most polls bring no new record and reuse the newest one
+WORKDATA_STALE_AFTER = 600  # seconds
+# Wait before retrying a workdata catalog discovery that found no record
+WORKDATA_CATALOG_RETRY = 900  # seconds
+# Workdata lives on the legacy API host (SolArkAuth.legacy_url)
+WORKDATA_ENDPOINT = "/api/v1/workdata/dynamic"
+
+# Per-leg outcomes of a get_plant_data cycle (``legStatus``)
+LEG_OK = "ok"
+LEG_ERROR = "error"
+LEG_TIMEOUT = "timeout"
+LEG_SKIPPED = "skipped"
+
 
 class SolArkCloudAPI:
     """Sol-Ark Cloud API client."""
 
+    # Parsed keys retained across brief data gaps (see parse_plant_data)
+    _RETAINED_ENERGY_KEYS = ("energy_today", "energy_total")
+    _RETAINED_STATUS_KEYS = ("grid_status", "generator_status", "ac_relay_status")
+    # Parsed power keys integrated from synced workdata records
+    _WORKDATA_ENERGY_KEYS = (
+        "pv_power",
+        "grid_import_power",
+        "grid_export_power",
+        "battery_charge_power",
+        "battery_discharge_power",
+        "load_power",
+    )
+
     def __init__(
         self,
         username: str,
@@ -27,7 +90,18 @@ class SolArkCloudAPI:
         api_url: str,
         session: aiohttp.ClientSession,
         timezone: str = "UTC",
+        auth: Optional[SolArkAuth] = None,
+        opentelemetry: bool = False,
+        legacy_url: str = LEGACY_API_URL,
     ) -> None:
+        """Create a client for one plant.
+
+        Clients for plants of the same account may pass one shared ``auth``
+        so they log in once and reuse its token. ``opentelemetry`` mirrors
+        the client's trace spans to OpenTelemetry when it is installed.
+        ``legacy_url`` is the host for legacy login and workdata (ignored
+        with a shared ``auth``).
+        """
         self.username = username
         self.password = password
         self.plant_id = plant_id
@@ -42,15 +116,33 @@ class SolArkCloudAPI:
         self._pending_setting_ttl_seconds = 30
         self._inverters_cache: Optional[list[dict[str, Any]]] = None
         self._inverters_cache_lock = asyncio.Lock()
+        self._master_sn_lock = asyncio.Lock()
         # Cache last-known status sensor values to ride through brief data gaps
         self._last_status: Dict[str, tuple[str, datetime]] = {}
         self._status_retain_seconds = 1800  # 30 minutes
-        self._auth = SolArkAuth(
+        self._parser = PlantDataParser()
+        # Incremental workdata sync: newest record time and sample per SN
+        self._workdata_cursors: Dict[str, datetime] = {}
+        self._workdata_tail: Dict[str, Sample] = {}
+        self._workdata_latest: Dict[str, tuple[datetime, Dict[str, Any]]] = {}
+        self._workdata_gaps: Dict[str, tuple[datetime, datetime]] = {}
+        # Workdata field catalog per inverter model and the selected extras
+        self._workdata_catalogs: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._catalog_retry_at: Dict[str, float] = {}
+        self._workdata_fields: List[str] = []
+        self._workdata_projection = True
+        # Timing and leg outcomes of the last get_plant_data cycle
+        self.last_cycle: Optional[Dict[str, Any]] = None
+        self.metrics = SolArkMetrics()
+        self.tracer = SolArkTracer(opentelemetry=opentelemetry)
+        self._auth = auth or SolArkAuth(
             username=username,
             password=password,
             base_url=self.base_url,
             api_url=self.api_url,
             session=session,
+            metrics=self.metrics,
+            legacy_url=legacy_url,
         )
 
         _LOGGER.debug(
@@ -68,6 +160,16 @@ class SolArkCloudAPI:
         """Fetch and cache inverter list once at startup."""
         await self._get_cached_inverters()
 
+    def seed_master_sn(self, sn: str) -> None:
+        """Seed the master inverter SN from a previously persisted snapshot."""
+        if not self._master_sn:
+            self._master_sn = sn
+
+    async def discover_master(self) -> Optional[str]:
+        """Resolve the inverter list and master inverter SN ahead of polling."""
+        await self._get_cached_inverters()
+        return await self._get_master_sn()
+
     async def _get_cached_inverters(self) -> list[dict[str, Any]]:
         if self._inverters_cache is not None:
             return self._inverters_cache
@@ -117,10 +219,44 @@ class SolArkCloudAPI:
         endpoint: str,
         data: Optional[Dict[str, Any]] = None,
         auth_required: bool = True,
+        loads: Optional[Callable[[str], Any]] = None,
     ) -> Dict[str, Any]:
-        if auth_required:
+        async def _send() -> Dict[str, Any]:
+            with span(f"{method} {normalize_endpoint(endpoint)}"):
+                with self.metrics.track(endpoint):
+                    return await self._send_request(method, endpoint, data, loads)
+
+        if not auth_required:
+            return await _send()
+        return await self._with_reauth(endpoint, _send)
+
+    async def _with_reauth(
+        self, endpoint: str, send: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Send an authenticated request, logging in again once if rejected.
+
+        Only an auth rejection triggers a new login; every other error
+        (including 5xx and rate limiting) is raised as is.
+        """
+        await self._auth.ensure_token()
+        token = self._auth.token
+        try:
+            return await send()
+        except SolArkAuthError:
+            if token is None:
+                raise
+            _LOGGER.debug("Token rejected for %s; logging in again", endpoint)
+            self._auth.invalidate(token)
             await self._auth.ensure_token()
+            return await send()
 
+    async def _send_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]],
+        loads: Optional[Callable[[str], Any]],
+    ) -> Dict[str, Any]:
         url = f"{self.api_url}{endpoint}"
         headers = self._auth.get_headers(strict=True)
 
@@ -146,7 +282,7 @@ class SolArkCloudAPI:
                 headers=headers,
                 json=json_body,
                 params=params,
-                timeout=aiohttp.ClientTimeout(total=30),
+                timeout=aiohttp.ClientTimeout(total=request_timeout()),
             ) as resp:
                 text = await resp.text()
                 _LOGGER.debug(
@@ -159,28 +295,41 @@ class SolArkCloudAPI:
                 try:
                     resp.raise_for_status()
                 except aiohttp.ClientResponseError as exc:
-                    raise SolArkCloudAPIError(
-                        f"HTTP {resp.status} for {endpoint}: {text[:500]}"
+                    raise error_for_status(
+                        resp.status,
+                        f"HTTP {resp.status} for {endpoint}: {text[:500]}",
+                        endpoint,
+                        resp.headers.get("Retry-After"),
                     ) from exc
 
                 try:
-                    result = await resp.json()
+                    if loads is None:
+                        result = await resp.json()
+                    else:
+                        result = await resp.json(loads=loads)
                 except Exception as exc:  # noqa: BLE001
-                    raise SolArkCloudAPIError(
-                        f"Invalid JSON response from {endpoint}: {text[:200]}"
+                    raise SolArkResponseError(
+                        f"Invalid JSON response from {endpoint}: {text[:200]}",
+                        endpoint=endpoint,
+                        status=resp.status,
                     ) from exc
 
         except asyncio.TimeoutError as exc:  # noqa: BLE001
-            raise SolArkCloudAPIError(f"Timeout for {endpoint}") from exc
+            raise timeout_error(endpoint) from exc
         except aiohttp.ClientError as exc:  # noqa: BLE001
-            raise SolArkCloudAPIError(f"Client error for {endpoint}: {exc}") from exc
+            raise SolArkConnectionError(
+                f"Client error for {endpoint}: {exc}", endpoint=endpoint
+            ) from exc
 
         if isinstance(result, dict):
             code = result.get("code")
             if code not in (0, "0", None):
                 msg = result.get("msg", "Unknown error")
-                raise SolArkCloudAPIError(
-                    f"API error for {endpoint}: {msg} (code={code})"
+                raise error_for_code(
+                    code,
+                    msg,
+                    f"API error for {endpoint}: {msg} (code={code})",
+                    endpoint,
                 )
 
         return result
@@ -231,14 +380,20 @@ class SolArkCloudAPI:
 
         return live_data
 
-    async def get_inverter_live_data_by_sn(self, sn: str) -> Dict[str, Any]:
-        """Fetch live inverter data via dy/store/{sn}/read for a specific inverter."""
+    async def get_inverter_live_data_by_sn(
+        self, sn: str, keys: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """Fetch live inverter data via dy/store/{sn}/read for a specific inverter.
+
+        With ``keys``, only those values are kept while decoding.
+        """
         await self._auth.ensure_token()
         _LOGGER.debug("Requesting live data for inverter SN=%s", sn)
         live_resp = await self._request(
             "GET",
             f"/api/v1/dy/store/{sn}/read",
             {"sn": sn},
+            loads=None if keys is None else projecting_loads(keys),
         )
         _LOGGER.debug("Raw live response: %s", live_resp)
 
@@ -250,6 +405,17 @@ class SolArkCloudAPI:
         _LOGGER.debug("Live data keys for SN=%s: %s", sn, list(live_data.keys()))
         return live_data
 
+    async def get_extended_data(self, groups: Iterable[str]) -> Dict[str, float]:
+        """Fetch the extended telemetry tier for the master inverter."""
+        groups = list(groups)
+        sn = await self._get_master_sn()
+        if not sn or not groups:
+            return {}
+        live_data = await self.get_inverter_live_data_by_sn(
+            sn, keys=projected_keys(groups)
+        )
+        return parse_extended(live_data, groups)
+
     async def get_inverters(
         self,
         page: int = 1,
@@ -337,6 +503,41 @@ class SolArkCloudAPI:
         }
         return await self._request("GET", "/api/v1/gateways", params)
 
+    async def get_gateway_online(self) -> Optional[bool]:
+        """Return whether the master inverter's gateway (dongle) is online.
+
+        Gateways are filtered by plant and master inverter SN. Returns None
+        when no gateway status is reported.
+        """
+        sn = await self._get_master_sn()
+        resp = await self.get_gateways(plant_id=self.plant_id, inv_sn=sn or "")
+        data = resp.get("data") if isinstance(resp, dict) else None
+        if not isinstance(data, dict):
+            return None
+        gateways = data.get("infos") or data.get("list") or []
+        known = [
+            online
+            for online in (self._gateway_online(g) for g in gateways)
+            if online is not None
+        ]
+        if not known:
+            return None
+        return any(known)
+
+    @staticmethod
+    def _gateway_online(gateway: Any) -> Optional[bool]:
+        if not isinstance(gateway, dict):
+            return None
+        status = gateway.get("status")
+        if status is None:
+            return None
+        if isinstance(status, str) and not status.strip().lstrip("-").isdigit():
+            return status.strip().lower() == "online"
+        try:
+            return int(status) == 1
+        except (TypeError, ValueError):
+            return None
+
     async def get_common_settings(self, sn: str) -> Dict[str, Any]:
         """Fetch common inverter settings via /api/v1/common/setting/{sn}/read."""
         await self._auth.ensure_token()
@@ -416,7 +617,7 @@ class SolArkCloudAPI:
             else settings_resp
         )
         if not isinstance(settings_data, dict):
-            raise SolArkCloudAPIError("Invalid settings response")
+            raise SolArkResponseError("Invalid settings response")
 
         if require_master:
             equip_mode = settings_data.get("equipMode")
@@ -459,7 +660,7 @@ class SolArkCloudAPI:
             else settings_resp
         )
         if not isinstance(settings_data, dict):
-            raise SolArkCloudAPIError("Invalid settings response")
+            raise SolArkResponseError("Invalid settings response")
 
         if require_master:
             equip_mode = settings_data.get("equipMode")
@@ -529,7 +730,19 @@ class SolArkCloudAPI:
         return False
 
     async def get_flow_data(self) -> Dict[str, Any]:
-        """Fetch plant power flow data (pv, batt, grid, load, soc)."""
+        """Fetch plant power flow data; {} when the request fails."""
+        try:
+            return await self.fetch_flow_data()
+        except SolArkCloudAPIError as exc:
+            _LOGGER.warning("Energy flow request failed: %s", exc)
+            return {}
+
+    async def fetch_flow_data(self) -> Dict[str, Any]:
+        """Fetch plant power flow data (pv, batt, grid, load, soc).
+
+        Raises SolArkCloudAPIError on failure; the poll cycle relies on it to
+        report the flow leg's status.
+        """
         await self._auth.ensure_token()
         date_str = datetime.now(self._timezone).strftime("%Y-%m-%d")
         params = {"date": date_str}
@@ -539,15 +752,11 @@ class SolArkCloudAPI:
             self.plant_id,
             params,
         )
-        try:
-            flow_resp = await self._request(
-                "GET",
-                endpoint,
-                params,
-            )
-        except SolArkCloudAPIError as exc:  # noqa: BLE001
-            _LOGGER.warning("Energy flow request failed: %s", exc)
-            return {}
+        flow_resp = await self._request(
+            "GET",
+            endpoint,
+            params,
+        )
 
         _LOGGER.debug("Raw flow response: %s", flow_resp)
         flow_data = flow_resp.get("data") if isinstance(flow_resp, dict) else None
@@ -557,10 +766,63 @@ class SolArkCloudAPI:
             return flow_resp
         return {}
 
+    async def get_plant_energy(self, period: str, when: date) -> Dict[str, Any]:
+        """Fetch server-computed plant energy for a day, month or year.
+
+        ``period`` is "day" (power curves for the date), "month" (kWh per day)
+        or "year" (kWh per month). The data holds an ``infos`` list with one
+        series per label (PV, Load, Import, Export, Charge, Discharge).
+        """
+        formats = {"day": "%Y-%m-%d", "month": "%Y-%m", "year": "%Y"}
+        if period not in formats:
+            raise ValueError(f"Unsupported energy period: {period}")
+        params = {
+            "date": when.strftime(formats[period]),
+            "id": self.plant_id,
+            "lan": "en",
+        }
+        endpoint = f"/api/v1/plant/energy/{self.plant_id}/{period}"
+        _LOGGER.debug(
+            "Requesting %s energy for plant %s with params=%s",
+            period,
+            self.plant_id,
+            params,
+        )
+        resp = await self._request("GET", endpoint, params)
+        data = resp.get("data") if isinstance(resp, dict) else None
+        return data if isinstance(data, dict) else {}
+
+    async def get_plant_energy_day(self, day: date) -> Dict[str, Any]:
+        return await self.get_plant_energy("day", day)
+
+    async def get_plant_energy_month(self, month: date) -> Dict[str, Any]:
+        return await self.get_plant_energy("month", month)
+
+    async def get_plant_energy_year(self, year: date) -> Dict[str, Any]:
+        return await self.get_plant_energy("year", year)
+
     async def get_workdata(
         self,
         sn: str,
         fields: Optional[List[str]] = None,
+        day: Optional[date] = None,
+        page: int = 1,
+        limit: int = 1,
+    ) -> Dict[str, Any]:
+        """Fetch dynamic workdata; {} when the API answers with an error code."""
+        try:
+            return await self.fetch_workdata(sn, fields, day, page, limit)
+        except SolArkAPICodeError as exc:
+            _LOGGER.warning("Workdata API error: %s", exc)
+            return {}
+
+    async def fetch_workdata(
+        self,
+        sn: str,
+        fields: Optional[List[str]] = None,
+        day: Optional[date] = None,
+        page: int = 1,
+        limit: int = 1,
     ) -> Dict[str, Any]:
         """Fetch dynamic workdata for an inverter.
 
@@ -570,17 +832,23 @@ class SolArkCloudAPI:
         Args:
             sn: Inverter serial number.
             fields: Optional list of field names to fetch. If None, fetches all.
+            day: Local date to query (defaults to today).
+            page: 1-based page number.
+            limit: Records per page (newest first).
 
         Returns:
             Dictionary with field names as keys and values.
+
+        Raises SolArkCloudAPIError on failure, including API error codes.
         """
-        await self._auth.ensure_token()
-        today = datetime.now(self._timezone).strftime("%Y-%m-%d")
+        if day is None:
+            day = datetime.now(self._timezone).date()
+        day_str = day.strftime("%Y-%m-%d")
         params: Dict[str, Any] = {
             "sn": sn,
-            "page": 1,
-            "limit": 1,
-            "dateRange": f"{today},{today}",
+            "page": page,
+            "limit": limit,
+            "dateRange": f"{day_str},{day_str}",
             "type": 1,
             "lan": "en",
             "sgip": "false",
@@ -588,16 +856,25 @@ class SolArkCloudAPI:
         if fields:
             params["fields"] = ",".join(fields)
 
-        url = "https://api.solarkcloud.com/api/v1/workdata/dynamic"
-        headers = self._auth.get_headers(strict=True)
         _LOGGER.debug("Requesting workdata for sn=%s fields=%s", sn, fields)
 
+        async def _send() -> Dict[str, Any]:
+            with span(f"GET {WORKDATA_ENDPOINT}", page=page, limit=limit):
+                with self.metrics.track(WORKDATA_ENDPOINT):
+                    return await self._send_workdata(params)
+
+        return await self._with_reauth(WORKDATA_ENDPOINT, _send)
+
+    async def _send_workdata(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        url = f"{self._auth.legacy_url}{WORKDATA_ENDPOINT}"
+        headers = self._auth.get_headers(strict=True)
+
         try:
             async with self._session.get(
                 url,
                 headers=headers,
                 params=params,
-                timeout=aiohttp.ClientTimeout(total=30),
+                timeout=aiohttp.ClientTimeout(total=request_timeout()),
             ) as resp:
                 text = await resp.text()
                 _LOGGER.debug(
@@ -608,109 +885,503 @@ class SolArkCloudAPI:
                 try:
                     resp.raise_for_status()
                 except aiohttp.ClientResponseError as exc:
-                    raise SolArkCloudAPIError(
-                        f"HTTP {resp.status} for workdata: {text[:500]}"
+                    raise error_for_status(
+                        resp.status,
+                        f"HTTP {resp.status} for workdata: {text[:500]}",
+                        WORKDATA_ENDPOINT,
+                        resp.headers.get("Retry-After"),
                     ) from exc
 
                 try:
                     result = await resp.json()
                 except Exception as exc:  # noqa: BLE001
-                    raise SolArkCloudAPIError(
-                        f"Invalid JSON response from workdata: {text[:200]}"
+                    raise SolArkResponseError(
+                        f"Invalid JSON response from workdata: {text[:200]}",
+                        endpoint=WORKDATA_ENDPOINT,
+                        status=resp.status,
                     ) from exc
 
         except asyncio.TimeoutError as exc:
-            raise SolArkCloudAPIError("Timeout for workdata") from exc
+            raise timeout_error("workdata") from exc
         except aiohttp.ClientError as exc:
-            raise SolArkCloudAPIError(f"Client error for workdata: {exc}") from exc
+            raise SolArkConnectionError(
+                f"Client error for workdata: {exc}", endpoint=WORKDATA_ENDPOINT
+            ) from exc
 
         _LOGGER.debug("Raw workdata response: %s", result)
         if isinstance(result, dict):
             code = result.get("code")
             if code not in (0, "0", None):
                 msg = result.get("msg", "Unknown error")
-                _LOGGER.warning("Workdata API error: %s (code=%s)", msg, code)
-                return {}
+                raise error_for_code(
+                    code,
+                    msg,
+                    f"Workdata API error: {msg} (code={code})",
+                    WORKDATA_ENDPOINT,
+                )
             data = result.get("data")
             if isinstance(data, dict):
                 return data
             return result
         return {}
 
+    async def get_workdata_history(
+        self,
+        sn: str,
+        day: date,
+        fields: Optional[List[str]] = None,
+        page_size: int = WORKDATA_PAGE_SIZE,
+        max_concurrency: int = 4,
+    ) -> List[Dict[str, Any]]:
+        """Fetch every workdata record for one local day.
+
+        The first page reports the total record count; remaining pages are
+        then fetched concurrently (at most ``max_concurrency`` at a time).
+        Without a total, pages are read sequentially until a short page.
+        Any failed page raises, so a day is never returned incomplete.
+        """
+        first = await self.fetch_workdata(sn, fields, day=day, limit=page_size)
+        records = list(first.get("record") or [])
+        total = first.get("total")
+        try:
+            total = int(total)
+        except (TypeError, ValueError):
+            total = None
+
+        if total is None:
+            page = 1
+            last = records
+            while len(last) >= page_size:
+                page += 1
+                data = await self.fetch_workdata(
+                    sn, fields, day=day, page=page, limit=page_size
+                )
+                last = list(data.get("record") or [])
+                records.extend(last)
+            return records
+
+        pages = -(-total // page_size)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _fetch(page: int) -> List[Dict[str, Any]]:
+            async with semaphore:
+                data = await self.fetch_workdata(
+                    sn, fields, day=day, page=page, limit=page_size
+                )
+            return list(data.get("record") or [])
+
+        for chunk in await asyncio.gather(*(_fetch(p) for p in range(2, pages + 1))):
+            records.extend(chunk)
+        return records
+
+    def set_workdata_fields(self, fields: List[str]) -> None:
+        """Select extra workdata fields returned with each poll."""
+        self._workdata_fields = list(dict.fromkeys(fields))
+
+    async def inverter_model(self, sn: str) -> str:
+        """Return the model identifier used to key workdata catalogs."""
+        for inverter in await self._get_cached_inverters():
+            if (inverter.get("sn") or inverter.get("deviceSn")) != sn:
+                continue
+            for key in ("model", "equipType", "deviceType", "productName"):
+                if inverter.get(key):
+                    return str(inverter[key])
+        return "unknown"
+
+    async def get_workdata_catalog(
+        self, sn: str, refresh: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
+        """Return ``{field: {"name", "unit"}}`` for the inverter's model.
+
+        Discovered once per model from a full-field workdata record and cached
+        (see export_workdata_catalogs). Returns {} if discovery fails; a
+        failed discovery is retried after WORKDATA_CATALOG_RETRY, not on
+        every poll.
+        """
+        try:
+            model = await self.inverter_model(sn)
+        except DeadlineExceeded:
+            raise
+        except SolArkCloudAPIError as exc:
+            _LOGGER.debug("Unable to discover workdata catalog: %s", exc)
+            return {}
+        if not refresh and (
+            model in self._workdata_catalogs
+            or time.monotonic() < self._catalog_retry_at.get(model, 0.0)
+        ):
+            return self._workdata_catalogs.get(model, {})
+        try:
+            data = await self.get_workdata(sn)
+        except DeadlineExceeded:
+            raise
+        except SolArkCloudAPIError as exc:
+            _LOGGER.debug("Unable to discover workdata catalog: %s", exc)
+            data = {}
+        records = data.get("record") or []
+        if records and isinstance(records[0], dict):
+            self._workdata_catalogs[model] = build_catalog(records[0])
+            self._catalog_retry_at.pop(model, None)
+            _LOGGER.debug(
+                "Discovered %d workdata fields for model %s",
+                len(self._workdata_catalogs[model]),
+                model,
+            )
+        else:
+            self._catalog_retry_at[model] = time.monotonic() + WORKDATA_CATALOG_RETRY
+        return self._workdata_catalogs.get(model, {})
+
+    def export_workdata_catalogs(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        return self._workdata_catalogs
+
+    def restore_workdata_catalogs(
+        self, catalogs: Dict[str, Dict[str, Dict[str, Any]]]
+    ) -> None:
+        for model, catalog in (catalogs or {}).items():
+            if isinstance(catalog, dict):
+                self._workdata_catalogs.setdefault(model, catalog)
+
+    def _workdata_request_fields(
+        self, catalog: Dict[str, Dict[str, Any]]
+    ) -> Optional[List[str]]:
+        """Fields for the batched per-poll request (None = all fields)."""
+        if not catalog or not self._workdata_projection:
+            return None
+        wanted = {AC_RELAY_FIELD, *resolve_power_fields([catalog]).values()}
+        wanted.update(self._workdata_fields)
+        return sorted(field for field in wanted if field in catalog)
+
+    async def sync_workdata(
+        self, sn: str, page_size: int = WORKDATA_PAGE_SIZE
+    ) -> List[Dict[str, Any]]:
+        """Return every workdata record newer than the SN's cursor.
+
+        Records come back oldest first and the cursor advances to the newest.
+        The first call (or one after a gap longer than BACKFILL_MIN_GAP) only
+        seeds the cursor from the latest record; a skipped range is kept for
+        pop_workdata_gap so the statistics backfill can fill it. The page
+        size follows the time since the cursor, so a normal poll is a single
+        small request; pages are only followed when a page is entirely new. Only the relay, power and selected extra fields are
+        requested, in one batched ``fields=`` list.
+        """
+        fields = self._workdata_request_fields(await self.get_workdata_catalog(sn))
+        now = datetime.now(self._timezone)
+        cursor = previous = self._workdata_cursors.get(sn)
+        if cursor is not None and (now - cursor).total_seconds() > BACKFILL_MIN_GAP:
+            _LOGGER.debug("Workdata cursor for %s too old; reseeding", sn)
+            cursor = None
+            self._workdata_tail.pop(sn, None)
+
+        async def _fetch(**kwargs: Any) -> List[Dict[str, Any]]:
+            data = await self.get_workdata(sn, fields, **kwargs)
+            batch = list(data.get("record") or [])
+            if fields and batch and all(
+                record_time(record, self._timezone) is None for record in batch
+            ):
+                # The projection dropped the timestamps; stop projecting.
+                raise _ProjectionUnsupported
+            return batch
+
+        try:
+            records = await self._sync_workdata(sn, cursor, now, page_size, _fetch)
+        except _ProjectionUnsupported:
+            _LOGGER.debug("Workdata fields= drops timestamps; requesting all fields")
+            self._workdata_projection = False
+            return await self.sync_workdata(sn, page_size)
+        seeded = self._workdata_cursors.get(sn)
+        if cursor is None and previous is not None and seeded is not None:
+            # Records between the old cursor and the new seed were skipped.
+            self._workdata_gaps[sn] = (previous, seeded)
+        return records
+
+    def pop_workdata_gap(self, sn: str) -> Optional[tuple[datetime, datetime]]:
+        """Range skipped by the last reseed of the SN's cursor, once."""
+        return self._workdata_gaps.pop(sn, None)
+
+    async def _sync_workdata(
+        self,
+        sn: str,
+        cursor: Optional[datetime],
+        now: datetime,
+        page_size: int,
+        fetch: Callable[..., Awaitable[List[Dict[str, Any]]]],
+    ) -> List[Dict[str, Any]]:
+        if cursor is None:
+            records = (await fetch())[:1]
+        else:
+            # Records are at least a minute apart; +2 covers clock skew.
+            elapsed = (now - cursor).total_seconds()
+            limit = min(page_size, max(2, math.ceil(elapsed / 60) + 2))
+            records = []
+            days = sorted({cursor.date(), now.date()}, reverse=True)
+            for day in days:
+                page = 1
+                while True:
+                    batch = await fetch(day=day, page=page, limit=limit)
+                    newer = [
+                        record
+                        for record in batch
+                        if (when := record_time(record, self._timezone)) is not None
+                        and when > cursor
+                    ]
+                    records.extend(newer)
+                    if len(newer) < len(batch) or len(batch) < limit:
+                        break
+                    page += 1
+
+        timed = [
+            (when, record)
+            for record in records
+            if (when := record_time(record, self._timezone)) is not None
+        ]
+        if not timed:
+            # No usable timestamps: behave like a plain latest-record fetch.
+            return records[:1] if cursor is None else []
+        timed.sort(key=lambda item: item[0])
+        self._workdata_cursors[sn] = timed[-1][0]
+        self._workdata_latest[sn] = timed[-1]
+        return [record for _, record in timed]
+
+    def workdata_energy(
+        self, sn: str, records: List[Dict[str, Any]]
+    ) -> Optional[Dict[str, float]]:
+        """Energy (kWh) per power key since the previous synced record.
+
+        Returns None while no record with power values has been seen, so
+        callers can fall back to integrating sampled power.
+        """
+        samples = [
+            sample
+            for sample in records_to_samples(records, self._timezone)
+            if sample[1]
+        ]
+        tail = self._workdata_tail.get(sn)
+        if not samples:
+            if tail is None:
+                return None
+            return dict.fromkeys(self._WORKDATA_ENERGY_KEYS, 0.0)
+        self._workdata_tail[sn] = samples[-1]
+        if tail is not None:
+            samples.insert(0, tail)
+        return interval_energy(samples, self._WORKDATA_ENERGY_KEYS)
+
     async def get_plant_data(
         self,
         flow_data: Optional[Dict[str, Any]] = None,
         workdata: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
-        """Fetch combined plant data: flow data + workdata from master inverter."""
+        """Fetch combined plant data: flow data + workdata from master inverter.
+
+        Each leg (flow, workdata, inverters) runs within the remaining cycle
+        deadline, if one is set (see solark_deadline). A failed, timed out or
+        skipped leg never raises; its outcome is reported in ``legStatus``
+        and the other legs' data is returned. Only when no leg succeeded and
+        the cloud rate limited the cycle is the SolArkRateLimitError raised,
+        so the caller can back off.
+        """
+        with self.tracer.trace("plant_data"):
+            return await self._collect_plant_data(flow_data, workdata)
+
+    async def _collect_plant_data(
+        self,
+        flow_data: Optional[Dict[str, Any]],
+        workdata: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
         combined: Dict[str, Any] = {}
+        legs: Dict[str, str] = {}
+        errors: Dict[str, SolArkCloudAPIError] = {}
+        started = time.monotonic()
+        budget = remaining()
 
         # Fetch flow data (plant-level aggregates)
-        try:
-            if flow_data is None:
-                flow_data = await self.get_flow_data()
-            if flow_data:
-                _LOGGER.debug(
-                    "Adding flow_data keys: %s", list(flow_data.keys())
-                )
-                for key in (
-                    "pvPower",
-                    "battPower",
-                    "gridOrMeterPower",
-                    "loadOrEpsPower",
-                    "soc",
-                    "gridTo",
-                    "toGrid",
-                    "toBat",
-                    "batTo",
-                    "existsMeter",
-                    "genOn",
-                ):
-                    if key in flow_data:
-                        combined[key] = flow_data[key]
-        except Exception as exc:  # noqa: BLE001
-            _LOGGER.warning("Unable to fetch flow data: %s", exc)
-
-        # Fetch workdata from master inverter for AcRelayStatus
-        try:
-            if workdata is None:
-                master_sn = await self._get_master_sn()
-                if master_sn:
-                    workdata = await self.get_workdata(
-                        master_sn, fields=["AcRelayStatus(NA)/194"]
-                    )
-            if workdata:
-                records = workdata.get("record", [])
-                if records and isinstance(records, list) and len(records) > 0:
-                    latest = records[0]
-                    ac_relay = latest.get("AcRelayStatus(NA)/194")
-                    if ac_relay is not None:
-                        combined["acRelayStatus"] = ac_relay
-                        _LOGGER.debug("AcRelayStatus from workdata: %s", ac_relay)
-        except Exception as exc:  # noqa: BLE001
-            _LOGGER.warning("Unable to fetch workdata: %s", exc)
+        if flow_data is None:
+            flow_data = await self._run_leg(
+                legs, errors, "flow", self.fetch_flow_data
+            )
+        if flow_data:
+            _LOGGER.debug("Adding flow_data keys: %s", list(flow_data.keys()))
+            for key in (
+                "pvPower",
+                "battPower",
+                "gridOrMeterPower",
+                "loadOrEpsPower",
+                "soc",
+                "gridTo",
+                "toGrid",
+                "toBat",
+                "batTo",
+                "existsMeter",
+                "genOn",
+            ):
+                if key in flow_data:
+                    combined[key] = flow_data[key]
+
+        # Sync workdata records from the master inverter (AcRelayStatus and
+        # record-resolution energy)
+        supplied = workdata is not None
+        if workdata is None:
+            workdata = await self._run_leg(
+                legs,
+                errors,
+                "workdata",
+                lambda: self._sync_master_workdata(combined),
+            )
+        latest: Optional[Dict[str, Any]] = None
+        if supplied:
+            records = workdata.get("record", []) if workdata else []
+            if records and isinstance(records, list):
+                latest = records[0]
+        else:
+            latest, stale = self._latest_master_record(legs.get("workdata"))
+            if stale:
+                combined["workdataStale"] = True
+        if latest:
+            ac_relay = latest.get(AC_RELAY_FIELD)
+            if ac_relay is not None:
+                combined["acRelayStatus"] = ac_relay
+                _LOGGER.debug("AcRelayStatus from workdata: %s", ac_relay)
+            extra = {
+                field: latest[field]
+                for field in self._workdata_fields
+                if field in latest
+            }
+            if extra:
+                combined["workdataValues"] = extra
 
         # Fetch fresh inverter data for energy values (not cached)
+        inverters = await self._run_leg(
+            legs, errors, "inverters", self._fetch_inverters, logging.DEBUG
+        )
+        if inverters:
+            combined["inverters"] = inverters
+            first = inverters[0]
+            etoday = self._safe_float(first.get("etoday"))
+            etotal = self._safe_float(first.get("etotal"))
+            if etoday > 0:
+                combined["energyToday"] = etoday
+            if etotal > 0:
+                combined["energyTotal"] = etotal
+
+        if legs:
+            combined["legStatus"] = legs
+        elapsed = time.monotonic() - started
+        self.metrics.record_cycle(
+            elapsed, None if LEG_OK in legs.values() or not legs else "failed"
+        )
+        self.last_cycle = {
+            "budget": None if budget is None else round(budget, 3),
+            "elapsed": round(elapsed, 3),
+            "legs": legs,
+            "errors": {name: exc.as_dict() for name, exc in errors.items()},
+        }
+        if legs and LEG_OK not in legs.values():
+            # Nothing usable: surface a rate limit so the caller backs off
+            for exc in errors.values():
+                if isinstance(exc, SolArkRateLimitError):
+                    raise exc
+        if LEG_TIMEOUT in legs.values() or LEG_SKIPPED in legs.values():
+            _LOGGER.warning(
+                "SolArk poll cycle incomplete; returning partial data (%s)",
+                legs,
+            )
+        return combined
+
+    async def _run_leg(
+        self,
+        legs: Dict[str, str],
+        errors: Dict[str, SolArkCloudAPIError],
+        name: str,
+        fetch: Callable[[], Awaitable[Any]],
+        level: int = logging.WARNING,
+    ) -> Any:
+        """Run one data leg, recording its status instead of raising.
+
+        Once a leg was rate limited or its credentials rejected, the
+        remaining legs are skipped: they would only fail the same way.
+        """
+        with span(f"leg.{name}") as leg_span:
+            result = await self._run_leg_fetch(legs, errors, name, fetch, level)
+            if leg_span is not None:
+                leg_span.status = legs[name]
+        return result
+
+    async def _run_leg_fetch(
+        self,
+        legs: Dict[str, str],
+        errors: Dict[str, SolArkCloudAPIError],
+        name: str,
+        fetch: Callable[[], Awaitable[Any]],
+        level: int,
+    ) -> Any:
+        if expired() or any(
+            isinstance(exc, (SolArkRateLimitError, SolArkAuthError))
+            for exc in errors.values()
+        ):
+            legs[name] = LEG_SKIPPED
+            return None
         try:
-            inverters = await self._fetch_inverters()
-            if inverters:
-                first = inverters[0]
-                etoday = self._safe_float(first.get("etoday"))
-                etotal = self._safe_float(first.get("etotal"))
-                if etoday > 0:
-                    combined["energyToday"] = etoday
-                if etotal > 0:
-                    combined["energyTotal"] = etotal
+            result = await fetch()
+        except DeadlineExceeded as exc:
+            _LOGGER.debug("Leg %s ran out of cycle time: %s", name, exc)
+            legs[name] = LEG_TIMEOUT
+            errors[name] = exc
+            return None
+        except SolArkCloudAPIError as exc:
+            _LOGGER.log(level, "Unable to fetch %s data: %s", name, exc)
+            legs[name] = LEG_ERROR
+            errors[name] = exc
+            return None
         except Exception as exc:  # noqa: BLE001
-            _LOGGER.debug("Unable to fetch inverter energy stats: %s", exc)
+            _LOGGER.log(level, "Unable to fetch %s data: %s", name, exc)
+            legs[name] = LEG_ERROR
+            return None
+        legs[name] = LEG_OK
+        return result
 
-        return combined
+    async def _sync_master_workdata(
+        self, combined: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        master_sn = await self._get_master_sn()
+        if not master_sn:
+            return None
+        records = await self.sync_workdata(master_sn)
+        energy = self.workdata_energy(master_sn, records)
+        if energy is not None:
+            combined["workdataEnergy"] = energy
+        gap = self.pop_workdata_gap(master_sn)
+        if gap is not None:
+            combined["workdataGap"] = [when.timestamp() for when in gap]
+        return {"record": records[::-1]}
+
+    def _latest_master_record(
+        self, leg: Optional[str]
+    ) -> tuple[Optional[Dict[str, Any]], bool]:
+        """Newest synced master workdata record and whether it is stale.
+
+        The record stays in use between records; it is stale when the
+        workdata leg failed or it is older than WORKDATA_STALE_AFTER, and
+        dropped past the status retention window.
+        """
+        latest = self._workdata_latest.get(self._master_sn or "")
+        if latest is None:
+            return None, False
+        when, record = latest
+        age = (datetime.now(self._timezone) - when).total_seconds()
+        if age > self._status_retain_seconds:
+            return None, False
+        return record, leg != LEG_OK or age > WORKDATA_STALE_AFTER
 
     async def _get_master_sn(self) -> Optional[str]:
         """Get the master inverter serial number."""
         if self._master_sn:
             return self._master_sn
 
+        async with self._master_sn_lock:
+            if self._master_sn:
+                return self._master_sn
+            with span("master_discovery"):
+                return await self._discover_master_sn()
+
+    async def _discover_master_sn(self) -> Optional[str]:
         # Try to find master from cached inverters + common settings
         try:
             inverters = await self._get_cached_inverters()
@@ -741,6 +1412,9 @@ class SolArkCloudAPI:
             await self.login()
             await self.get_plant_data()
             return True
+        except SolArkAuthError:
+            # Let the config flow report rejected credentials as such.
+            raise
         except SolArkCloudAPIError as exc:
             _LOGGER.error("SolArk test_connection failed: %s", exc)
             return False
@@ -762,183 +1436,52 @@ class SolArkCloudAPI:
         if not isinstance(data, dict):
             _LOGGER.warning("parse_plant_data got non-dict: %r", data)
             return {}
+        with span("parse"):
+            sensors, _ = self._parse_with_retention(data)
+        return sensors
 
+    def parse_plant_snapshot(self, data: Dict[str, Any]) -> PlantSnapshot:
+        """Map combined API fields to a PlantSnapshot (flags retained values)."""
+        if not isinstance(data, dict):
+            _LOGGER.warning("parse_plant_snapshot got non-dict: %r", data)
+            return PlantSnapshot()
+        with span("parse"):
+            sensors, retained = self._parse_with_retention(data)
+            return PlantSnapshot(sensors, stale=retained)
+
+    def _parse_with_retention(
+        self, data: Dict[str, Any]
+    ) -> tuple[Dict[str, Any], set[str]]:
         _LOGGER.debug("parse_plant_data received keys: %s", list(data.keys()))
 
-        sensors: Dict[str, Any] = {}
-
-        # ----- Energy today / total -----
-        if "energyToday" in data or "etoday" in data:
-            val = self._safe_float(data.get("energyToday", data.get("etoday")))
-            if val > 0:
-                sensors["energy_today"] = val
-        if "energyTotal" in data or "etotal" in data:
-            val = self._safe_float(data.get("energyTotal", data.get("etotal")))
-            if val > 0:
-                sensors["energy_total"] = val
-
-        # ----- Battery SOC -----
-        if "soc" in data:
-            sensors["battery_soc"] = self._safe_float(data.get("soc"))
-
-        if "battery_soc" not in sensors:
-            cur_cap = self._safe_float(data.get("curCap"))
-            batt_cap = self._safe_float(data.get("batteryCap"))
-            if batt_cap > 0:
-                sensors["battery_soc"] = (cur_cap / batt_cap) * 100.0
-
-        # ----- PV power -----
-        if "pvPower" in data:
-            sensors["pv_power"] = self._safe_float(data.get("pvPower"))
-
-        pv_sum = 0.0
-        for i in range(1, 13):
-            v_raw = data.get(f"volt{i}")
-            c_raw = data.get(f"current{i}")
-            if v_raw is None and c_raw is None:
-                continue
-            v = self._safe_float(v_raw)
-            c = self._safe_float(c_raw)
-            pv_sum += v * c
-
-        if "pv_power" not in sensors and pv_sum != 0.0:
-            sensors["pv_power"] = pv_sum
-
-        # ----- Battery power -----
-        if "battPower" in data:
-            batt_power = abs(self._safe_float(data.get("battPower")))
-            to_bat = data.get("toBat")
-            bat_to = data.get("batTo")
-            if to_bat and not bat_to:
-                sensors["battery_power"] = -batt_power
-            elif bat_to and not to_bat:
-                sensors["battery_power"] = batt_power
-            else:
-                sensors["battery_power"] = batt_power
-
-        if "battery_power" not in sensors:
-            cur_volt = self._safe_float(data.get("curVolt"))
-            charge_current = self._safe_float(data.get("chargeCurrent"))
-            if cur_volt != 0.0 or charge_current != 0.0:
-                sensors["battery_power"] = cur_volt * charge_current
-
-        # ----- Battery charge/discharge split -----
-        battery_power = self._safe_float(sensors.get("battery_power"))
-        if battery_power > 0.0:
-            sensors["battery_discharge_power"] = battery_power
-            sensors["battery_charge_power"] = 0.0
-        elif battery_power < 0.0:
-            sensors["battery_discharge_power"] = 0.0
-            sensors["battery_charge_power"] = abs(battery_power)
-        else:
-            sensors["battery_discharge_power"] = 0.0
-            sensors["battery_charge_power"] = 0.0
-
-        # ----- Grid / Meter power (flow) -----
-        if "gridOrMeterPower" in data:
-            sensors["grid_power"] = self._safe_float(data.get("gridOrMeterPower"))
-
-        # ----- Load / EPS power (flow) -----
-        if "loadOrEpsPower" in data:
-            sensors["load_power"] = self._safe_float(data.get("loadOrEpsPower"))
-
-        # ----- Grid import/export from meterA/B/C -----
-        meter_a = self._safe_float(data.get("meterA"))
-        meter_b = self._safe_float(data.get("meterB"))
-        meter_c = self._safe_float(data.get("meterC"))
-        grid_net = meter_a + meter_b + meter_c
-
-        if grid_net != 0.0:
-            if grid_net > 0:
-                sensors["grid_import_power"] = grid_net
-                sensors["grid_export_power"] = 0.0
-            else:
-                sensors["grid_import_power"] = 0.0
-                sensors["grid_export_power"] = abs(grid_net)
-        else:
-            if "gridImportPower" in data:
-                sensors["grid_import_power"] = self._safe_float(
-                    data.get("gridImportPower")
-                )
-            if "gridExportPower" in data:
-                sensors["grid_export_power"] = self._safe_float(
-                    data.get("gridExportPower")
-                )
-
-            # No CT meters: use gridOrMeterPower + direction flags from flow data.
-            if (
-                sensors.get("grid_import_power", 0.0) == 0.0
-                and sensors.get("grid_export_power", 0.0) == 0.0
-            ):
-                exists_meter = data.get("existsMeter")
-                no_meter = exists_meter in (False, 0, "0", None)
-                if no_meter:
-                    grid_flow = self._safe_float(data.get("gridOrMeterPower"))
-                    if grid_flow != 0.0:
-                        grid_to = data.get("gridTo")
-                        to_grid = data.get("toGrid")
-                        if grid_to is True and to_grid is not True:
-                            sensors["grid_import_power"] = abs(grid_flow)
-                            sensors["grid_export_power"] = 0.0
-                        elif to_grid is True and grid_to is not True:
-                            sensors["grid_import_power"] = 0.0
-                            sensors["grid_export_power"] = abs(grid_flow)
-                        else:
-                            if grid_flow > 0.0:
-                                sensors["grid_import_power"] = abs(grid_flow)
-                                sensors["grid_export_power"] = 0.0
-                            elif grid_flow < 0.0:
-                                sensors["grid_import_power"] = 0.0
-                                sensors["grid_export_power"] = abs(grid_flow)
-
-        # ----- Grid Status -----
-        grid_to = data.get("gridTo")
-        to_grid = data.get("toGrid")
-        if grid_to is False and to_grid is False:
-            sensors["grid_status"] = "Inactive"
-        elif grid_to or to_grid:
-            sensors["grid_status"] = "Active"
-
-        # ----- AC Relay Status (reliable grid connection from workdata) -----
-        ac_relay = data.get("acRelayStatus")
-        if ac_relay is not None:
-            try:
-                ac_relay_int = int(ac_relay)
-                sensors["ac_relay_status"] = (
-                    "Connected" if ac_relay_int == 1 else "Disconnected"
-                )
-            except (TypeError, ValueError):
-                _LOGGER.debug("Invalid acRelayStatus value: %r", ac_relay)
-
-        # ----- Generator Status -----
-        gen_on = data.get("genOn")
-        if gen_on is not None:
-            sensors["generator_status"] = "Running" if gen_on else "Off"
-
-        sensors.setdefault("pv_power", 0.0)
-        sensors.setdefault("battery_power", 0.0)
-        sensors.setdefault("grid_power", 0.0)
-        sensors.setdefault("load_power", 0.0)
-        sensors.setdefault("grid_import_power", 0.0)
-        sensors.setdefault("grid_export_power", 0.0)
-        sensors.setdefault("battery_soc", 0.0)
-        sensors.setdefault("battery_charge_power", 0.0)
-        sensors.setdefault("battery_discharge_power", 0.0)
+        sensors = self._parser.parse(data)
+        retained: set[str] = set()
+        if "workdataEnergy" in data:
+            sensors["workdata_energy"] = data["workdataEnergy"]
+        if "workdataValues" in data:
+            sensors["workdata_values"] = data["workdataValues"]
+            if data.get("workdataStale"):
+                sensors["workdata_stale"] = True
 
         # ----- Retain last-known values through brief data gaps -----
         now = datetime.utcnow()
 
         # Energy counters: retain last-known value when API returns zero/missing,
         # so TOTAL_INCREASING sensors don't briefly drop and cause bogus spikes.
-        for key in ("energy_today", "energy_total"):
+        for key in self._RETAINED_ENERGY_KEYS:
             if key in sensors and sensors[key] > 0:
                 self._last_status[key] = (sensors[key], now)
             elif key in self._last_status:
                 cached_value, _ = self._last_status[key]
                 sensors[key] = cached_value
+                retained.add(key)
                 _LOGGER.debug("Retaining cached %s=%s", key, cached_value)
-        for key in ("grid_status", "generator_status", "ac_relay_status"):
-            if key in sensors and sensors[key] != "Unknown":
+        workdata_stale = bool(data.get("workdataStale"))
+        for key in self._RETAINED_STATUS_KEYS:
+            if key == "ac_relay_status" and workdata_stale and key in sensors:
+                # Reused from an old workdata record; keep the cache time
+                retained.add(key)
+            elif key in sensors and sensors[key] != "Unknown":
                 # Got a real value — cache it
                 self._last_status[key] = (sensors[key], now)
             elif key in self._last_status:
@@ -947,6 +1490,7 @@ class SolArkCloudAPI:
                 age = (now - cached_time).total_seconds()
                 if age <= self._status_retain_seconds:
                     sensors[key] = cached_value
+                    retained.add(key)
                     _LOGGER.debug(
                         "Retaining cached %s=%s (age %ds)", key, cached_value, age
                     )
@@ -957,7 +1501,52 @@ class SolArkCloudAPI:
                 sensors.setdefault(key, "Unknown")
 
         _LOGGER.debug("Parsed sensors dict: %s", sensors)
-        return sensors
+        return sensors, retained
+
+    def export_status_cache(self) -> Dict[str, list[Any]]:
+        """Return retained last-known values in a JSON-serializable form."""
+        return {
+            key: [value, timestamp.isoformat()]
+            for key, (value, timestamp) in self._last_status.items()
+        }
+
+    def restore_status_cache(self, cache: Dict[str, Any]) -> None:
+        """Restore retained last-known values saved by export_status_cache."""
+        for key, item in (cache or {}).items():
+            try:
+                value, timestamp = item
+                self._last_status.setdefault(
+                    key, (value, datetime.fromisoformat(timestamp))
+                )
+            except (TypeError, ValueError):
+                _LOGGER.debug("Ignoring invalid cached status %s=%r", key, item)
+
+    @staticmethod
+    def stale_snapshot(snapshot: PlantSnapshot) -> PlantSnapshot:
+        """Return a copy of the snapshot with every value flagged stale."""
+        stale = PlantSnapshot.from_compact(snapshot.to_compact())
+        stale.stale_mask = (1 << len(SNAPSHOT_FIELDS)) - 1
+        if stale.extra and "workdata_values" in stale.extra:
+            stale.extra["workdata_stale"] = True
+        return stale
+
+    def restore_snapshot(self, snapshot: PlantSnapshot) -> PlantSnapshot:
+        """Prepare a persisted snapshot for publishing after a restart.
+
+        Every value is flagged stale, and status values older than the
+        retention window are reported as Unknown, matching what
+        parse_plant_data would do for a live data gap.
+        """
+        restored = self.stale_snapshot(snapshot)
+        if restored.extra:
+            # Energy increments were consumed before the restart.
+            restored.extra.pop("workdata_energy", None)
+            restored.extra = restored.extra or None
+        if snapshot.age > self._status_retain_seconds:
+            for key in self._RETAINED_STATUS_KEYS:
+                if getattr(restored, key) is not None:
+                    setattr(restored, key, "Unknown")
+        return restored
 
     def _build_common_setting_payload(
         self, sn: str, live_data: Dict[str, Any]
@@ -1074,3 +1663,7 @@ class SolArkCloudAPI:
 
     def has_pending_settings(self) -> bool:
         return bool(self._pending_setting_overrides)
+
+
+class _ProjectionUnsupported(Exception):
+    """Raised when a fields= workdata request returns untimed records."""
@@ -0,0 +1,82 @@
+"""Cycle deadlines shared by every request of a poll cycle (HA independent).
+
+A deadline is set with ``deadline_scope`` around a whole poll cycle. It lives
+in a context variable, so it reaches auth, every data leg and any task they
+start without being passed around. Requests size their timeout with
+``request_timeout``, which never exceeds the time left in the cycle.
+"""
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from .solark_errors import SolArkTimeoutError
+
+DEFAULT_REQUEST_TIMEOUT = 30.0
+
+# Monotonic time at which the current cycle must be done
+_DEADLINE: ContextVar[Optional[float]] = ContextVar("solark_deadline", default=None)
+
+
+class DeadlineExceeded(SolArkTimeoutError):
+    """The cycle deadline expired before or during a request."""
+
+    kind = "deadline"
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """Bound everything awaited inside to ``seconds`` from now.
+
+    Nested scopes can only shorten the deadline. ``None`` keeps the current
+    one (or none).
+    """
+    current = _DEADLINE.get()
+    if seconds is None:
+        expires = current
+    else:
+        expires = time.monotonic() + seconds
+        if current is not None:
+            expires = min(expires, current)
+    token = _DEADLINE.set(expires)
+    try:
+        yield
+    finally:
+        _DEADLINE.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the deadline (None when no deadline is set)."""
+    expires = _DEADLINE.get()
+    if expires is None:
+        return None
+    return max(expires - time.monotonic(), 0.0)
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def request_timeout(default: float = DEFAULT_REQUEST_TIMEOUT) -> float:
+    """Timeout for the next request: ``default`` capped by the time left.
+
+    Raises DeadlineExceeded when the deadline has already passed.
+    """
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceeded("Poll cycle deadline exceeded")
+    return min(default, left)
+
+
+def timeout_error(what: str) -> SolArkTimeoutError:
+    """Error for a request timeout, distinguishing an expired cycle deadline."""
+    if expired():
+        return DeadlineExceeded(
+            f"Poll cycle deadline exceeded during {what}", endpoint=what
+        )
+    return SolArkTimeoutError(f"Timeout for {what}", endpoint=what)
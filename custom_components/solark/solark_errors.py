@@ -1,5 +1,153 @@
-"""SolArk shared exception types."""
+"""SolArk shared exception types.
+
+Every error raised by the client is a ``SolArkCloudAPIError``. Subclasses
+describe what failed, carry the endpoint, HTTP status and API code when
+known, and say whether trying again later can help (``retryable``):
+
+- ``SolArkAuthError``: credentials or token rejected. A stale token is
+  refreshed once by the client; repeating a rejected login does not help.
+- ``SolArkRateLimitError``: HTTP 429. Retry, but not before ``retry_after``.
+- ``SolArkServerError``: HTTP 5xx. Retry later; logging in again does not help.
+- ``SolArkRequestError``: any other HTTP 4xx. Never retry.
+- ``SolArkConnectionError`` / ``SolArkTimeoutError``: transport failures.
+- ``SolArkResponseError``: unparsable or malformed response body.
+- ``SolArkAPICodeError``: the API answered with ``code != 0``.
+"""
+from __future__ import annotations
+
+from typing import Any, Optional
+
+# API codes (and message fragments) that mean the token was rejected
+_AUTH_CODES = frozenset({"401", "403"})
+_AUTH_MESSAGES = ("token", "unauthorized", "login")
 
 
 class SolArkCloudAPIError(Exception):
     """Exception for Sol-Ark Cloud API errors."""
+
+    kind = "error"
+    retryable = False
+
+    def __init__(
+        self,
+        message: str = "",
+        *,
+        endpoint: Optional[str] = None,
+        status: Optional[int] = None,
+        code: Any = None,
+        retryable: Optional[bool] = None,
+    ) -> None:
+        super().__init__(message)
+        self.endpoint = endpoint
+        self.status = status
+        self.code = code
+        if retryable is not None:
+            self.retryable = retryable
+
+    def as_dict(self) -> dict[str, Any]:
+        """Structured form for logs, diagnostics and the CLI."""
+        return {
+            "kind": self.kind,
+            "retryable": self.retryable,
+            "endpoint": self.endpoint,
+            "status": self.status,
+            "code": self.code,
+            "message": str(self),
+        }
+
+
+class SolArkAuthError(SolArkCloudAPIError):
+    """Credentials or token rejected."""
+
+    kind = "auth"
+
+
+class SolArkRateLimitError(SolArkCloudAPIError):
+    """Too many requests (HTTP 429)."""
+
+    kind = "rate_limited"
+    retryable = True
+
+    def __init__(
+        self, message: str = "", *, retry_after: Optional[float] = None, **kwargs: Any
+    ) -> None:
+        super().__init__(message, **kwargs)
+        self.retry_after = retry_after
+
+
+class SolArkServerError(SolArkCloudAPIError):
+    """Server side failure (HTTP 5xx)."""
+
+    kind = "server"
+    retryable = True
+
+
+class SolArkRequestError(SolArkCloudAPIError):
+    """Request rejected as invalid (HTTP 4xx other than auth/429)."""
+
+    kind = "bad_request"
+
+
+class SolArkConnectionError(SolArkCloudAPIError):
+    """Network failure before a response was received."""
+
+    kind = "connection"
+    retryable = True
+
+
+class SolArkTimeoutError(SolArkConnectionError):
+    """Request timed out."""
+
+    kind = "timeout"
+
+
+class SolArkResponseError(SolArkCloudAPIError):
+    """Response body was not the JSON object the endpoint returns."""
+
+    kind = "invalid_response"
+    retryable = True
+
+
+class SolArkAPICodeError(SolArkCloudAPIError):
+    """The API reported a failure (``code != 0``)."""
+
+    kind = "api"
+
+
+def error_for_status(
+    status: int,
+    message: str,
+    endpoint: Optional[str] = None,
+    retry_after: Optional[str] = None,
+) -> SolArkCloudAPIError:
+    """Typed error for an HTTP error status."""
+    if status in (401, 403):
+        return SolArkAuthError(message, endpoint=endpoint, status=status)
+    if status == 429:
+        return SolArkRateLimitError(
+            message,
+            endpoint=endpoint,
+            status=status,
+            retry_after=_parse_retry_after(retry_after),
+        )
+    if status >= 500:
+        return SolArkServerError(message, endpoint=endpoint, status=status)
+    return SolArkRequestError(message, endpoint=endpoint, status=status)
+
+
+def error_for_code(
+    code: Any, msg: Any, message: str, endpoint: Optional[str] = None
+) -> SolArkCloudAPIError:
+    """Typed error for an API response with ``code != 0``."""
+    text = str(msg or "").lower()
+    if str(code) in _AUTH_CODES or any(word in text for word in _AUTH_MESSAGES):
+        return SolArkAuthError(message, endpoint=endpoint, code=code)
+    return SolArkAPICodeError(message, endpoint=endpoint, code=code)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    try:
+        return max(float(value), 0.0) if value is not None else None
+    except ValueError:
+        # HTTP-date form; callers fall back to their own backoff.
+        return None
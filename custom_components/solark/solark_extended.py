@@ -0,0 +1,128 @@
+"""Extended telemetry from dy/store live data (HA independent).
+
+The extended tier is opt-in per group. Only the raw keys of the enabled groups
+are kept when the live payload is decoded (see ``projecting_loads``), so the
+tier costs nothing when disabled and little when enabled.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Tuple
+
+from .solark_parser import PV_STRING_COUNT, to_float
+
+EXTENDED_GROUPS: Dict[str, str] = {
+    "pv_strings": "Per-string PV voltage, current and power",
+    "meters": "Per-phase meter power",
+    "bms": "Battery BMS voltage, current and capacity",
+}
+
+# Envelope keys that must survive projection
+_ENVELOPE_KEYS = frozenset({"code", "msg", "data", "success"})
+
+
+def _value(*values: Any) -> float:
+    return to_float(values[0])
+
+
+def _product(volt: Any, current: Any) -> float:
+    return to_float(volt) * to_float(current)
+
+
+@dataclass(frozen=True)
+class ExtendedField:
+    """One extended sensor: raw dy/store keys -> value."""
+
+    key: str
+    group: str
+    sources: Tuple[str, ...]
+    name: str
+    unit: str
+    fn: Callable[..., float] = _value
+
+
+def _pv_string_fields() -> Tuple[ExtendedField, ...]:
+    fields = []
+    for i in range(1, PV_STRING_COUNT + 1):
+        volt, current = f"volt{i}", f"current{i}"
+        fields.extend(
+            (
+                ExtendedField(
+                    f"pv{i}_voltage", "pv_strings", (volt,), f"PV{i} Voltage", "V"
+                ),
+                ExtendedField(
+                    f"pv{i}_current", "pv_strings", (current,), f"PV{i} Current", "A"
+                ),
+                ExtendedField(
+                    f"pv{i}_power",
+                    "pv_strings",
+                    (volt, current),
+                    f"PV{i} Power",
+                    "W",
+                    _product,
+                ),
+            )
+        )
+    return tuple(fields)
+
+
+EXTENDED_FIELDS: Tuple[ExtendedField, ...] = _pv_string_fields() + (
+    ExtendedField("meter_a_power", "meters", ("meterA",), "Meter A Power", "W"),
+    ExtendedField("meter_b_power", "meters", ("meterB",), "Meter B Power", "W"),
+    ExtendedField("meter_c_power", "meters", ("meterC",), "Meter C Power", "W"),
+    ExtendedField("battery_voltage", "bms", ("curVolt",), "Battery Voltage", "V"),
+    ExtendedField(
+        "battery_current", "bms", ("chargeCurrent",), "Battery Current", "A"
+    ),
+    ExtendedField(
+        "battery_capacity", "bms", ("curCap",), "Battery Remaining Capacity", "Ah"
+    ),
+    ExtendedField(
+        "battery_capacity_total", "bms", ("batteryCap",), "Battery Capacity", "Ah"
+    ),
+)
+EXTENDED_FIELDS_BY_KEY: Dict[str, ExtendedField] = {
+    field.key: field for field in EXTENDED_FIELDS
+}
+
+
+def enabled_fields(groups: Iterable[str]) -> Tuple[ExtendedField, ...]:
+    groups = set(groups)
+    return tuple(field for field in EXTENDED_FIELDS if field.group in groups)
+
+
+def projected_keys(groups: Iterable[str]) -> FrozenSet[str]:
+    """Raw dy/store keys needed for the enabled groups."""
+    return frozenset(
+        source for field in enabled_fields(groups) for source in field.sources
+    )
+
+
+def projecting_loads(keys: Iterable[str]) -> Callable[[str], Any]:
+    """``json.loads`` that only keeps ``keys`` (plus the response envelope).
+
+    Objects are filtered as they are decoded, so unused values never make it
+    into a dict.
+    """
+    wanted = frozenset(keys) | _ENVELOPE_KEYS
+
+    def _hook(pairs: list[tuple[str, Any]]) -> Dict[str, Any]:
+        return {key: value for key, value in pairs if key in wanted}
+
+    return partial(json.loads, object_pairs_hook=_hook)
+
+
+def parse_extended(data: Dict[str, Any], groups: Iterable[str]) -> Dict[str, float]:
+    """Compute extended sensor values for the enabled groups.
+
+    Fields whose sources are all missing (e.g. unused PV strings) are left out.
+    """
+    values: Dict[str, float] = {}
+    for field in enabled_fields(groups):
+        raw = [data.get(source) for source in field.sources]
+        if all(value is None for value in raw):
+            continue
+        values[field.key] = field.fn(*raw)
+    return values
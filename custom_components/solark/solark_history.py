@@ -0,0 +1,228 @@
+"""Turn workdata history and plant energy aggregates into energy totals.
+
+HA independent.
+
+Workdata records are keyed by ``Name(unit)/id`` field names (for example
+``AcRelayStatus(NA)/194``). The numeric id differs between inverter models, so
+power fields are resolved by display name from the records themselves.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, tzinfo
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .solark_batch import HAS_NUMPY, parse_plant_batch
+from .solark_parser import PlantDataParser, to_float
+
+# Combined-data key -> workdata display names to look for (first match wins)
+WORKDATA_POWER_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "pvPower": ("Total PV Power", "PV Power", "Total Solar Power"),
+    "battPower": ("Battery Power", "Total Battery Power"),
+    "gridOrMeterPower": ("Total Grid Power", "Grid Power", "Meter Power"),
+    "loadOrEpsPower": ("Total Load Power", "Load Power", "Total Consumption Power"),
+}
+WORKDATA_TIME_KEYS: Tuple[str, ...] = ("time", "collectTime", "updateTime", "date")
+
+# Plant energy aggregate series label -> statistic key
+ENERGY_LABEL_KEYS: Dict[str, str] = {
+    "pv": "pv",
+    "load": "load",
+    "import": "grid_import",
+    "export": "grid_export",
+    "charge": "battery_charge",
+    "discharge": "battery_discharge",
+}
+
+# Do not integrate across holes in the record stream larger than this
+MAX_SAMPLE_GAP = timedelta(minutes=30)
+
+Sample = Tuple[datetime, Dict[str, Any]]
+
+
+def field_display_name(field: str) -> str:
+    """Return the display part of a ``Name(unit)/id`` workdata field key."""
+    return field.split("(", 1)[0].split("/", 1)[0].strip()
+
+
+def resolve_power_fields(records: Iterable[Mapping[str, Any]]) -> Dict[str, str]:
+    """Map combined-data keys to the workdata field keys present in records."""
+    by_name: Dict[str, str] = {}
+    for record in records:
+        for field in record:
+            by_name.setdefault(field_display_name(field).lower(), field)
+        if by_name:
+            break
+    resolved: Dict[str, str] = {}
+    for key, names in WORKDATA_POWER_FIELDS.items():
+        for name in names:
+            field = by_name.get(name.lower())
+            if field:
+                resolved[key] = field
+                break
+    return resolved
+
+
+def record_time(record: Mapping[str, Any], tz: tzinfo) -> Optional[datetime]:
+    """Parse a workdata record timestamp (string or epoch) as aware datetime."""
+    for key in WORKDATA_TIME_KEYS:
+        value = record.get(key)
+        if value is None:
+            continue
+        if isinstance(value, (int, float)):
+            seconds = value / 1000 if value > 1e11 else value
+            return datetime.fromtimestamp(seconds, tz)
+        for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M:%S"):
+            try:
+                return datetime.strptime(str(value), fmt).replace(tzinfo=tz)
+            except ValueError:
+                continue
+    return None
+
+
+def records_to_samples(
+    records: Iterable[Mapping[str, Any]],
+    tz: tzinfo,
+    fields: Optional[Dict[str, str]] = None,
+) -> List[Sample]:
+    """Convert workdata records to time-sorted combined-data samples.
+
+    Battery power is signed in workdata (positive = discharging); it is mapped
+    onto the ``battPower``/``toBat``/``batTo`` shape the parser expects.
+    """
+    records = list(records)
+    if fields is None:
+        fields = resolve_power_fields(records)
+    samples: List[Sample] = []
+    for record in records:
+        when = record_time(record, tz)
+        if when is None:
+            continue
+        combined: Dict[str, Any] = {}
+        for key, field in fields.items():
+            if record.get(field) is not None:
+                combined[key] = to_float(record[field])
+        batt = combined.get("battPower")
+        if batt is not None:
+            combined["battPower"] = abs(batt)
+            combined["toBat"] = batt < 0
+            combined["batTo"] = batt > 0
+        samples.append((when, combined))
+    samples.sort(key=lambda item: item[0])
+    return samples
+
+
+def parse_samples(samples: Sequence[Sample], keys: Sequence[str]) -> Dict[str, List[float]]:
+    """Derive sensor power columns for samples (vectorized when possible)."""
+    rows = [combined for _, combined in samples]
+    if HAS_NUMPY:
+        from .solark_batch import rows_to_columns
+
+        columns = parse_plant_batch(rows_to_columns(rows))
+        # NaN marks an absent value; count it as no power
+        return {
+            key: [float(v) if v == v else 0.0 for v in columns[key]] for key in keys
+        }
+    parser = PlantDataParser()
+    parsed = [parser.parse(row) for row in rows]
+    return {key: [to_float(item.get(key)) for item in parsed] for key in keys}
+
+
+def _interval_energy(
+    samples: Sequence[Sample], series: Sequence[float]
+) -> Iterator[Tuple[datetime, float]]:
+    """Yield (interval midpoint, kWh) for consecutive samples (trapezoidal).
+
+    Intervals longer than MAX_SAMPLE_GAP are skipped.
+    """
+    for i in range(1, len(samples)):
+        start, end = samples[i - 1][0], samples[i][0]
+        if end <= start or end - start > MAX_SAMPLE_GAP:
+            continue
+        hours = (end - start).total_seconds() / 3600.0
+        avg_w = max((series[i - 1] + series[i]) / 2.0, 0.0)
+        yield start + (end - start) / 2, avg_w * hours / 1000.0
+
+
+def interval_energy(samples: Sequence[Sample], keys: Sequence[str]) -> Dict[str, float]:
+    """Total energy (kWh) per parsed power key across consecutive samples."""
+    if len(samples) < 2:
+        return {key: 0.0 for key in keys}
+    powers = parse_samples(samples, keys)
+    return {
+        key: sum(kwh for _, kwh in _interval_energy(samples, powers[key]))
+        for key in keys
+    }
+
+
+def hourly_energy(
+    samples: Sequence[Sample], power_keys: Mapping[str, str]
+) -> Dict[str, List[Tuple[datetime, float]]]:
+    """Integrate power samples (W) into per-hour energy (kWh).
+
+    ``power_keys`` maps output energy keys to parsed power sensor keys, e.g.
+    ``{"grid_import_energy": "grid_import_power"}``. Each interval is credited
+    to the hour containing its midpoint.
+    """
+    if len(samples) < 2:
+        return {key: [] for key in power_keys}
+    powers = parse_samples(samples, list(dict.fromkeys(power_keys.values())))
+    result: Dict[str, List[Tuple[datetime, float]]] = {}
+    for energy_key, power_key in power_keys.items():
+        buckets: Dict[datetime, float] = {}
+        for midpoint, kwh in _interval_energy(samples, powers[power_key]):
+            hour = midpoint.replace(minute=0, second=0, microsecond=0)
+            buckets[hour] = buckets.get(hour, 0.0) + kwh
+        result[energy_key] = sorted(buckets.items())
+    return result
+
+
+def energy_series(
+    data: Mapping[str, Any], period: str, start: date
+) -> Dict[str, Dict[date, float]]:
+    """Parse a plant energy month/year response into {key: {date: kWh}}.
+
+    Month data yields one value per day; year data one value per month (keyed
+    by the first of the month). Record times may be full dates or just the
+    day/month number within ``start``'s period.
+    """
+    result: Dict[str, Dict[date, float]] = {}
+    for info in data.get("infos") or []:
+        if not isinstance(info, Mapping):
+            continue
+        label = str(info.get("label") or "").strip().lower()
+        key = ENERGY_LABEL_KEYS.get(label, label.replace(" ", "_"))
+        if not key:
+            continue
+        values: Dict[date, float] = {}
+        for record in info.get("records") or []:
+            when = _period_date(str(record.get("time") or ""), period, start)
+            if when is not None:
+                values[when] = to_float(record.get("value"))
+        result[key] = values
+    return result
+
+
+def _period_date(value: str, period: str, start: date) -> Optional[date]:
+    value = value.strip()
+    try:
+        if period == "month":
+            if len(value) >= 10:
+                return datetime.strptime(value[:10], "%Y-%m-%d").date()
+            return start.replace(day=int(value))
+        if period == "year":
+            if len(value) >= 7:
+                return datetime.strptime(value[:7], "%Y-%m").date()
+            return start.replace(month=int(value), day=1)
+    except ValueError:
+        return None
+    return None
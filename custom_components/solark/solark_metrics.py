@@ -0,0 +1,158 @@
+"""Request latency and error metrics (HA independent).
+
+Every cloud call is timed and counted by normalized endpoint (serial numbers
+and plant IDs replaced by ``{id}``) and by group (auth, flow, workdata, ...).
+Latencies are kept in bounded rolling windows, so recording is O(1) and
+percentiles are only computed when read (diagnostics, sensors).
+"""
+from __future__ import annotations
+
+import re
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, Optional
+
+from .solark_errors import SolArkCloudAPIError
+
+# Samples kept per rolling latency window
+WINDOW_SIZE = 256
+PERCENTILES = (50, 95, 99)
+
+# Path segment that identifies a plant or device (digits, >= 5 characters)
+_ID_SEGMENT = re.compile(r"^(?=[0-9A-Za-z]*\d)[0-9A-Za-z]{5,}$")
+
+# (substring, group) checked in order against the normalized endpoint
+_GROUPS = (
+    ("/oauth/", "auth"),
+    ("/account/login", "auth"),
+    ("/flow", "flow"),
+    ("/workdata/", "workdata"),
+    ("/inverters", "inverters"),
+    ("/dy/store/", "live"),
+    ("/common/setting/", "settings"),
+    ("/plant/energy/", "energy"),
+    ("/gateways", "gateways"),
+)
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    index = int(round(pct / 100 * (len(ordered) - 1)))
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def normalize_endpoint(endpoint: str) -> str:
+    return "/".join(
+        "{id}" if _ID_SEGMENT.match(part) else part
+        for part in endpoint.split("?", 1)[0].split("/")
+    )
+
+
+def endpoint_group(endpoint: str) -> str:
+    for fragment, group in _GROUPS:
+        if fragment in endpoint:
+            return group
+    return "other"
+
+
+class RollingLatency:
+    """Call counts plus the last WINDOW_SIZE durations (seconds)."""
+
+    __slots__ = ("count", "errors", "_window")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors: Counter[str] = Counter()
+        self._window: Deque[float] = deque(maxlen=WINDOW_SIZE)
+
+    def add(self, seconds: float, error: Optional[str] = None) -> None:
+        self.count += 1
+        self._window.append(seconds)
+        if error is not None:
+            self.errors[error] += 1
+
+    @property
+    def last(self) -> Optional[float]:
+        return self._window[-1] if self._window else None
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self._window:
+            return None
+        return _percentile(sorted(self._window), pct)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Counts, error kinds and latency percentiles in milliseconds."""
+        data: Dict[str, Any] = {
+            "count": self.count,
+            "errors": sum(self.errors.values()),
+            "error_kinds": dict(self.errors),
+        }
+        if self._window:
+            ordered = sorted(self._window)
+            for pct in PERCENTILES:
+                data[f"p{pct}_ms"] = round(_percentile(ordered, pct) * 1000, 1)
+            data["last_ms"] = round(self._window[-1] * 1000, 1)
+        return data
+
+
+class SolArkMetrics:
+    """Latency and error metrics for one client."""
+
+    def __init__(self) -> None:
+        self.endpoints: Dict[str, RollingLatency] = {}
+        self.groups: Dict[str, RollingLatency] = {}
+        self.cycles = RollingLatency()
+        self.logins: Counter[str] = Counter()
+
+    def observe(
+        self, endpoint: str, seconds: float, error: Optional[str] = None
+    ) -> None:
+        key = normalize_endpoint(endpoint)
+        stats = self.endpoints.get(key)
+        if stats is None:
+            stats = self.endpoints[key] = RollingLatency()
+        stats.add(seconds, error)
+        group = endpoint_group(key)
+        stats = self.groups.get(group)
+        if stats is None:
+            stats = self.groups[group] = RollingLatency()
+        stats.add(seconds, error)
+
+    @contextmanager
+    def track(self, endpoint: str) -> Iterator[None]:
+        """Time the enclosed call; API errors are counted by kind.
+
+        Cancellation is not recorded: it says nothing about the endpoint.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except SolArkCloudAPIError as exc:
+            self.observe(endpoint, time.perf_counter() - start, exc.kind)
+            raise
+        except Exception:
+            self.observe(endpoint, time.perf_counter() - start, "unexpected")
+            raise
+        self.observe(endpoint, time.perf_counter() - start)
+
+    def record_login(self, method: str, ok: bool) -> None:
+        self.logins[f"{method}_{'ok' if ok else 'failed'}"] += 1
+
+    def record_cycle(self, seconds: float, error: Optional[str] = None) -> None:
+        self.cycles.add(seconds, error)
+
+    @property
+    def error_count(self) -> int:
+        return sum(sum(stats.errors.values()) for stats in self.groups.values())
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Full metrics for diagnostics."""
+        return {
+            "cycles": self.cycles.as_dict(),
+            "logins": dict(self.logins),
+            "groups": {name: stats.as_dict() for name, stats in self.groups.items()},
+            "endpoints": {
+                name: stats.as_dict() for name, stats in self.endpoints.items()
+            },
+        }
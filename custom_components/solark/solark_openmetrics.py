@@ -0,0 +1,237 @@
+"""OpenMetrics text rendering of plant snapshots and client health (HA independent).
+
+``render_openmetrics`` turns cached poll results into one exposition for any
+number of plants. It never talks to the cloud; callers render from whatever
+they polled last.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .solark_metrics import PERCENTILES
+from .solark_parser import to_float
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Parsed key -> (metric family, type, unit, help)
+PLANT_METRICS: Dict[str, Tuple[str, str, str, str]] = {
+    "energy_today": ("solark_energy_today_kwh", "gauge", "kwh", "PV energy today"),
+    "energy_total": ("solark_energy_kwh", "counter", "kwh", "PV energy lifetime"),
+    "battery_soc": ("solark_battery_soc_percent", "gauge", "percent", "Battery SOC"),
+    "pv_power": ("solark_pv_power_watts", "gauge", "watts", "PV power"),
+    "battery_power": (
+        "solark_battery_power_watts",
+        "gauge",
+        "watts",
+        "Battery power (negative charging)",
+    ),
+    "battery_charge_power": (
+        "solark_battery_charge_power_watts",
+        "gauge",
+        "watts",
+        "Battery charge power",
+    ),
+    "battery_discharge_power": (
+        "solark_battery_discharge_power_watts",
+        "gauge",
+        "watts",
+        "Battery discharge power",
+    ),
+    "grid_power": ("solark_grid_power_watts", "gauge", "watts", "Grid power"),
+    "load_power": ("solark_load_power_watts", "gauge", "watts", "Load power"),
+    "grid_import_power": (
+        "solark_grid_import_power_watts",
+        "gauge",
+        "watts",
+        "Grid import power",
+    ),
+    "grid_export_power": (
+        "solark_grid_export_power_watts",
+        "gauge",
+        "watts",
+        "Grid export power",
+    ),
+}
+# Parsed status keys exposed as info metrics with a ``state`` label
+STATUS_METRICS: Dict[str, str] = {
+    "grid_status": "Grid connection status",
+    "generator_status": "Generator status",
+    "ac_relay_status": "AC relay status",
+}
+# Inverter list key -> (metric family, type, unit, help)
+INVERTER_METRICS: Dict[str, Tuple[str, str, str, str]] = {
+    "etoday": (
+        "solark_inverter_energy_today_kwh",
+        "gauge",
+        "kwh",
+        "Inverter energy today",
+    ),
+    "etotal": (
+        "solark_inverter_energy_kwh",
+        "counter",
+        "kwh",
+        "Inverter energy lifetime",
+    ),
+    "pac": ("solark_inverter_power_watts", "gauge", "watts", "Inverter AC power"),
+    "status": ("solark_inverter_status", "gauge", "", "Inverter status code"),
+}
+
+
+@dataclass
+class PlantMetrics:
+    """Everything known about one plant at its last poll."""
+
+    plant_id: str
+    up: bool = False
+    last_poll: Optional[float] = None
+    parsed: Mapping[str, Any] = field(default_factory=dict)
+    raw: Mapping[str, Any] = field(default_factory=dict)
+    client: Mapping[str, Any] = field(default_factory=dict)
+    labels: Dict[str, str] = field(default_factory=dict)
+
+
+class _Family:
+    __slots__ = ("name", "kind", "unit", "help", "samples")
+
+    def __init__(self, name: str, kind: str, unit: str, help_text: str) -> None:
+        self.name = name
+        self.kind = kind
+        self.unit = unit
+        self.help = help_text
+        self.samples: List[str] = []
+
+    def add(self, labels: Mapping[str, Any], value: float, suffix: str = "") -> None:
+        if labels:
+            pairs = ",".join(
+                f'{key}="{_escape(str(val))}"' for key, val in labels.items()
+            )
+            self.samples.append(f"{self.name}{suffix}{{{pairs}}} {_number(value)}")
+        else:
+            self.samples.append(f"{self.name}{suffix} {_number(value)}")
+
+    def render(self) -> List[str]:
+        lines = [f"# TYPE {self.name} {self.kind}"]
+        if self.unit:
+            lines.append(f"# UNIT {self.name} {self.unit}")
+        lines.append(f"# HELP {self.name} {_escape(self.help)}")
+        lines.extend(self.samples)
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if value != value:
+        return "NaN"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def render_openmetrics(plants: Iterable[PlantMetrics]) -> str:
+    """OpenMetrics exposition for ``plants``, ending with ``# EOF``."""
+    families: Dict[str, _Family] = {}
+
+    def family(name: str, kind: str, unit: str, help_text: str) -> _Family:
+        found = families.get(name)
+        if found is None:
+            found = families[name] = _Family(name, kind, unit, help_text)
+        return found
+
+    for plant in plants:
+        base = {"plant": plant.plant_id, **plant.labels}
+        family("solark_up", "gauge", "", "Last poll succeeded").add(
+            base, 1 if plant.up else 0
+        )
+        if plant.last_poll is not None:
+            family(
+                "solark_last_poll_timestamp_seconds",
+                "gauge",
+                "seconds",
+                "Time of the last successful poll",
+            ).add(base, plant.last_poll)
+        _add_plant_values(family, base, plant.parsed)
+        _add_inverters(family, base, plant.raw.get("inverters") or [])
+        _add_client_health(family, base, plant.client)
+
+    lines: List[str] = []
+    for found in families.values():
+        lines.extend(found.render())
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def _add_plant_values(family: Any, base: Dict[str, Any], parsed: Mapping) -> None:
+    for key, (name, kind, unit, help_text) in PLANT_METRICS.items():
+        value = parsed.get(key)
+        if isinstance(value, (int, float)):
+            suffix = "_total" if kind == "counter" else ""
+            family(name, kind, unit, help_text).add(base, value, suffix)
+    for key, help_text in STATUS_METRICS.items():
+        value = parsed.get(key)
+        if value is not None:
+            family(f"solark_{key}", "info", "", help_text).add(
+                {**base, "state": value}, 1, "_info"
+            )
+
+
+def _add_inverters(family: Any, base: Dict[str, Any], inverters: Any) -> None:
+    for inverter in inverters:
+        if not isinstance(inverter, dict):
+            continue
+        sn = inverter.get("sn") or inverter.get("deviceSn")
+        if not sn:
+            continue
+        labels = {**base, "sn": sn}
+        for key, (name, kind, unit, help_text) in INVERTER_METRICS.items():
+            if inverter.get(key) is None:
+                continue
+            suffix = "_total" if kind == "counter" else ""
+            family(name, kind, unit, help_text).add(
+                labels, to_float(inverter[key]), suffix
+            )
+
+
+def _add_client_health(
+    family: Any, base: Dict[str, Any], client: Mapping[str, Any]
+) -> None:
+    """Request counts, errors and latency quantiles from SolArkMetrics.as_dict."""
+    for group, stats in (client.get("groups") or {}).items():
+        labels = {**base, "group": group}
+        family(
+            "solark_api_requests", "counter", "", "Cloud API requests"
+        ).add(labels, stats["count"], "_total")
+        for kind, count in stats.get("error_kinds", {}).items():
+            family(
+                "solark_api_errors", "counter", "", "Cloud API errors by kind"
+            ).add({**labels, "kind": kind}, count, "_total")
+        _add_latency(
+            family("solark_api_latency_seconds", "summary", "seconds", "API latency"),
+            labels,
+            stats,
+        )
+    cycles = client.get("cycles") or {}
+    if cycles.get("count"):
+        _add_latency(
+            family(
+                "solark_poll_cycle_seconds", "summary", "seconds", "Poll cycle time"
+            ),
+            base,
+            cycles,
+        )
+    for outcome, count in (client.get("logins") or {}).items():
+        method, _, result = outcome.rpartition("_")
+        family("solark_logins", "counter", "", "Login attempts").add(
+            {**base, "method": method, "result": result}, count, "_total"
+        )
+
+
+def _add_latency(target: _Family, labels: Dict[str, Any], stats: Mapping) -> None:
+    for pct in PERCENTILES:
+        value = stats.get(f"p{pct}_ms")
+        if value is not None:
+            target.add({**labels, "quantile": pct / 100}, value / 1000)
+    target.add(labels, stats["count"], "_count")
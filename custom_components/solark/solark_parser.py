@@ -0,0 +1,309 @@
+"""Table-driven parser mapping combined Sol-Ark API fields to sensor values.
+
+Each output group in ``PLANT_FIELDS`` declares the raw keys it reads and an
+ordered list of rules (the first rule producing a value wins, later rules are
+fallbacks). ``PlantDataParser`` compiles the table once into a straight-line
+function, so parsing costs no more than a hand-written mapping.
+
+The parser is stateless with respect to data gaps; last-known value retention
+lives in ``SolArkCloudAPI.parse_plant_data``.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Sentinel for "raw key absent" (inputs) and "rule produced nothing" (outputs)
+MISSING: Any = type("Missing", (), {"__repr__": lambda self: "MISSING"})()
+
+PV_STRING_COUNT = 12
+
+
+def to_float(value: Any) -> float:
+    """Coerce an API value to float (None/invalid -> 0.0)."""
+    try:
+        if value is None:
+            return 0.0
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _present_float(value: Any) -> float:
+    return to_float(None if value is MISSING else value)
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A single way of computing an output group from raw inputs.
+
+    ``fn`` receives the values of ``inputs`` (``MISSING`` when absent) as
+    positional arguments and returns a tuple with one value per group output,
+    or ``MISSING`` when the rule does not apply.
+    """
+
+    inputs: Tuple[str, ...]
+    fn: Callable[..., Any]
+
+
+@dataclass(frozen=True)
+class FieldGroup:
+    """Declarative description of one or more related sensor outputs.
+
+    Rules are tried in order; the first one producing a value wins and later
+    rules act as fallbacks. ``default`` is used when no rule applies (``None``
+    leaves the outputs absent).
+    """
+
+    outputs: Tuple[str, ...]
+    rules: Tuple[Rule, ...]
+    default: Optional[Tuple[Any, ...]] = None
+
+
+# ---------------------------------------------------------------------------
+# rules
+# ---------------------------------------------------------------------------
+
+
+def _positive_first_present(*values: Any) -> Any:
+    for value in values:
+        if value is not MISSING:
+            val = to_float(value)
+            return (val,) if val > 0 else MISSING
+    return MISSING
+
+
+def _direct_float(value: Any) -> Any:
+    if value is MISSING:
+        return MISSING
+    return (to_float(value),)
+
+
+def _ratio_percent(current: Any, capacity: Any) -> Any:
+    cap = _present_float(capacity)
+    if cap > 0:
+        return ((_present_float(current) / cap) * 100.0,)
+    return MISSING
+
+
+def _sum_of_products(*pairs: Any) -> Any:
+    total = 0.0
+    for i in range(0, len(pairs), 2):
+        volt = pairs[i]
+        current = pairs[i + 1]
+        if volt is MISSING and current is MISSING:
+            continue
+        total += _present_float(volt) * _present_float(current)
+    return (total,) if total != 0.0 else MISSING
+
+
+def _battery_split(power: float) -> Tuple[float, float, float]:
+    # (battery_power, battery_charge_power, battery_discharge_power)
+    if power > 0.0:
+        return (power, 0.0, power)
+    if power < 0.0:
+        return (power, abs(power), 0.0)
+    return (power, 0.0, 0.0)
+
+
+def _battery_from_flow(batt_power: Any, to_bat: Any, bat_to: Any) -> Any:
+    if batt_power is MISSING:
+        return MISSING
+    power = abs(to_float(batt_power))
+    to_bat = None if to_bat is MISSING else to_bat
+    bat_to = None if bat_to is MISSING else bat_to
+    if to_bat and not bat_to:
+        power = -power
+    return _battery_split(power)
+
+
+def _battery_from_bms(cur_volt: Any, charge_current: Any) -> Any:
+    volt = _present_float(cur_volt)
+    current = _present_float(charge_current)
+    if volt != 0.0 or current != 0.0:
+        return _battery_split(volt * current)
+    return MISSING
+
+
+def _grid_from_meters(meter_a: Any, meter_b: Any, meter_c: Any) -> Any:
+    net = _present_float(meter_a) + _present_float(meter_b) + _present_float(meter_c)
+    if net == 0.0:
+        return MISSING
+    if net > 0:
+        return (net, 0.0)
+    return (0.0, abs(net))
+
+
+def _grid_explicit(grid_import: Any, grid_export: Any) -> Any:
+    imp = 0.0 if grid_import is MISSING else to_float(grid_import)
+    exp = 0.0 if grid_export is MISSING else to_float(grid_export)
+    if imp == 0.0 and exp == 0.0:
+        return MISSING
+    return (imp, exp)
+
+
+def _grid_from_flow_direction(
+    exists_meter: Any, grid_flow: Any, grid_to: Any, to_grid: Any
+) -> Any:
+    # No CT meters: use gridOrMeterPower + direction flags from flow data.
+    if exists_meter not in (False, 0, "0", None, MISSING):
+        return MISSING
+    flow = _present_float(grid_flow)
+    if flow == 0.0:
+        return MISSING
+    if grid_to is True and to_grid is not True:
+        return (abs(flow), 0.0)
+    if to_grid is True and grid_to is not True:
+        return (0.0, abs(flow))
+    if flow > 0.0:
+        return (abs(flow), 0.0)
+    if flow < 0.0:
+        return (0.0, abs(flow))
+    return MISSING
+
+
+def _grid_status(grid_to: Any, to_grid: Any) -> Any:
+    grid_to = None if grid_to is MISSING else grid_to
+    to_grid = None if to_grid is MISSING else to_grid
+    if grid_to is False and to_grid is False:
+        return ("Inactive",)
+    if grid_to or to_grid:
+        return ("Active",)
+    return MISSING
+
+
+def _ac_relay_status(ac_relay: Any) -> Any:
+    if ac_relay is MISSING or ac_relay is None:
+        return MISSING
+    try:
+        return ("Connected" if int(ac_relay) == 1 else "Disconnected",)
+    except (TypeError, ValueError):
+        return MISSING
+
+
+def _generator_status(gen_on: Any) -> Any:
+    if gen_on is MISSING or gen_on is None:
+        return MISSING
+    return ("Running" if gen_on else "Off",)
+
+
+_PV_STRING_KEYS: Tuple[str, ...] = tuple(
+    key
+    for i in range(1, PV_STRING_COUNT + 1)
+    for key in (f"volt{i}", f"current{i}")
+)
+
+PLANT_FIELDS: Tuple[FieldGroup, ...] = (
+    FieldGroup(
+        outputs=("energy_today",),
+        rules=(Rule(("energyToday", "etoday"), _positive_first_present),),
+    ),
+    FieldGroup(
+        outputs=("energy_total",),
+        rules=(Rule(("energyTotal", "etotal"), _positive_first_present),),
+    ),
+    FieldGroup(
+        outputs=("battery_soc",),
+        rules=(
+            Rule(("soc",), _direct_float),
+            Rule(("curCap", "batteryCap"), _ratio_percent),
+        ),
+        default=(0.0,),
+    ),
+    FieldGroup(
+        outputs=("pv_power",),
+        rules=(
+            Rule(("pvPower",), _direct_float),
+            Rule(_PV_STRING_KEYS, _sum_of_products),
+        ),
+        default=(0.0,),
+    ),
+    FieldGroup(
+        outputs=("battery_power", "battery_charge_power", "battery_discharge_power"),
+        rules=(
+            Rule(("battPower", "toBat", "batTo"), _battery_from_flow),
+            Rule(("curVolt", "chargeCurrent"), _battery_from_bms),
+        ),
+        default=(0.0, 0.0, 0.0),
+    ),
+    FieldGroup(
+        outputs=("grid_power",),
+        rules=(Rule(("gridOrMeterPower",), _direct_float),),
+        default=(0.0,),
+    ),
+    FieldGroup(
+        outputs=("load_power",),
+        rules=(Rule(("loadOrEpsPower",), _direct_float),),
+        default=(0.0,),
+    ),
+    FieldGroup(
+        outputs=("grid_import_power", "grid_export_power"),
+        rules=(
+            Rule(("meterA", "meterB", "meterC"), _grid_from_meters),
+            Rule(("gridImportPower", "gridExportPower"), _grid_explicit),
+            Rule(
+                ("existsMeter", "gridOrMeterPower", "gridTo", "toGrid"),
+                _grid_from_flow_direction,
+            ),
+        ),
+        default=(0.0, 0.0),
+    ),
+    FieldGroup(
+        outputs=("grid_status",),
+        rules=(Rule(("gridTo", "toGrid"), _grid_status),),
+    ),
+    FieldGroup(
+        outputs=("ac_relay_status",),
+        rules=(Rule(("acRelayStatus",), _ac_relay_status),),
+    ),
+    FieldGroup(
+        outputs=("generator_status",),
+        rules=(Rule(("genOn",), _generator_status),),
+    ),
+)
+
+
+def _compile(fields: Tuple[FieldGroup, ...]) -> Callable[[Dict[str, Any]], Dict]:
+    """Generate one function evaluating every group of ``fields`` in order.
+
+    Each rule becomes a direct call with its ``data.get`` lookups inlined and
+    each fallback an ``else`` branch, which avoids per-rule loop and tuple
+    overhead of walking the table at parse time.
+    """
+    namespace: Dict[str, Any] = {"MISSING": MISSING}
+    lines = ["def parse(data):", "    get = data.get", "    out = {}"]
+    for g, group in enumerate(fields):
+        indent = "    "
+        for r, rule in enumerate(group.rules):
+            name = f"_rule_{g}_{r}"
+            namespace[name] = rule.fn
+            args = ", ".join(f"get({key!r}, MISSING)" for key in rule.inputs)
+            lines.append(f"{indent}result = {name}({args})")
+            lines.append(f"{indent}if result is not MISSING:")
+            lines.extend(
+                f"{indent}    out[{output!r}] = result[{i}]"
+                for i, output in enumerate(group.outputs)
+            )
+            lines.append(f"{indent}else:")
+            indent += "    "
+        if group.default is None:
+            lines.append(f"{indent}pass")
+        else:
+            lines.extend(
+                f"{indent}out[{output!r}] = {value!r}"
+                for output, value in zip(group.outputs, group.default)
+            )
+    lines.append("    return out")
+    exec("\n".join(lines), namespace)  # noqa: S102 - source built from the table
+    return namespace["parse"]
+
+
+class PlantDataParser:
+    """Parser for a field table, compiled once per instance."""
+
+    def __init__(self, fields: Tuple[FieldGroup, ...] = PLANT_FIELDS) -> None:
+        self._parse = _compile(fields)
+
+    def parse(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Sensor values for one combined payload."""
+        return self._parse(data)
@@ -0,0 +1,443 @@
+"""Record and replay cloud exchanges (HA independent).
+
+``RecordingSession`` wraps an ``aiohttp.ClientSession`` and appends every
+request/response pair to a gzip-compressed JSONL archive. Secrets
+(credentials, tokens, personal fields) are masked, and account
+identifiers (username, plant IDs, serial numbers) are replaced by stable
+pseudonyms, so an archive can be attached to a bug report.
+
+``ReplaySession`` serves an archive back to ``SolArkCloudAPI`` and
+``SolArkAuth`` in place of a real session, without network access or
+delay. Requests are matched on method, path and query; a request whose
+query differs (e.g. today's date) gets the next recorded response for the
+same path. Each path's responses are served in recorded order and wrap
+around, so an archive can be replayed any number of times.
+
+Archive layout: a header line (``format``, ``version``, ``created``,
+``plants``) followed by one line per exchange with ``t`` (seconds since the
+header), ``method``, ``path``, ``params``, ``json``, and either ``status``,
+``headers`` and ``body`` (the response text) or ``error`` (``timeout`` or
+``connection``).
+"""
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import json
+import re
+import secrets
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+ARCHIVE_FORMAT = "solark-recording"
+ARCHIVE_VERSION = 1
+REDACTED = "**REDACTED**"
+# Values masked wherever these keys appear (request bodies and responses)
+SECRET_KEYS = frozenset(
+    {
+        "password",
+        "username",
+        "access_token",
+        "refresh_token",
+        "token",
+        "email",
+        "phone",
+        "mobile",
+        "address",
+        "realName",
+        "nickName",
+        "lat",
+        "lon",
+        "latitude",
+        "longitude",
+    }
+)
+# Values of these keys are learned as identifiers and pseudonymized everywhere
+IDENTIFIER_KEYS = frozenset(
+    {"sn", "deviceSn", "invSn", "gsn", "gatewaySn", "plantId", "stationId"}
+)
+# Learned identifiers are also replaced under these keys (e.g. a plant's "id")
+REFERENCE_KEYS = IDENTIFIER_KEYS | {"id"}
+# Shorter values are too ambiguous to replace inside other text
+MIN_IDENTIFIER_LENGTH = 5
+# Response headers kept in the archive
+KEPT_HEADERS = ("Retry-After", "Content-Type")
+
+
+class Redactor:
+    """Mask secrets and pseudonymize identifiers consistently per archive."""
+
+    def __init__(self, identifiers: Iterable[Any] = ()) -> None:
+        self._salt = secrets.token_bytes(16)
+        self.pseudonyms: Dict[str, str] = {}
+        self._compiled: Optional[Tuple[int, Optional[re.Pattern[str]]]] = None
+        for identifier in identifiers:
+            self.learn(identifier)
+
+    def learn(self, identifier: Any) -> Optional[str]:
+        """Register ``identifier``; return its pseudonym."""
+        if identifier is None or isinstance(identifier, bool):
+            return None
+        value = str(identifier)
+        if len(value) < MIN_IDENTIFIER_LENGTH:
+            return None
+        if value not in self.pseudonyms:
+            digest = hashlib.sha256(self._salt + value.encode()).hexdigest()
+            if value.isdigit():
+                # Same length, digits only, no leading zero: stays a valid ID
+                digits = str(int(digest, 16))[: len(value)]
+                pseudonym = str(int(digits[0]) % 9 + 1) + digits[1:]
+            else:
+                pseudonym = f"anon-{digest[:10]}"
+            self.pseudonyms[value] = pseudonym
+        return self.pseudonyms[value]
+
+    def _scan(self, value: Any) -> Any:
+        """Mask secret keys and learn identifiers; return the masked copy."""
+        if isinstance(value, dict):
+            masked = {}
+            for key, item in value.items():
+                if key in SECRET_KEYS and item not in (None, ""):
+                    masked[key] = REDACTED if isinstance(item, str) else 0
+                    continue
+                if key in IDENTIFIER_KEYS and not isinstance(item, (dict, list)):
+                    self.learn(item)
+                masked[key] = self._scan(item)
+            return masked
+        if isinstance(value, list):
+            return [self._scan(item) for item in value]
+        return value
+
+    def _pattern(self) -> Optional[re.Pattern[str]]:
+        if self._compiled is None or self._compiled[0] != len(self.pseudonyms):
+            # Longest first, so an ID containing another is replaced whole
+            values = sorted(self.pseudonyms, key=len, reverse=True)
+            pattern = None
+            if values:
+                alternation = "|".join(re.escape(value) for value in values)
+                pattern = re.compile(rf"(?<![\w.])(?:{alternation})(?![\w.])")
+            self._compiled = (len(self.pseudonyms), pattern)
+        return self._compiled[1]
+
+    def _replace_text(self, text: str) -> str:
+        """Replace identifiers appearing as whole tokens in free text."""
+        pattern = self._pattern()
+        if pattern is None:
+            return text
+        return pattern.sub(lambda match: self.pseudonyms[match.group(0)], text)
+
+    def _pseudonymize(self, value: Any, key: Any = None) -> Any:
+        """Copy of ``value`` with known identifiers replaced.
+
+        Identifier keys are replaced on an exact match (keeping numbers
+        numbers), other strings token by token. Other numbers and numeric
+        strings are payload values and are never touched.
+        """
+        if isinstance(value, dict):
+            return {k: self._pseudonymize(item, k) for k, item in value.items()}
+        if isinstance(value, list):
+            return [self._pseudonymize(item, key) for item in value]
+        if isinstance(value, bool) or not isinstance(value, (str, int)):
+            return value
+        if key in REFERENCE_KEYS:
+            pseudonym = self.pseudonyms.get(str(value))
+            if pseudonym is not None:
+                return pseudonym if isinstance(value, str) else int(pseudonym)
+        if isinstance(value, str) and not _is_number(value):
+            return self._replace_text(value)
+        return value
+
+    def path(self, path: str) -> str:
+        """Request path with identifier segments replaced."""
+        return "/".join(
+            self.pseudonyms.get(segment, segment) for segment in path.split("/")
+        )
+
+    def record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Redacted copy of one archive record."""
+        record = dict(record)
+        # Mask and learn everywhere first, so identifiers first seen in the
+        # response are also replaced in the request
+        for key in ("params", "json"):
+            if record.get(key) is not None:
+                record[key] = self._scan(record[key])
+        body = record.get("body")
+        parsed: Any = None
+        if body:
+            try:
+                parsed = self._scan(json.loads(body))
+            except ValueError:
+                parsed = None
+        for key in ("params", "json"):
+            if record.get(key) is not None:
+                record[key] = self._pseudonymize(record[key])
+        if "path" in record:
+            record["path"] = self.path(record["path"])
+        if parsed is not None:
+            record["body"] = json.dumps(
+                self._pseudonymize(parsed), separators=(",", ":"), ensure_ascii=False
+            )
+        elif body:
+            record["body"] = self._replace_text(body)
+        return record
+
+
+def _is_number(text: str) -> bool:
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
+
+
+class BufferedResponse:
+    """A fully read response with the subset of the aiohttp API we use."""
+
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        body: str,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.status = status
+        self.headers = CIMultiDictProxy(CIMultiDict(headers or {}))
+        self._body = body
+        self.request_info = aiohttp.RequestInfo(
+            URL(url), method, CIMultiDictProxy(CIMultiDict()), URL(url)
+        )
+
+    async def text(self) -> str:
+        return self._body
+
+    async def json(self, loads: Any = json.loads, **_kwargs: Any) -> Any:
+        return loads(self._body)
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(
+                self.request_info,
+                (),
+                status=self.status,
+                message=f"HTTP {self.status}",
+                headers=self.headers,
+            )
+
+    async def __aenter__(self) -> "BufferedResponse":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+
+class _Exchange:
+    """Async context manager returned by the sessions' request methods."""
+
+    def __init__(self, send: Any) -> None:
+        self._send = send
+
+    async def __aenter__(self) -> BufferedResponse:
+        return await self._send()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+
+def _plain_params(params: Any) -> Optional[Dict[str, str]]:
+    if not params:
+        return None
+    return {str(key): str(value) for key, value in dict(params).items()}
+
+
+class RecordingSession:
+    """Session wrapper writing every exchange to a redacted archive.
+
+    Pass it wherever a client expects an ``aiohttp.ClientSession``; call
+    ``close`` (or use ``async with``) to finish the archive. The wrapped
+    session is not closed.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        path: str,
+        identifiers: Iterable[Any] = (),
+        plants: Iterable[Any] = (),
+        redact: bool = True,
+    ) -> None:
+        self._session = session
+        self._redactor: Optional[Redactor] = None
+        plants = [str(plant) for plant in plants]
+        if redact:
+            self._redactor = Redactor([*identifiers, *plants])
+            plants = [self._redactor.learn(plant) or plant for plant in plants]
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._started = time.monotonic()
+        self.exchanges = 0
+        self._write(
+            {
+                "format": ARCHIVE_FORMAT,
+                "version": ARCHIVE_VERSION,
+                "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "plants": plants,
+                "redacted": redact,
+            }
+        )
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._file.write(
+            json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n"
+        )
+        # Sync-flush so an interrupted run still leaves a readable archive
+        self._file.flush()
+
+    def request(self, method: str, url: str, **kwargs: Any) -> _Exchange:
+        return _Exchange(lambda: self._send(method, str(url), kwargs))
+
+    def get(self, url: str, **kwargs: Any) -> _Exchange:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> _Exchange:
+        return self.request("POST", url, **kwargs)
+
+    async def _send(
+        self, method: str, url: str, kwargs: Dict[str, Any]
+    ) -> BufferedResponse:
+        record: Dict[str, Any] = {
+            "t": round(time.monotonic() - self._started, 3),
+            "method": method.upper(),
+            "path": urlsplit(url).path,
+            "params": _plain_params(kwargs.get("params")),
+            "json": kwargs.get("json"),
+        }
+        started = time.perf_counter()
+        try:
+            async with self._session.request(method, url, **kwargs) as resp:
+                body = await resp.text()
+                headers = {
+                    name: resp.headers[name]
+                    for name in KEPT_HEADERS
+                    if name in resp.headers
+                }
+                status = resp.status
+        except asyncio.TimeoutError:
+            self._save({**record, "error": "timeout"})
+            raise
+        except aiohttp.ClientError:
+            self._save({**record, "error": "connection"})
+            raise
+        record.update(
+            status=status,
+            headers=headers,
+            body=body,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+        )
+        self._save(record)
+        return BufferedResponse(method.upper(), url, status, body, headers)
+
+    def _save(self, record: Dict[str, Any]) -> None:
+        if self._redactor is not None:
+            record = self._redactor.record(record)
+        self.exchanges += 1
+        self._write(record)
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    async def __aenter__(self) -> "RecordingSession":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def load_archive(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Header and exchange records of an archive."""
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        lines = [json.loads(line) for line in handle if line.strip()]
+    if not lines or lines[0].get("format") != ARCHIVE_FORMAT:
+        raise ValueError(f"{path} is not a {ARCHIVE_FORMAT} archive")
+    if lines[0].get("version", 0) > ARCHIVE_VERSION:
+        raise ValueError(f"{path} has unsupported version {lines[0]['version']}")
+    return lines[0], lines[1:]
+
+
+class ReplaySession:
+    """Session stand-in serving recorded responses (no network, no delay)."""
+
+    def __init__(self, records: List[Dict[str, Any]]) -> None:
+        self.by_query: Dict[Tuple, List[Dict[str, Any]]] = defaultdict(list)
+        self.by_path: Dict[Tuple[str, str], List[Dict[str, Any]]] = defaultdict(
+            list
+        )
+        for record in records:
+            self.by_query[self._query_key(record)].append(record)
+            self.by_path[(record["method"], record["path"])].append(record)
+        self._next: Dict[Tuple, int] = defaultdict(int)
+        self.served = 0
+        self.unmatched: Dict[str, int] = defaultdict(int)
+
+    @classmethod
+    def from_archive(cls, path: str) -> "ReplaySession":
+        return cls(load_archive(path)[1])
+
+    @staticmethod
+    def _query_key(record: Dict[str, Any]) -> Tuple:
+        params = record.get("params") or {}
+        return (record["method"], record["path"], tuple(sorted(params.items())))
+
+    def _take(self, key: Tuple, candidates: List[Dict[str, Any]]) -> Dict[str, Any]:
+        index = self._next[key]
+        self._next[key] = index + 1
+        return candidates[index % len(candidates)]
+
+    def request(self, method: str, url: str, **kwargs: Any) -> _Exchange:
+        return _Exchange(lambda: self._serve(method.upper(), str(url), kwargs))
+
+    def get(self, url: str, **kwargs: Any) -> _Exchange:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> _Exchange:
+        return self.request("POST", url, **kwargs)
+
+    async def _serve(
+        self, method: str, url: str, kwargs: Dict[str, Any]
+    ) -> BufferedResponse:
+        path = urlsplit(url).path
+        request = {
+            "method": method,
+            "path": path,
+            "params": _plain_params(kwargs.get("params")),
+        }
+        key = self._query_key(request)
+        if key in self.by_query:
+            record = self._take(key, self.by_query[key])
+        elif (method, path) in self.by_path:
+            record = self._take((method, path), self.by_path[(method, path)])
+        else:
+            self.unmatched[f"{method} {path}"] += 1
+            return BufferedResponse(
+                method, url, 404, f"No recorded response for {method} {path}"
+            )
+        self.served += 1
+        error = record.get("error")
+        if error == "timeout":
+            raise asyncio.TimeoutError()
+        if error:
+            raise aiohttp.ClientConnectionError(f"Recorded {error} error")
+        return BufferedResponse(
+            method, url, record["status"], record["body"], record.get("headers")
+        )
+
+    async def close(self) -> None:
+        return None
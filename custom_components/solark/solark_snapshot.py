@@ -0,0 +1,167 @@
+"""Compact, typed snapshot of parsed plant sensor values."""
+from __future__ import annotations
+
+import time
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional
+
+from .solark_parser import PLANT_FIELDS
+
+# Fixed sensor fields, in parser table order
+FIELDS: tuple[str, ...] = tuple(
+    name for group in PLANT_FIELDS for name in group.outputs
+)
+_FIELD_BITS: Dict[str, int] = {name: 1 << i for i, name in enumerate(FIELDS)}
+_GET_VALUES = attrgetter(*FIELDS)
+
+
+class PlantSnapshot:
+    """Parsed plant values for one poll.
+
+    Fixed fields live in ``__slots__`` (``None`` when absent). ``sampled_at``
+    is the UNIX time the sample was taken and ``stale_mask`` flags fields that
+    were not refreshed by this sample (retained from an earlier one). Values
+    outside the fixed set go into ``extra``.
+    """
+
+    __slots__ = FIELDS + ("sampled_at", "stale_mask", "extra")
+
+    energy_today: Optional[float]
+    energy_total: Optional[float]
+    battery_soc: Optional[float]
+    pv_power: Optional[float]
+    battery_power: Optional[float]
+    battery_charge_power: Optional[float]
+    battery_discharge_power: Optional[float]
+    grid_power: Optional[float]
+    load_power: Optional[float]
+    grid_import_power: Optional[float]
+    grid_export_power: Optional[float]
+    grid_status: Optional[str]
+    ac_relay_status: Optional[str]
+    generator_status: Optional[str]
+    sampled_at: float
+    stale_mask: int
+    extra: Optional[Dict[str, Any]]
+
+    def __init__(
+        self,
+        values: Optional[Dict[str, Any]] = None,
+        sampled_at: Optional[float] = None,
+        stale: Iterable[str] = (),
+    ) -> None:
+        values = values or {}
+        for name in FIELDS:
+            setattr(self, name, values.get(name))
+        extra = {key: value for key, value in values.items() if key not in _FIELD_BITS}
+        self.extra = extra or None
+        self.sampled_at = time.time() if sampled_at is None else sampled_at
+        mask = 0
+        for name in stale:
+            mask |= _FIELD_BITS.get(name, 0)
+        self.stale_mask = mask
+
+    # ------------------------------------------------------------------
+    # access
+    # ------------------------------------------------------------------
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a field (or extra) value, mirroring ``dict.get``."""
+        if key in _FIELD_BITS:
+            value = getattr(self, key)
+            return default if value is None else value
+        if self.extra:
+            return self.extra.get(key, default)
+        return default
+
+    def is_stale(self, key: str) -> bool:
+        return bool(self.stale_mask & _FIELD_BITS.get(key, 0))
+
+    @property
+    def age(self) -> float:
+        """Seconds since the sample was taken."""
+        return max(time.time() - self.sampled_at, 0.0)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return present values as a plain dict (parse_plant_data shape)."""
+        data = {
+            name: value
+            for name, value in zip(FIELDS, _GET_VALUES(self))
+            if value is not None
+        }
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    # ------------------------------------------------------------------
+    # change detection
+    # ------------------------------------------------------------------
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PlantSnapshot):
+            return NotImplemented
+        # Staleness counts: a fresh sample equal to a retained one must still
+        # notify listeners so entities drop their stale flag
+        return (
+            self.stale_mask == other.stale_mask
+            and _GET_VALUES(self) == _GET_VALUES(other)
+            and self.extra == other.extra
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def diff(self, other: Optional[PlantSnapshot]) -> set[str]:
+        """Return the names of values (or staleness flags) differing from ``other``."""
+        if other is None:
+            return set(self.as_dict())
+        stale_changed = self.stale_mask ^ other.stale_mask
+        changed = {
+            name
+            for name, mine, theirs in zip(FIELDS, _GET_VALUES(self), _GET_VALUES(other))
+            if mine != theirs or stale_changed & _FIELD_BITS[name]
+        }
+        mine_extra = self.extra or {}
+        theirs_extra = other.extra or {}
+        for key in mine_extra.keys() | theirs_extra.keys():
+            if mine_extra.get(key) != theirs_extra.get(key):
+                changed.add(key)
+        return changed
+
+    def __repr__(self) -> str:
+        return f"PlantSnapshot(sampled_at={self.sampled_at}, values={self.as_dict()})"
+
+    # ------------------------------------------------------------------
+    # serialization
+    # ------------------------------------------------------------------
+
+    def to_compact(self) -> List[Any]:
+        """Serialize to ``[sampled_at, stale_mask, [values...], extra]``."""
+        return [self.sampled_at, self.stale_mask, list(_GET_VALUES(self)), self.extra]
+
+    @classmethod
+    def from_compact(cls, compact: List[Any]) -> PlantSnapshot:
+        sampled_at, stale_mask, values, extra = compact
+        snapshot = cls.__new__(cls)
+        for name, value in zip(FIELDS, values):
+            setattr(snapshot, name, value)
+        # Tolerate payloads written before fields were added
+        for name in FIELDS[len(values):]:
+            setattr(snapshot, name, None)
+        snapshot.sampled_at = float(sampled_at)
+        snapshot.stale_mask = int(stale_mask)
+        snapshot.extra = dict(extra) if extra else None
+        return snapshot
+
+    @classmethod
+    def restore(
+        cls, stored: Any, sampled_at: Optional[float] = None
+    ) -> Optional[PlantSnapshot]:
+        """Rebuild a snapshot from compact or plain-dict storage."""
+        try:
+            if isinstance(stored, list):
+                return cls.from_compact(stored)
+            if isinstance(stored, dict):
+                return cls(stored, sampled_at=sampled_at)
+        except (TypeError, ValueError):
+            pass
+        return None
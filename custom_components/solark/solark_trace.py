@@ -0,0 +1,151 @@
+"""Lightweight span tracing for poll cycles (HA independent).
+
+``SolArkTracer.trace`` opens a root span; ``span`` opens a child of whatever
+span is current (a context variable, so tasks started inside inherit it).
+Outside a trace ``span`` does nothing, so instrumented code costs little
+when nobody is tracing. Finished traces are kept in a bounded ring buffer.
+
+When OpenTelemetry is installed, a tracer created with
+``opentelemetry=True`` also mirrors every span to it; exporting is then up
+to the configured OpenTelemetry SDK.
+"""
+from __future__ import annotations
+
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+try:
+    from opentelemetry import trace as otel_trace
+
+    HAS_OPENTELEMETRY = True
+except ImportError:  # pragma: no cover - optional dependency
+    otel_trace = None  # type: ignore[assignment]
+    HAS_OPENTELEMETRY = False
+
+# Finished cycle traces kept per tracer
+TRACE_BUFFER_SIZE = 20
+
+_CURRENT: ContextVar[Optional["Span"]] = ContextVar("solark_span", default=None)
+
+
+class Span:
+    """One timed step; children are nested steps."""
+
+    __slots__ = ("name", "attrs", "start", "end", "status", "children", "otel")
+
+    def __init__(
+        self, name: str, attrs: Dict[str, Any], otel: Any = None
+    ) -> None:
+        self.name = name
+        self.attrs = attrs
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.status = "ok"
+        self.children: List[Span] = []
+        self.otel = otel
+
+    def as_dict(self, origin: Optional[float] = None) -> Dict[str, Any]:
+        """Offsets and durations in milliseconds relative to ``origin``."""
+        origin = self.start if origin is None else origin
+        end = self.end if self.end is not None else time.perf_counter()
+        data: Dict[str, Any] = {
+            "name": self.name,
+            "start_ms": round((self.start - origin) * 1000, 2),
+            "duration_ms": round((end - self.start) * 1000, 2),
+            "status": self.status,
+        }
+        if self.attrs:
+            data["attrs"] = dict(self.attrs)
+        if self.children:
+            data["children"] = [child.as_dict(origin) for child in self.children]
+        return data
+
+
+@contextmanager
+def _activate(current: Span) -> Iterator[Span]:
+    token = _CURRENT.set(current)
+    otel_span = (
+        current.otel.start_as_current_span(current.name, attributes=current.attrs)
+        if current.otel is not None
+        else nullcontext()
+    )
+    try:
+        with otel_span:
+            yield current
+    except BaseException as exc:
+        current.status = getattr(exc, "kind", type(exc).__name__)
+        raise
+    finally:
+        current.end = time.perf_counter()
+        _CURRENT.reset(token)
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Optional[Span]]:
+    """Time a step as a child of the current span (no-op outside a trace)."""
+    parent = _CURRENT.get()
+    if parent is None:
+        yield None
+        return
+    child = Span(name, attrs, parent.otel)
+    parent.children.append(child)
+    with _activate(child):
+        yield child
+
+
+class SolArkTracer:
+    """Start cycle traces and keep the last ``max_traces`` of them."""
+
+    def __init__(
+        self, max_traces: int = TRACE_BUFFER_SIZE, opentelemetry: bool = False
+    ) -> None:
+        self.traces: Deque[Span] = deque(maxlen=max_traces)
+        self._otel = (
+            otel_trace.get_tracer(__name__)
+            if opentelemetry and HAS_OPENTELEMETRY
+            else None
+        )
+
+    @contextmanager
+    def trace(self, name: str, **attrs: Any) -> Iterator[Span]:
+        """Root span of a new trace, or a child span if one is already open."""
+        if _CURRENT.get() is not None:
+            with span(name, **attrs) as child:
+                yield child
+            return
+        root = Span(name, attrs, self._otel)
+        try:
+            with _activate(root):
+                yield root
+        finally:
+            self.traces.append(root)
+
+    def as_list(self) -> List[Dict[str, Any]]:
+        """Buffered traces, oldest first, for diagnostics."""
+        return [root.as_dict() for root in self.traces]
+
+
+def format_waterfall(trace: Dict[str, Any], width: int = 40) -> str:
+    """Render a trace dict (``Span.as_dict``) as a text waterfall."""
+    total = max(trace.get("duration_ms") or 0.0, 1e-9)
+    lines = [f"{'span':<36} {'start':>9} {'duration':>9}  timeline"]
+
+    def _walk(node: Dict[str, Any], depth: int) -> None:
+        start, duration = node["start_ms"], node["duration_ms"]
+        offset = min(int(start / total * width), width - 1)
+        length = max(1, min(int(round(duration / total * width)), width - offset))
+        label = "  " * depth + node["name"]
+        if node.get("status", "ok") != "ok":
+            label += f" [{node['status']}]"
+        lines.append(
+            f"{label[:36]:<36} {start:>7.1f}ms {duration:>7.1f}ms  "
+            f"{' ' * offset}{'█' * length}"
+        )
+        for child in node.get("children", ()):
+            _walk(child, depth + 1)
+
+    _walk(trace, 0)
+    return "\n".join(lines)
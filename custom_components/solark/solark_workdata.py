@@ -0,0 +1,58 @@
+"""Workdata field catalog helpers (HA independent).
+
+Workdata field keys look like ``Name(unit)/id`` (e.g. ``AcRelayStatus(NA)/194``
+or ``DC Temperature(℃)/57``). A catalog maps each key available for an
+inverter model to its display name and unit.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+
+from .solark_history import WORKDATA_TIME_KEYS
+
+_FIELD_RE = re.compile(
+    r"^(?P<name>[^(/]*?)\s*(?:\((?P<unit>[^)]*)\))?\s*(?:/(?P<id>[^/]+))?$"
+)
+# Units reported for unitless values
+_NO_UNIT = {"", "NA", "N/A", "-"}
+
+
+@dataclass(frozen=True)
+class WorkdataField:
+    """One parsed workdata field key."""
+
+    key: str
+    name: str
+    unit: Optional[str]
+    field_id: Optional[str]
+
+
+def parse_field(key: str) -> WorkdataField:
+    match = _FIELD_RE.match(key.strip())
+    if not match:
+        return WorkdataField(key, key, None, None)
+    unit = match.group("unit")
+    return WorkdataField(
+        key=key,
+        name=match.group("name").strip() or key,
+        unit=None if unit is None or unit.strip() in _NO_UNIT else unit.strip(),
+        field_id=match.group("id"),
+    )
+
+
+def build_catalog(record: Mapping[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Build ``{key: {"name", "unit"}}`` from a full-field workdata record."""
+    catalog: Dict[str, Dict[str, Any]] = {}
+    for key in record:
+        if key in WORKDATA_TIME_KEYS or not isinstance(key, str):
+            continue
+        field = parse_field(key)
+        catalog[key] = {"name": field.name, "unit": field.unit}
+    return catalog
+
+
+def field_slug(key: str) -> str:
+    """Stable, entity-id friendly slug for a field key."""
+    return re.sub(r"[^a-z0-9]+", "_", key.lower()).strip("_")
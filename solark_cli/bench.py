@@ -0,0 +1,745 @@
+"""Micro-benchmarks for the SolArk client (developer tooling)."""
+from __future__ import annotations
+
+import asyncio
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import timeit
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from custom_components.solark.solark_parser import PlantDataParser, to_float
+
+_safe_float = to_float
+
+
+def reference_parse_plant_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Original hand-written mapping (without last-known retention).
+
+    Kept verbatim as the equivalence oracle for the table-driven parser.
+    """
+    sensors: Dict[str, Any] = {}
+
+    # ----- Energy today / total -----
+    if "energyToday" in data or "etoday" in data:
+        val = _safe_float(data.get("energyToday", data.get("etoday")))
+        if val > 0:
+            sensors["energy_today"] = val
+    if "energyTotal" in data or "etotal" in data:
+        val = _safe_float(data.get("energyTotal", data.get("etotal")))
+        if val > 0:
+            sensors["energy_total"] = val
+
+    # ----- Battery SOC -----
+    if "soc" in data:
+        sensors["battery_soc"] = _safe_float(data.get("soc"))
+
+    if "battery_soc" not in sensors:
+        cur_cap = _safe_float(data.get("curCap"))
+        batt_cap = _safe_float(data.get("batteryCap"))
+        if batt_cap > 0:
+            sensors["battery_soc"] = (cur_cap / batt_cap) * 100.0
+
+    # ----- PV power -----
+    if "pvPower" in data:
+        sensors["pv_power"] = _safe_float(data.get("pvPower"))
+
+    pv_sum = 0.0
+    for i in range(1, 13):
+        v_raw = data.get(f"volt{i}")
+        c_raw = data.get(f"current{i}")
+        if v_raw is None and c_raw is None:
+            continue
+        v = _safe_float(v_raw)
+        c = _safe_float(c_raw)
+        pv_sum += v * c
+
+    if "pv_power" not in sensors and pv_sum != 0.0:
+        sensors["pv_power"] = pv_sum
+
+    # ----- Battery power -----
+    if "battPower" in data:
+        batt_power = abs(_safe_float(data.get("battPower")))
+        to_bat = data.get("toBat")
+        bat_to = data.get("batTo")
+        if to_bat and not bat_to:
+            sensors["battery_power"] = -batt_power
+        elif bat_to and not to_bat:
+            sensors["battery_power"] = batt_power
+        else:
+            sensors["battery_power"] = batt_power
+
+    if "battery_power" not in sensors:
+        cur_volt = _safe_float(data.get("curVolt"))
+        charge_current = _safe_float(data.get("chargeCurrent"))
+        if cur_volt != 0.0 or charge_current != 0.0:
+            sensors["battery_power"] = cur_volt * charge_current
+
+    # ----- Battery charge/discharge split -----
+    battery_power = _safe_float(sensors.get("battery_power"))
+    if battery_power > 0.0:
+        sensors["battery_discharge_power"] = battery_power
+        sensors["battery_charge_power"] = 0.0
+    elif battery_power < 0.0:
+        sensors["battery_discharge_power"] = 0.0
+        sensors["battery_charge_power"] = abs(battery_power)
+    else:
+        sensors["battery_discharge_power"] = 0.0
+        sensors["battery_charge_power"] = 0.0
+
+    # ----- Grid / Meter power (flow) -----
+    if "gridOrMeterPower" in data:
+        sensors["grid_power"] = _safe_float(data.get("gridOrMeterPower"))
+
+    # ----- Load / EPS power (flow) -----
+    if "loadOrEpsPower" in data:
+        sensors["load_power"] = _safe_float(data.get("loadOrEpsPower"))
+
+    # ----- Grid import/export from meterA/B/C -----
+    meter_a = _safe_float(data.get("meterA"))
+    meter_b = _safe_float(data.get("meterB"))
+    meter_c = _safe_float(data.get("meterC"))
+    grid_net = meter_a + meter_b + meter_c
+
+    if grid_net != 0.0:
+        if grid_net > 0:
+            sensors["grid_import_power"] = grid_net
+            sensors["grid_export_power"] = 0.0
+        else:
+            sensors["grid_import_power"] = 0.0
+            sensors["grid_export_power"] = abs(grid_net)
+    else:
+        if "gridImportPower" in data:
+            sensors["grid_import_power"] = _safe_float(
+                data.get("gridImportPower")
+            )
+        if "gridExportPower" in data:
+            sensors["grid_export_power"] = _safe_float(
+                data.get("gridExportPower")
+            )
+
+        # No CT meters: use gridOrMeterPower + direction flags from flow data.
+        if (
+            sensors.get("grid_import_power", 0.0) == 0.0
+            and sensors.get("grid_export_power", 0.0) == 0.0
+        ):
+            exists_meter = data.get("existsMeter")
+            no_meter = exists_meter in (False, 0, "0", None)
+            if no_meter:
+                grid_flow = _safe_float(data.get("gridOrMeterPower"))
+                if grid_flow != 0.0:
+                    grid_to = data.get("gridTo")
+                    to_grid = data.get("toGrid")
+                    if grid_to is True and to_grid is not True:
+                        sensors["grid_import_power"] = abs(grid_flow)
+                        sensors["grid_export_power"] = 0.0
+                    elif to_grid is True and grid_to is not True:
+                        sensors["grid_import_power"] = 0.0
+                        sensors["grid_export_power"] = abs(grid_flow)
+                    else:
+                        if grid_flow > 0.0:
+                            sensors["grid_import_power"] = abs(grid_flow)
+                            sensors["grid_export_power"] = 0.0
+                        elif grid_flow < 0.0:
+                            sensors["grid_import_power"] = 0.0
+                            sensors["grid_export_power"] = abs(grid_flow)
+
+    # ----- Grid Status -----
+    grid_to = data.get("gridTo")
+    to_grid = data.get("toGrid")
+    if grid_to is False and to_grid is False:
+        sensors["grid_status"] = "Inactive"
+    elif grid_to or to_grid:
+        sensors["grid_status"] = "Active"
+
+    # ----- AC Relay Status (reliable grid connection from workdata) -----
+    ac_relay = data.get("acRelayStatus")
+    if ac_relay is not None:
+        try:
+            ac_relay_int = int(ac_relay)
+            sensors["ac_relay_status"] = (
+                "Connected" if ac_relay_int == 1 else "Disconnected"
+            )
+        except (TypeError, ValueError):
+            pass
+
+    # ----- Generator Status -----
+    gen_on = data.get("genOn")
+    if gen_on is not None:
+        sensors["generator_status"] = "Running" if gen_on else "Off"
+
+    sensors.setdefault("pv_power", 0.0)
+    sensors.setdefault("battery_power", 0.0)
+    sensors.setdefault("grid_power", 0.0)
+    sensors.setdefault("load_power", 0.0)
+    sensors.setdefault("grid_import_power", 0.0)
+    sensors.setdefault("grid_export_power", 0.0)
+    sensors.setdefault("battery_soc", 0.0)
+    sensors.setdefault("battery_charge_power", 0.0)
+    sensors.setdefault("battery_discharge_power", 0.0)
+    return sensors
+
+
+def _sample_payloads() -> List[Dict[str, Any]]:
+    """Representative combined payloads covering every parser branch."""
+    samples: List[Dict[str, Any]] = [
+        {},
+        {
+            "pvPower": 5230,
+            "battPower": 1200,
+            "toBat": True,
+            "batTo": False,
+            "gridOrMeterPower": 350,
+            "loadOrEpsPower": 4380,
+            "soc": 76,
+            "gridTo": True,
+            "toGrid": False,
+            "existsMeter": False,
+            "genOn": False,
+            "acRelayStatus": 1,
+            "energyToday": 21.4,
+            "energyTotal": 18342.7,
+        },
+        {
+            "pvPower": "4100",
+            "battPower": "-800",
+            "toBat": False,
+            "batTo": True,
+            "gridOrMeterPower": -900,
+            "loadOrEpsPower": 2400,
+            "soc": None,
+            "gridTo": False,
+            "toGrid": True,
+            "existsMeter": True,
+            "meterA": -300,
+            "meterB": -350,
+            "meterC": -250,
+            "genOn": True,
+            "acRelayStatus": "0",
+        },
+        {
+            "gridOrMeterPower": 120,
+            "gridTo": False,
+            "toGrid": False,
+            "existsMeter": 0,
+            "acRelayStatus": "bad",
+            "etoday": 0,
+            "etotal": "oops",
+        },
+        {
+            "gridOrMeterPower": -640,
+            "existsMeter": "0",
+            "gridImportPower": 0,
+            "gridExportPower": 0,
+            "curVolt": 52.1,
+            "chargeCurrent": -14.5,
+            "curCap": 140,
+            "batteryCap": 280,
+        },
+        {"gridImportPower": 75.5, "battPower": 0, "toBat": True},
+        {"gridExportPower": "12", "gridTo": 1, "toGrid": 0, "gridOrMeterPower": 40},
+    ]
+    strings: Dict[str, Any] = {}
+    for i in range(1, 13):
+        strings[f"volt{i}"] = 300 + i
+        strings[f"current{i}"] = 0.5 * i if i % 3 else None
+    samples.append(strings)
+    return samples
+
+
+def _randomized_payloads(count: int, seed: int = 1) -> List[Dict[str, Any]]:
+    """Random mixes of sample keys/values to widen equivalence coverage."""
+    rng = random.Random(seed)
+    base = _sample_payloads()
+    pool: Dict[str, List[Any]] = {}
+    for sample in base:
+        for key, value in sample.items():
+            pool.setdefault(key, []).append(value)
+    extra = [None, 0, 1, -1, True, False, "0", "1", 3.5, -7.25, "x"]
+    keys = sorted(pool)
+    payloads = []
+    for _ in range(count):
+        payload = {}
+        for key in rng.sample(keys, rng.randint(0, len(keys))):
+            payload[key] = rng.choice(pool[key] + extra)
+        payloads.append(payload)
+    return payloads
+
+
+def check_parser_equivalence(count: int = 5000) -> int:
+    """Compare the table parser with the reference; return mismatches."""
+    parser = PlantDataParser()
+    mismatches = 0
+    for payload in _sample_payloads() + _randomized_payloads(count):
+        expected = reference_parse_plant_data(payload)
+        actual = parser.parse(payload)
+        if json.dumps(actual, sort_keys=True) != json.dumps(
+            expected, sort_keys=True
+        ):
+            mismatches += 1
+    return mismatches
+
+
+def _per_call_us(func: Callable[[], Any], number: int) -> float:
+    best = min(timeit.repeat(func, number=number, repeat=5))
+    return best / number * 1_000_000
+
+
+def bench_parser(number: int = 20000) -> Dict[str, Any]:
+    """Time reference vs table parser per call (microseconds)."""
+    live = _sample_payloads()[1]
+    parser = PlantDataParser()
+    return {
+        "reference_us": _per_call_us(
+            lambda: reference_parse_plant_data(live), number
+        ),
+        "table_us": _per_call_us(lambda: parser.parse(live), number),
+        "equivalence_mismatches": check_parser_equivalence(),
+    }
+
+
+def run_parser_benchmark() -> int:
+    """Entry point for ``solark_cli --bench-parser``."""
+    from custom_components.solark.solark_batch import HAS_NUMPY
+
+    results = bench_parser()
+    if HAS_NUMPY:
+        results.update(bench_batch())
+    print(json.dumps(results, indent=2, sort_keys=True))
+    mismatches = results["equivalence_mismatches"] + results.get(
+        "batch_equivalence_mismatches", 0
+    )
+    return 1 if mismatches else 0
+
+
+def check_batch_equivalence(count: int = 2000) -> int:
+    """Compare the vectorized batch parser with the per-sample parser."""
+    from custom_components.solark.solark_batch import (
+        parse_plant_batch,
+        rows_to_columns,
+    )
+
+    # The batch parser treats None as absent, so drop None-valued keys.
+    payloads = [
+        {key: value for key, value in payload.items() if value is not None}
+        for payload in _sample_payloads() + _randomized_payloads(count, seed=2)
+    ]
+    columns = rows_to_columns(payloads)
+    batch = parse_plant_batch(columns)
+    mismatches = 0
+    for row, payload in enumerate(payloads):
+        expected = PlantDataParser().parse(payload)
+        for key, values in batch.items():
+            value = values[row]
+            if value is None or (isinstance(value, float) and value != value):
+                value = None
+            if value != expected.get(key):
+                mismatches += 1
+    return mismatches
+
+
+def bench_batch(samples: int = 365 * 288) -> Dict[str, Any]:
+    """Time batch parsing of a year of 5-minute samples (milliseconds)."""
+    from custom_components.solark.solark_batch import (
+        parse_plant_batch,
+        rows_to_columns,
+    )
+
+    rng = random.Random(3)
+    live = _sample_payloads()[1]
+    rows = [
+        dict(
+            live,
+            pvPower=rng.uniform(0, 9000),
+            battPower=rng.uniform(-5000, 5000),
+            toBat=rng.random() < 0.5,
+            gridOrMeterPower=rng.uniform(-3000, 3000),
+        )
+        for _ in range(samples)
+    ]
+    columns = rows_to_columns(rows)
+    elapsed = min(
+        timeit.repeat(lambda: parse_plant_batch(columns), number=1, repeat=3)
+    )
+    return {
+        "batch_samples": samples,
+        "batch_ms": elapsed * 1000,
+        "batch_equivalence_mismatches": check_batch_equivalence(),
+    }
+
+
+# ----------------------------------------------------------------------
+# End-to-end suite (``solark_cli --bench``)
+# ----------------------------------------------------------------------
+
+# Regression thresholds: metric -> (bound, "max" or "min"). Latency is
+# expressed in injected round trips so the bounds hold on any machine.
+BENCH_THRESHOLDS: Dict[str, Tuple[float, str]] = {
+    "parse_plant_data_us": (250.0, "max"),
+    "build_api_updates_us": (100.0, "max"),
+    "get_plant_data_p95_round_trips": (8.0, "max"),
+    "set_common_settings_requests": (2.0, "max"),
+    "set_common_settings_round_trips": (3.0, "max"),
+    "shared_logins_per_100_polls": (1.0, "max"),
+    "memory_per_client_kb": (256.0, "max"),
+    "throughput_100_plants_per_s": (25.0, "min"),
+    # Longest single stretch holding the loop (integration callbacks)
+    "max_callback_blocking_ms": (50.0, "max"),
+}
+# With a baseline file, a metric also fails when it is this much worse
+BASELINE_TOLERANCE = 0.25
+BENCH_PLANT_COUNTS = (1, 10, 100, 1000)
+
+_CONFIGURE_SERVICE_DATA = {
+    "work_mode": "limited_to_home",
+    "energy_mode": "load_first",
+    "solar_sell": True,
+    "time_of_use": True,
+    "max_solar_power": 9000,
+    **{f"slot{slot}_time": f"{(slot - 1) * 4:02d}:00" for slot in range(1, 7)},
+    **{f"slot{slot}_power": 5000 for slot in range(1, 7)},
+    **{f"slot{slot}_soc": 20 + slot for slot in range(1, 7)},
+    **{f"slot{slot}_mode": "charge" for slot in range(1, 7)},
+}
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def _client(url: str, plant_id: str, session: Any, auth: Any = None) -> Any:
+    from custom_components.solark.solark_client import SolArkCloudAPI
+
+    return SolArkCloudAPI(
+        username="bench",
+        password="bench",
+        plant_id=plant_id,
+        base_url=url,
+        api_url=url,
+        session=session,
+        auth=auth,
+        legacy_url=url,
+    )
+
+
+async def _bench_poll_path(latency: float, polls: int) -> Dict[str, Any]:
+    """get_plant_data latency, settings writes and login amortization."""
+    import aiohttp
+
+    from custom_components.solark.solark_auth import SolArkAuth
+
+    from .simulator import SimulatorConfig, start_simulator
+
+    simulator, runner, url = await start_simulator(
+        SimulatorConfig(plants=10, inverters=2, latency=latency)
+    )
+    results: Dict[str, Any] = {"injected_latency_ms": latency * 1000}
+    try:
+        async with aiohttp.ClientSession() as session:
+            client = _client(url, "100001", session)
+
+            started = time.perf_counter()
+            await client.login()
+            results["login_ms"] = (time.perf_counter() - started) * 1000
+
+            started = time.perf_counter()
+            combined = await client.get_plant_data()
+            results["cold_poll_ms"] = (time.perf_counter() - started) * 1000
+
+            samples = []
+            for _ in range(polls):
+                started = time.perf_counter()
+                combined = await client.get_plant_data()
+                samples.append(time.perf_counter() - started)
+            results["get_plant_data_p50_ms"] = _percentile(samples, 50) * 1000
+            results["get_plant_data_p95_ms"] = _percentile(samples, 95) * 1000
+            if latency:
+                results["get_plant_data_p95_round_trips"] = (
+                    _percentile(samples, 95) / latency
+                )
+            results["parse_plant_data_us"] = _per_call_us(
+                lambda: client.parse_plant_data(combined), 2000
+            )
+
+            sn, _settings = await client.get_master_common_settings()
+            before = sum(simulator.stats.values())
+            writes = 5
+            started = time.perf_counter()
+            for attempt in range(writes):
+                await client.set_common_settings(sn, {"zeroExportPower": attempt})
+            elapsed = (time.perf_counter() - started) / writes
+            results["set_common_settings_ms"] = elapsed * 1000
+            results["set_common_settings_requests"] = (
+                sum(simulator.stats.values()) - before
+            ) / writes
+            if latency:
+                results["set_common_settings_round_trips"] = elapsed / latency
+
+            # Ten plants of one account polled ten times through one login
+            logins = simulator.stats["logins"]
+            auth = SolArkAuth(
+                username="bench",
+                password="bench",
+                base_url=url,
+                api_url=url,
+                session=session,
+                legacy_url=url,
+            )
+            clients = [
+                _client(url, plant_id, session, auth)
+                for plant_id in list(simulator.plants)[:10]
+            ]
+            for _ in range(10):
+                await asyncio.gather(*(c.get_plant_data() for c in clients))
+            results["shared_logins_per_100_polls"] = (
+                simulator.stats["logins"] - logins
+            ) * 100 / (len(clients) * 10)
+    finally:
+        await runner.cleanup()
+    return results
+
+
+async def _bench_memory(clients: int = 100) -> Dict[str, Any]:
+    """Traced allocations per client after one poll and parse each."""
+    import aiohttp
+
+    from .simulator import SimulatorConfig, start_simulator
+
+    simulator, runner, url = await start_simulator(
+        SimulatorConfig(plants=clients, inverters=1)
+    )
+    try:
+        async with aiohttp.ClientSession() as session:
+            # Warm imports, the connection pool and parser tables first
+            warm = _client(url, "100001", session)
+            warm.parse_plant_data(await warm.get_plant_data())
+            gc.collect()
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            instances = [
+                _client(url, plant_id, session) for plant_id in simulator.plants
+            ]
+            for client in instances:
+                client.parse_plant_data(await client.get_plant_data())
+            gc.collect()
+            after = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+    finally:
+        await runner.cleanup()
+    return {"memory_per_client_kb": (after - before) / len(instances) / 1024}
+
+
+async def _bench_throughput(plants: int, latency: float) -> Dict[str, Any]:
+    """One concurrent poll of every plant of one account."""
+    import aiohttp
+
+    from custom_components.solark.solark_auth import SolArkAuth
+
+    from .simulator import SimulatorConfig, start_simulator
+
+    simulator, runner, url = await start_simulator(
+        SimulatorConfig(plants=plants, inverters=1, latency=latency)
+    )
+    try:
+        connector = aiohttp.TCPConnector(limit=0)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            auth = SolArkAuth(
+                username="bench",
+                password="bench",
+                base_url=url,
+                api_url=url,
+                session=session,
+                legacy_url=url,
+            )
+            await auth.login()
+            clients = [
+                _client(url, plant_id, session, auth)
+                for plant_id in simulator.plants
+            ]
+            started = time.perf_counter()
+            outcomes = await asyncio.gather(
+                *(client.get_plant_data() for client in clients),
+                return_exceptions=True,
+            )
+            wall = time.perf_counter() - started
+    finally:
+        await runner.cleanup()
+    failed = sum(isinstance(outcome, BaseException) for outcome in outcomes)
+    return {
+        f"throughput_{plants}_wall_s": wall,
+        f"throughput_{plants}_plants_per_s": plants / wall,
+        f"throughput_{plants}_failed": failed,
+    }
+
+
+async def _bench_blocking(latency: float, polls: int) -> Dict[str, Any]:
+    """Loop blocking of the integration's poll, parse and listener fan-out.
+
+    Mirrors the coordinator callbacks with debug logging formatted to
+    /dev/null and 60 listeners reading the snapshot, as sensors do.
+    """
+    import logging
+    import os
+
+    import aiohttp
+
+    from custom_components.solark.solark_blocking import BlockingMonitor
+
+    from .simulator import SimulatorConfig, start_simulator
+
+    monitor = BlockingMonitor()
+    logger = logging.getLogger("custom_components.solark")
+    handler = logging.StreamHandler(open(os.devnull, "w", encoding="utf-8"))
+    level = logger.level
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    simulator, runner, url = await start_simulator(
+        SimulatorConfig(plants=1, inverters=2, latency=latency)
+    )
+    try:
+        async with aiohttp.ClientSession() as session:
+            client = _client(url, "100001", session)
+            keys = list(client.parse_plant_data({})) or ["pv_power"]
+            states: List[str] = []
+
+            def fan_out(snapshot: Any) -> None:
+                states.clear()
+                for index in range(60):
+                    states.append(str(snapshot.get(keys[index % len(keys)])))
+
+            fan_out = monitor.function("listener_fanout", fan_out)
+
+            @monitor.coroutine("async_update_data")
+            async def update() -> Any:
+                raw = await client.get_plant_data()
+                with monitor.section("parse_plant_data"):
+                    return client.parse_plant_snapshot(raw)
+
+            for _ in range(polls):
+                fan_out(await update())
+    finally:
+        await runner.cleanup()
+        monitor.close()
+        logger.removeHandler(handler)
+        logger.setLevel(level)
+        handler.stream.close()
+    report = monitor.as_dict()
+    results: Dict[str, Any] = {
+        f"blocking_{name}_max_ms": stats["max_ms"]
+        for name, stats in report["sections"].items()
+    }
+    results["max_callback_blocking_ms"] = monitor.max_blocking * 1000
+    return results
+
+
+def check_thresholds(
+    results: Dict[str, Any],
+    thresholds: Dict[str, Tuple[float, str]],
+    baseline: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Regressions of ``results`` against bounds and an optional baseline."""
+    regressions = []
+    for metric, (bound, kind) in thresholds.items():
+        value = results.get(metric)
+        if value is None:
+            continue
+        if (kind == "max" and value > bound) or (kind == "min" and value < bound):
+            regressions.append(
+                {"metric": metric, "value": value, "bound": bound, "kind": kind}
+            )
+    for metric, (_bound, kind) in thresholds.items():
+        value = results.get(metric)
+        previous = (baseline or {}).get(metric)
+        if value is None or not previous:
+            continue
+        if kind == "max":
+            worse = value > previous * (1 + BASELINE_TOLERANCE)
+        else:
+            worse = value < previous * (1 - BASELINE_TOLERANCE)
+        if worse:
+            regressions.append(
+                {"metric": metric, "value": value, "baseline": previous, "kind": kind}
+            )
+    return regressions
+
+
+async def run_benchmark_suite(args: Any) -> int:
+    """Entry point for ``solark_cli --bench``; exits 1 on a regression."""
+    from custom_components.solark.services import build_api_updates
+
+    latency = args.bench_latency
+    counts = BENCH_PLANT_COUNTS
+    if args.bench_plants:
+        counts = tuple(int(count) for count in args.bench_plants.split(","))
+    baseline = None
+    if args.bench_baseline:
+        try:
+            saved = json.loads(Path(args.bench_baseline).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            print(
+                f"Failed to read baseline {args.bench_baseline}: {exc}",
+                file=sys.stderr,
+            )
+            return 2
+        baseline = saved.get("results", {})
+
+    results: Dict[str, Any] = {
+        "build_api_updates_us": _per_call_us(
+            lambda: build_api_updates(_CONFIGURE_SERVICE_DATA), 5000
+        )
+    }
+    print("Benchmarking poll and write paths...", file=sys.stderr)
+    results.update(await _bench_poll_path(latency, args.bench_polls))
+    print("Benchmarking event loop blocking...", file=sys.stderr)
+    results.update(await _bench_blocking(latency, args.bench_polls))
+    print("Benchmarking memory per client...", file=sys.stderr)
+    results.update(await _bench_memory())
+    for plants in counts:
+        print(f"Benchmarking {plants} plants polled concurrently...", file=sys.stderr)
+        results.update(await _bench_throughput(plants, latency))
+
+    regressions = check_thresholds(results, BENCH_THRESHOLDS, baseline)
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "latency_s": latency,
+            "polls": args.bench_polls,
+            "plant_counts": list(counts),
+        },
+        "results": {
+            key: round(value, 3) if isinstance(value, float) else value
+            for key, value in sorted(results.items())
+        },
+        "thresholds": {
+            metric: {"bound": bound, "kind": kind}
+            for metric, (bound, kind) in BENCH_THRESHOLDS.items()
+        },
+        "baseline": args.bench_baseline,
+        "regressions": regressions,
+    }
+    Path(args.bench_output).write_text(
+        json.dumps(report, indent=2) + "\n", encoding="utf-8"
+    )
+    print(json.dumps(report["results"], indent=2))
+    for regression in regressions:
+        if "bound" in regression:
+            reference = f"{regression['kind']} {regression['bound']}"
+        else:
+            reference = f"baseline {regression['baseline']}"
+        print(
+            f"REGRESSION {regression['metric']}: {regression['value']:.3f} "
+            f"({reference})",
+            file=sys.stderr,
+        )
+    print(f"Wrote {args.bench_output}", file=sys.stderr)
+    return 1 if regressions else 0
@@ -3,15 +3,39 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import contextlib
+import functools
 import json
 import sys
+import time
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from custom_components.solark.const import DEFAULT_API_URL, DEFAULT_BASE_URL
+from custom_components.solark.const import (
+    DEFAULT_API_URL,
+    DEFAULT_BASE_URL,
+    DEFAULT_SCAN_INTERVAL,
+    LEGACY_API_URL,
+)
+
+# Exit code for transient API failures worth retrying (EX_TEMPFAIL)
+EXIT_RETRYABLE = 75
+
+# Read-only sections (name, title) in output order
+SECTIONS = (
+    ("settings", "Common Settings"),
+    ("workdata", "Workdata"),
+    ("plants", "Plant List"),
+    ("inverters", "Inverter List"),
+    ("gateways", "Gateway List"),
+    ("live", "Inverter Live Data"),
+    ("flow", "Flow Data"),
+    ("combined", "Combined Plant Data"),
+    ("parsed", "Parsed Sensor Values"),
+)
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -28,6 +52,10 @@ def _build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--plant-id", help="SolArk plant ID")
     parser.add_argument("--base-url", help="Base URL for the SolArk web app")
     parser.add_argument("--api-url", help="Base URL for the SolArk API")
+    parser.add_argument(
+        "--legacy-url",
+        help="Base URL for legacy login and workdata (the simulator's URL)",
+    )
     parser.add_argument(
         "--plants",
         action="store_true",
@@ -125,6 +153,196 @@ def _build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Allow setting changes on non-master inverters",
     )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Poll the plant until interrupted, one NDJSON snapshot per line",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_SCAN_INTERVAL,
+        help="Watch/serve/exporter: poll interval in seconds (default %(default)s)",
+    )
+    parser.add_argument(
+        "--max-interval",
+        type=float,
+        help="Watch/serve/exporter: longest backoff interval (default 4x --interval)",
+    )
+    parser.add_argument(
+        "--output",
+        help="Watch/fleet/replay: write results to this file instead of stdout",
+    )
+    parser.add_argument(
+        "--rotate-bytes",
+        type=int,
+        default=10_000_000,
+        help="Watch: rotate --output beyond this size (0 disables)",
+    )
+    parser.add_argument(
+        "--rotate-keep",
+        type=int,
+        default=5,
+        help="Watch: rotated files to keep",
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        help="Watch/replay: stop after this many snapshots",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Poll the plant and serve the latest snapshot over local HTTP",
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Serve/exporter/simulate: address to listen on (default %(default)s)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8765,
+        help="Serve/exporter/simulate: port to listen on (default %(default)s)",
+    )
+    parser.add_argument(
+        "--exporter",
+        action="store_true",
+        help="Serve OpenMetrics for the plant (or every --fleet plant) on /metrics",
+    )
+    parser.add_argument(
+        "--fleet",
+        help="Run the plant sections for every account/plant in this JSON or CSV file",
+    )
+    parser.add_argument(
+        "--export",
+        choices=["workdata", "flow", "energy"],
+        help="Export history for --start..--end to --output",
+    )
+    parser.add_argument(
+        "--start",
+        help="Export: first day (YYYY-MM-DD)",
+    )
+    parser.add_argument(
+        "--end",
+        help="Export: last day (YYYY-MM-DD, default today)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        help="Export: checkpoint file (default OUTPUT.checkpoint.json)",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        help="Export: most chunk fetches started per second (default unlimited)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Fleet/export/exporter: plants or chunks in flight (default %(default)s)",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=2,
+        help="Fleet/export: retries after a retryable error (default %(default)s)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["ndjson", "csv", "parquet"],
+        default="ndjson",
+        help="Fleet/export: output format (default %(default)s; parquet: export)",
+    )
+    parser.add_argument(
+        "--simulate",
+        action="store_true",
+        help="Run a local simulated SolArk cloud on --host/--port (no account)",
+    )
+    parser.add_argument(
+        "--sim-plants",
+        type=int,
+        default=1,
+        help="Simulate: number of plants (default %(default)s)",
+    )
+    parser.add_argument(
+        "--sim-inverters",
+        type=int,
+        default=1,
+        help="Simulate: inverters per plant (default %(default)s)",
+    )
+    parser.add_argument(
+        "--sim-latency",
+        type=float,
+        default=0.0,
+        help="Simulate: seconds of latency per request (plus up to 50%% jitter)",
+    )
+    parser.add_argument(
+        "--sim-error-rate",
+        type=float,
+        default=0.0,
+        help="Simulate: fraction of requests answered with HTTP 500",
+    )
+    parser.add_argument(
+        "--sim-rate-limit",
+        type=float,
+        default=0.0,
+        help="Simulate: fraction of requests answered with HTTP 429",
+    )
+    parser.add_argument(
+        "--sim-token-ttl",
+        type=float,
+        help="Simulate: expire tokens after this many seconds (default 3600)",
+    )
+    parser.add_argument(
+        "--record",
+        help="Write every request/response to this redacted .jsonl.gz archive",
+    )
+    parser.add_argument(
+        "--replay",
+        help="Run a --record archive through the client and parser (no network)",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Trace every call and print a timing waterfall to stderr",
+    )
+    parser.add_argument(
+        "--bench-parser",
+        action="store_true",
+        help="Benchmark and verify the plant data parser (no network access)",
+    )
+    parser.add_argument(
+        "--bench",
+        action="store_true",
+        help="Run the end-to-end benchmark suite against a local simulator",
+    )
+    parser.add_argument(
+        "--bench-output",
+        default="solark-bench.json",
+        help="Bench: results file (default %(default)s)",
+    )
+    parser.add_argument(
+        "--bench-baseline",
+        help="Bench: earlier results file; fail on metrics over 25%% worse",
+    )
+    parser.add_argument(
+        "--bench-latency",
+        type=float,
+        default=0.02,
+        help="Bench: injected seconds per request (default %(default)s)",
+    )
+    parser.add_argument(
+        "--bench-polls",
+        type=int,
+        default=20,
+        help="Bench: timed get_plant_data polls (default %(default)s)",
+    )
+    parser.add_argument(
+        "--bench-plants",
+        help="Bench: comma-separated plant counts to poll (default 1,10,100,1000)",
+    )
     return parser
 
 
@@ -151,6 +369,11 @@ def _parse_slot_mode(value: str | None) -> int | None:
 
 
 async def _run(args: argparse.Namespace) -> int:
+    if args.bench_parser:
+        from .bench import run_parser_benchmark
+
+        return run_parser_benchmark()
+
     try:
         import aiohttp
     except ModuleNotFoundError as exc:
@@ -160,8 +383,33 @@ async def _run(args: argparse.Namespace) -> int:
         )
         return 1
 
+    if args.bench:
+        from .bench import run_benchmark_suite
+
+        return await run_benchmark_suite(args)
+
+    if args.simulate:
+        from .simulator import run_simulator
+
+        return await run_simulator(args)
+
+    if args.replay:
+        from .replay import run_replay
+
+        return await run_replay(args, _report_error)
+
+    if args.fleet:
+        if args.exporter:
+            from .exporter import run_exporter
+
+            return await run_exporter(args)
+
+        from .fleet import run_fleet
+
+        return await run_fleet(args)
+
     from custom_components.solark.solark_client import SolArkCloudAPI
-    from custom_components.solark.solark_errors import SolArkCloudAPIError
+    from custom_components.solark.solark_trace import format_waterfall
 
     secrets = {}
     if not (args.username and args.password and args.plant_id):
@@ -172,18 +420,9 @@ async def _run(args: argparse.Namespace) -> int:
     plant_id = args.plant_id or secrets.get("plant_id")
     base_url = args.base_url or secrets.get("base_url") or DEFAULT_BASE_URL
     api_url = args.api_url or secrets.get("api_url") or DEFAULT_API_URL
+    legacy_url = args.legacy_url or secrets.get("legacy_url") or LEGACY_API_URL
 
-    requested = {
-        "plants": args.plants,
-        "inverters": args.inverters,
-        "live": args.live,
-        "flow": args.flow,
-        "combined": args.combined,
-        "parsed": args.parsed,
-        "gateways": args.gateways,
-        "settings": args.settings,
-        "workdata": args.workdata,
-    }
+    requested = {name: getattr(args, name) for name, _title in SECTIONS}
     if not any(requested.values()) and not args.set_slot:
         for key in requested:
             requested[key] = True
@@ -194,6 +433,10 @@ async def _run(args: argparse.Namespace) -> int:
             requested["combined"],
             requested["parsed"],
             (requested["live"] and not args.inverter_sn),
+            args.watch,
+            args.serve,
+            args.exporter,
+            (args.export and (args.export != "workdata" or not args.inverter_sn)),
         ]
     )
 
@@ -214,7 +457,29 @@ async def _run(args: argparse.Namespace) -> int:
         )
         return 2
 
-    async with aiohttp.ClientSession() as session:
+    if args.exporter:
+        from .exporter import run_exporter
+        from .fleet import FleetAccount
+
+        plant = {"plant_id": plant_id, "name": ""}
+        account = FleetAccount(
+            username, password, base_url, api_url, legacy_url, [plant]
+        )
+        return await run_exporter(args, [account])
+
+    async with contextlib.AsyncExitStack() as stack:
+        session = await stack.enter_async_context(aiohttp.ClientSession())
+        if args.record:
+            from custom_components.solark.solark_recorder import RecordingSession
+
+            session = await stack.enter_async_context(
+                RecordingSession(
+                    session,
+                    args.record,
+                    identifiers=[username, password],
+                    plants=[plant_id] if plant_id else [],
+                )
+            )
         client = SolArkCloudAPI(
             username=username,
             password=password,
@@ -222,101 +487,203 @@ async def _run(args: argparse.Namespace) -> int:
             base_url=base_url,
             api_url=api_url,
             session=session,
+            opentelemetry=args.trace,
+            legacy_url=legacy_url,
         )
 
-        try:
-            await client.login()
-        except SolArkCloudAPIError as exc:
-            print(f"Login failed: {exc}", file=sys.stderr)
-            return 1
+        if args.watch:
+            from .watch import run_watch
+
+            return await run_watch(args, client, _report_error)
+
+        if args.serve:
+            from .serve import run_serve
 
+            return await run_serve(args, client, _report_error)
+
+        if args.export:
+            from .export import run_export
+
+            return await run_export(args, client, _report_error)
+
+        trace = (
+            client.tracer.trace("solark_cli")
+            if args.trace
+            else contextlib.nullcontext()
+        )
         try:
-            live_data = None
-            flow_data = None
-            combined = None
-
-            if args.set_slot:
-                if not args.inverter_sn or args.slot is None:
-                    print(
-                        "Missing --inverter-sn or --slot for --set-slot.",
-                        file=sys.stderr,
-                    )
-                    return 2
-                set_result = await client.set_system_work_mode_slot(
-                    sn=args.inverter_sn,
-                    slot=args.slot,
-                    sell_time=args.slot_time,
-                    sell_pac=args.slot_pac,
-                    sell_volt=args.slot_volt,
-                    cap=args.slot_cap,
-                    slot_mode=_parse_slot_mode(args.slot_mode),
-                    sys_work_mode=args.sys_work_mode,
-                    require_master=not args.allow_non_master,
+            with trace:
+                return await _run_requests(args, client, requested)
+        finally:
+            if args.trace and client.tracer.traces:
+                print("\n=== Trace ===", file=sys.stderr)
+                print(
+                    format_waterfall(client.tracer.traces[-1].as_dict()),
+                    file=sys.stderr,
                 )
-                _print_section("Set Slot Result", set_result)
-
-            if requested["settings"]:
-                if not args.inverter_sn:
-                    print(
-                        "Missing --inverter-sn for --settings.",
-                        file=sys.stderr,
-                    )
-                    return 2
-                settings = await client.get_common_settings(args.inverter_sn)
-                _print_section("Common Settings", settings)
-
-            if requested["workdata"]:
-                if not args.inverter_sn:
-                    print(
-                        "Missing --inverter-sn for --workdata.",
-                        file=sys.stderr,
-                    )
-                    return 2
-                fields = None
-                if args.workdata_fields:
-                    fields = [f.strip() for f in args.workdata_fields.split(",")]
-                workdata = await client.get_workdata(args.inverter_sn, fields=fields)
-                _print_section("Workdata", workdata)
-
-            if requested["plants"]:
-                plants = await client.get_plants()
-                _print_section("Plant List", plants)
-
-            if requested["inverters"]:
-                inverter_list = await client.get_inverters()
-                _print_section("Inverter List", inverter_list)
-
-            if requested["gateways"]:
-                gateways = await client.get_gateways()
-                _print_section("Gateway List", gateways)
-
-            if requested["live"]:
-                if args.inverter_sn:
-                    live_data = await client.get_inverter_live_data_by_sn(
-                        args.inverter_sn
-                    )
-                else:
-                    live_data = await client.get_inverter_live_data()
-                _print_section("Inverter Live Data", live_data)
-
-            if requested["flow"]:
-                flow_data = await client.get_flow_data()
-                _print_section("Flow Data", flow_data)
-
-            if requested["combined"]:
-                combined = await client.get_plant_data(flow_data=flow_data)
-                _print_section("Combined Plant Data", combined)
-
-            if requested["parsed"]:
-                if combined is None:
-                    combined = await client.get_plant_data(flow_data=flow_data)
-                parsed = client.parse_plant_data(combined)
-                _print_section("Parsed Sensor Values", parsed)
-        except SolArkCloudAPIError as exc:
-            print(f"API error: {exc}", file=sys.stderr)
-            return 1
-
-    return 0
+
+
+async def _run_requests(args: argparse.Namespace, client, requested: dict) -> int:
+    from custom_components.solark.solark_errors import SolArkCloudAPIError
+
+    for name in ("settings", "workdata"):
+        if requested[name] and not args.inverter_sn:
+            print(f"Missing --inverter-sn for --{name}.", file=sys.stderr)
+            return 2
+    if args.set_slot and (not args.inverter_sn or args.slot is None):
+        print("Missing --inverter-sn or --slot for --set-slot.", file=sys.stderr)
+        return 2
+
+    try:
+        await client.login()
+    except SolArkCloudAPIError as exc:
+        return _report_error("Login failed", exc)
+
+    try:
+        if args.set_slot:
+            set_result = await client.set_system_work_mode_slot(
+                sn=args.inverter_sn,
+                slot=args.slot,
+                sell_time=args.slot_time,
+                sell_pac=args.slot_pac,
+                sell_volt=args.slot_volt,
+                cap=args.slot_cap,
+                slot_mode=_parse_slot_mode(args.slot_mode),
+                sys_work_mode=args.sys_work_mode,
+                require_master=not args.allow_non_master,
+            )
+            _print_section("Set Slot Result", set_result)
+    except SolArkCloudAPIError as exc:
+        return _report_error("API error", exc)
+
+    timings: dict[str, float] = {}
+    started = time.perf_counter()
+    results = await _run_sections(args, client, requested, timings)
+    wall = time.perf_counter() - started
+
+    exit_code = 0
+    for name, title in SECTIONS:
+        if name not in results:
+            continue
+        result = results[name]
+        if isinstance(result, SolArkCloudAPIError):
+            code = _report_error(f"API error ({title})", result)
+            exit_code = exit_code or code
+        else:
+            _print_section(title, result)
+    if timings:
+        _print_timings(timings, wall)
+    return exit_code
+
+
+async def _run_sections(
+    args: argparse.Namespace, client, requested: dict, timings: dict
+) -> dict:
+    """Fetch the requested read-only sections concurrently.
+
+    Returns each section's result, or the SolArkCloudAPIError it failed
+    with, keyed by section name; ``timings`` receives each section's own
+    duration. ``combined`` reuses the ``flow`` result and ``parsed`` reuses
+    ``combined``, so neither fetches again.
+    """
+    fields = None
+    if args.workdata_fields:
+        fields = [f.strip() for f in args.workdata_fields.split(",")]
+    if args.inverter_sn:
+        live = functools.partial(
+            client.get_inverter_live_data_by_sn, args.inverter_sn
+        )
+    else:
+        live = client.get_inverter_live_data
+    fetchers = {
+        "settings": functools.partial(
+            client.get_common_settings, args.inverter_sn
+        ),
+        "workdata": functools.partial(
+            client.get_workdata, args.inverter_sn, fields=fields
+        ),
+        "plants": client.get_plants,
+        "inverters": client.get_inverters,
+        "gateways": client.get_gateways,
+        "live": live,
+        "flow": client.fetch_flow_data,
+    }
+    tasks = {
+        name: asyncio.ensure_future(_timed_section(timings, name, fetch))
+        for name, fetch in fetchers.items()
+        if requested[name]
+    }
+    if requested["combined"] or requested["parsed"]:
+        tasks["combined"] = asyncio.ensure_future(
+            _combined_section(client, tasks.get("flow"), timings)
+        )
+    try:
+        results = dict(zip(tasks, await asyncio.gather(*tasks.values())))
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        raise
+
+    if requested["parsed"]:
+        combined = results["combined"]
+        if isinstance(combined, Exception):
+            results["parsed"] = combined
+        else:
+            start = time.perf_counter()
+            results["parsed"] = client.parse_plant_data(combined)
+            timings["parsed"] = time.perf_counter() - start
+    if not requested["combined"]:
+        results.pop("combined", None)
+    return results
+
+
+async def _timed_section(timings: dict, name: str, fetch) -> object:
+    """Await one section; an API error is returned rather than raised."""
+    from custom_components.solark.solark_errors import SolArkCloudAPIError
+
+    start = time.perf_counter()
+    try:
+        return await fetch()
+    except SolArkCloudAPIError as exc:
+        return exc
+    finally:
+        timings[name] = time.perf_counter() - start
+
+
+async def _combined_section(client, flow_task, timings: dict) -> object:
+    """Combined plant data, reusing the flow section once it finished."""
+    flow_data = None
+    if flow_task is not None:
+        flow = await flow_task
+        if isinstance(flow, dict):
+            flow_data = flow
+    return await _timed_section(
+        timings,
+        "combined",
+        functools.partial(client.get_plant_data, flow_data=flow_data),
+    )
+
+
+def _print_timings(timings: dict, wall: float) -> None:
+    """Per-section durations to stderr, in output order."""
+    print("\n=== Section Timing ===", file=sys.stderr)
+    for name, _title in SECTIONS:
+        if name in timings:
+            print(f"{name:<10} {timings[name] * 1000:>9.1f} ms", file=sys.stderr)
+    print(
+        f"{'total':<10} {wall * 1000:>9.1f} ms "
+        f"(sum of sections {sum(timings.values()) * 1000:.1f} ms)",
+        file=sys.stderr,
+    )
+
+
+def _report_error(prefix: str, exc: Exception) -> int:
+    """Print an API error with its kind; return the matching exit code."""
+    kind = getattr(exc, "kind", "error")
+    retryable = getattr(exc, "retryable", False)
+    detail = f"{kind}, retryable" if retryable else kind
+    print(f"{prefix}: {exc} [{detail}]", file=sys.stderr)
+    return EXIT_RETRYABLE if retryable else 1
 
 
 def main() -> None:
@@ -0,0 +1,403 @@
+"""Export mode: stream a date range of history to CSV, NDJSON or Parquet.
+
+The range is split into chunks (a day of workdata or power curves, a month
+of daily energy totals) that are fetched concurrently but written strictly
+in order. Only the chunks in flight are held in memory. After each written
+chunk a checkpoint records the next chunk and the output size, so an
+interrupted export resumes where it stopped without duplicate rows.
+"""
+from __future__ import annotations
+
+import asyncio
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from custom_components.solark.solark_errors import SolArkCloudAPIError
+from custom_components.solark.solark_history import (
+    ENERGY_LABEL_KEYS,
+    energy_series,
+    record_time,
+)
+from custom_components.solark.solark_parser import to_float
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    HAS_PYARROW = True
+except ImportError:  # pragma: no cover - optional dependency
+    pa = pq = None  # type: ignore[assignment]
+    HAS_PYARROW = False
+
+EXPORT_DATASETS = ("workdata", "flow", "energy")
+# Delay before the first retry of a failed chunk; doubles per attempt
+RETRY_BASE_DELAY = 2.0
+
+
+class RateLimiter:
+    """Space out chunk fetches to at most ``rate`` starts per second."""
+
+    def __init__(self, rate: Optional[float]) -> None:
+        self._interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if not self._interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self._interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def export_chunks(dataset: str, start: date, end: date) -> List[date]:
+    """Chunk keys covering ``start``..``end``: days, or month starts for energy."""
+    if dataset == "energy":
+        chunks = []
+        month = start.replace(day=1)
+        while month <= end:
+            chunks.append(month)
+            month = (month + timedelta(days=32)).replace(day=1)
+        return chunks
+    return [start + timedelta(days=n) for n in range((end - start).days + 1)]
+
+
+def workdata_rows(sn: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """One row per record, oldest first, tagged with the inverter SN."""
+    epoch = datetime.min.replace(tzinfo=timezone.utc)
+    ordered = sorted(
+        records, key=lambda record: record_time(record, timezone.utc) or epoch
+    )
+    return [{"sn": sn, **record} for record in ordered]
+
+
+def flow_rows(day: date, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Pivot a day's power curves into one row per timestamp."""
+    rows: Dict[str, Dict[str, Any]] = {}
+    for info in data.get("infos") or []:
+        if not isinstance(info, dict):
+            continue
+        label = str(info.get("label") or "").strip().lower()
+        key = ENERGY_LABEL_KEYS.get(label, label.replace(" ", "_"))
+        if not key:
+            continue
+        for record in info.get("records") or []:
+            when = str(record.get("time") or "")
+            if not when:
+                continue
+            if len(when) <= 8:
+                when = f"{day.isoformat()} {when}"
+            rows.setdefault(when, {"time": when})[key] = to_float(
+                record.get("value")
+            )
+    return [rows[when] for when in sorted(rows)]
+
+
+def energy_rows(
+    month: date, data: Dict[str, Any], start: date, end: date
+) -> List[Dict[str, Any]]:
+    """Daily energy totals (kWh) for one month, limited to start..end."""
+    rows: Dict[date, Dict[str, Any]] = {}
+    for key, values in energy_series(data, "month", month).items():
+        for day, kwh in values.items():
+            if start <= day <= end:
+                rows.setdefault(day, {"date": day.isoformat()})[key] = kwh
+    return [rows[day] for day in sorted(rows)]
+
+
+class _CSVAppender:
+    """Append rows to a CSV file with a header fixed by the first rows.
+
+    The header holds the first rows' keys followed by the ``expected`` ones
+    not seen yet (known energy labels, the workdata field list or catalog).
+    A later row with a key outside the header raises ValueError before
+    anything of its chunk is written, rather than dropping the value.
+    """
+
+    def __init__(
+        self, path: Path, columns: Optional[List[str]], expected: List[str]
+    ) -> None:
+        self.columns = columns
+        self._expected = expected
+        self._file = path.open("a", newline="", encoding="utf-8")
+        self._writer: Optional[csv.DictWriter] = None
+
+    def write(self, chunk: str, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        keys = list(dict.fromkeys(k for row in rows for k in row))
+        if self.columns is None:
+            self.columns = list(dict.fromkeys(keys + self._expected))
+        header = set(self.columns)
+        unknown = [key for key in keys if key not in header]
+        if unknown:
+            raise ValueError(
+                f"{', '.join(unknown)} not in the CSV header fixed by earlier "
+                "rows; export as NDJSON or Parquet instead"
+            )
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._file, self.columns)
+            if self._file.tell() == 0:
+                self._writer.writeheader()
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _NDJSONAppender:
+    """Append rows as compact JSON lines."""
+
+    columns = None
+
+    def __init__(self, path: Path) -> None:
+        self._file = path.open("a", encoding="utf-8")
+
+    def write(self, chunk: str, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            self._file.write(
+                json.dumps(row, separators=(",", ":"), default=str) + "\n"
+            )
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetDirectory:
+    """One Parquet file per chunk inside the output directory."""
+
+    columns = None
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        path.mkdir(parents=True, exist_ok=True)
+
+    def write(self, chunk: str, rows: List[Dict[str, Any]]) -> None:
+        if rows:
+            pq.write_table(
+                pa.Table.from_pylist(rows), self._path / f"{chunk}.parquet"
+            )
+
+    def close(self) -> None:
+        pass
+
+
+def _load_checkpoint(
+    path: Path, identity: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    checkpoint = json.loads(path.read_text(encoding="utf-8"))
+    mismatched = [
+        key for key, value in identity.items() if checkpoint.get(key) != value
+    ]
+    if mismatched:
+        raise ValueError(
+            f"checkpoint {path} belongs to a different export "
+            f"({', '.join(mismatched)} differ); remove it or pass --checkpoint"
+        )
+    return checkpoint
+
+
+def _save_checkpoint(path: Path, checkpoint: Dict[str, Any]) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(checkpoint, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+async def run_export(
+    args: Any, client: Any, report_error: Callable[[str, Exception], int]
+) -> int:
+    """Export ``args.export`` for ``args.start``..``args.end`` to ``args.output``."""
+    if not args.output or not args.start:
+        print("--export needs --start and --output.", file=sys.stderr)
+        return 2
+    if args.format == "parquet" and not HAS_PYARROW:
+        print("Parquet export needs pyarrow; install it first.", file=sys.stderr)
+        return 1
+    try:
+        start = date.fromisoformat(args.start)
+        end = date.fromisoformat(args.end) if args.end else date.today()
+    except ValueError as exc:
+        print(f"Invalid --start/--end date: {exc}", file=sys.stderr)
+        return 2
+
+    output = Path(args.output)
+    checkpoint_path = Path(args.checkpoint or f"{output}.checkpoint.json")
+    identity = {
+        "dataset": args.export,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "format": args.format,
+        "output": str(output.resolve()),
+    }
+    chunks = export_chunks(args.export, start, end)
+    if not chunks:
+        print("--start is after --end; nothing to export.", file=sys.stderr)
+        return 2
+    try:
+        checkpoint = _load_checkpoint(checkpoint_path, identity)
+    except ValueError as exc:
+        print(f"Cannot resume: {exc}", file=sys.stderr)
+        return 2
+    if checkpoint is None:
+        checkpoint = {
+            **identity,
+            "next": chunks[0].isoformat(),
+            "rows": 0,
+            "bytes": 0,
+        }
+    elif checkpoint["next"] is None:
+        print(f"Export already complete ({checkpoint_path}).", file=sys.stderr)
+        return 0
+    else:
+        print(
+            f"Resuming at {checkpoint['next']} ({checkpoint['rows']} rows written)",
+            file=sys.stderr,
+        )
+    # Checkpoints store chunk keys, so this is exact for every dataset
+    resume_from = date.fromisoformat(checkpoint["next"])
+    chunks = [chunk for chunk in chunks if chunk >= resume_from]
+
+    try:
+        await client.login()
+        fetcher = await _chunk_fetcher(args, client, start, end)
+    except SolArkCloudAPIError as exc:
+        return report_error("Export failed", exc)
+    if fetcher is None:
+        print("No inverter found; pass --inverter-sn.", file=sys.stderr)
+        return 1
+    fetch, expected = fetcher
+
+    if args.format == "parquet":
+        writer: Any = _ParquetDirectory(output)
+    else:
+        if output.exists():
+            # Drop anything written after the last checkpoint
+            with output.open("r+b") as handle:
+                handle.truncate(checkpoint["bytes"])
+        if args.format == "csv":
+            writer = _CSVAppender(output, checkpoint.get("columns"), expected)
+        else:
+            writer = _NDJSONAppender(output)
+
+    limiter = RateLimiter(args.rate)
+    window = max(args.concurrency, 1)
+    pending: Deque[tuple[int, asyncio.Future]] = deque()
+    started = time.perf_counter()
+    written = 0
+    queued = iter(range(len(chunks)))
+
+    def _schedule() -> None:
+        # Keep at most ``window`` chunks in flight
+        while len(pending) < window:
+            position = next(queued, None)
+            if position is None:
+                return
+            task = _fetch_chunk(fetch, chunks[position], limiter, args.retries)
+            pending.append((position, asyncio.ensure_future(task)))
+
+    index = 0
+    try:
+        _schedule()
+        while pending:
+            index, task = pending.popleft()
+            rows = await task
+            writer.write(chunks[index].isoformat(), rows)
+            written += len(rows)
+            checkpoint["rows"] += len(rows)
+            following = index + 1
+            checkpoint["next"] = (
+                chunks[following].isoformat() if following < len(chunks) else None
+            )
+            checkpoint["columns"] = writer.columns
+            if args.format != "parquet":
+                checkpoint["bytes"] = output.stat().st_size
+            _save_checkpoint(checkpoint_path, checkpoint)
+            _schedule()
+    except SolArkCloudAPIError as exc:
+        return report_error(f"Export stopped at {chunks[index].isoformat()}", exc)
+    except ValueError as exc:
+        print(f"Export stopped at {chunks[index].isoformat()}: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        for _index, task in pending:
+            task.cancel()
+        writer.close()
+
+    print(
+        f"Exported {written} rows from {len(chunks)} chunks in "
+        f"{time.perf_counter() - started:.1f} s to {output}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+async def _chunk_fetcher(
+    args: Any, client: Any, start: date, end: date
+) -> Optional[tuple[Callable[[date], Any], List[str]]]:
+    """Chunk fetch coroutine for ``args.export`` and its expected columns.
+
+    The columns complete the CSV header beyond the keys of the first rows.
+    """
+    labels = list(ENERGY_LABEL_KEYS.values())
+    if args.export == "energy":
+
+        async def _energy(month: date) -> List[Dict[str, Any]]:
+            data = await client.get_plant_energy_month(month)
+            return energy_rows(month, data, start, end)
+
+        return _energy, ["date", *labels]
+
+    if args.export == "flow":
+
+        async def _flow(day: date) -> List[Dict[str, Any]]:
+            return flow_rows(day, await client.get_plant_energy_day(day))
+
+        return _flow, ["time", *labels]
+
+    sn = args.inverter_sn or await client.discover_master()
+    if not sn:
+        return None
+    fields = None
+    if args.workdata_fields:
+        fields = [f.strip() for f in args.workdata_fields.split(",")]
+
+    async def _workdata(day: date) -> List[Dict[str, Any]]:
+        records = await client.get_workdata_history(
+            sn, day, fields=fields, max_concurrency=1
+        )
+        return workdata_rows(sn, records)
+
+    if fields is None:
+        fields = list(await client.get_workdata_catalog(sn))
+    return _workdata, ["sn", *fields]
+
+
+async def _fetch_chunk(
+    fetch: Callable[[date], Any], chunk: date, limiter: RateLimiter, retries: int
+) -> List[Dict[str, Any]]:
+    """Fetch one chunk, retrying retryable errors with backoff."""
+    attempt = 0
+    while True:
+        await limiter.acquire()
+        try:
+            return await fetch(chunk)
+        except SolArkCloudAPIError as exc:
+            attempt += 1
+            if not exc.retryable or attempt > retries:
+                raise
+            delay = RETRY_BASE_DELAY * 2 ** (attempt - 1)
+            await asyncio.sleep(max(delay, getattr(exc, "retry_after", None) or 0))
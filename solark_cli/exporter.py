@@ -0,0 +1,216 @@
+"""Exporter mode: poll plants in the background, serve OpenMetrics on /metrics.
+
+Every plant is polled on its own schedule; a scrape only renders what the
+last polls cached (and reuses the rendered text until the next poll), so
+scrapes never trigger cloud calls.
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+from aiohttp import web
+
+from custom_components.solark.solark_auth import SolArkAuth
+from custom_components.solark.solark_client import LEG_OK, SolArkCloudAPI
+from custom_components.solark.solark_errors import SolArkCloudAPIError
+from custom_components.solark.solark_openmetrics import (
+    CONTENT_TYPE,
+    PlantMetrics,
+    render_openmetrics,
+)
+
+from .fleet import FleetAccount, load_fleet
+from .watch import poll_loop, stop_on_signals
+
+
+class MetricsCache:
+    """Per-plant poll results plus the exposition rendered from them."""
+
+    def __init__(self) -> None:
+        self.plants: Dict[str, PlantMetrics] = {}
+        self._body: Optional[bytes] = None
+
+    def update(self, plant: PlantMetrics) -> None:
+        self.plants[plant.plant_id] = plant
+        self._body = None
+
+    def body(self) -> bytes:
+        if self._body is None:
+            self._body = render_openmetrics(self.plants.values()).encode()
+        return self._body
+
+
+async def run_exporter(
+    args: Any, accounts: Optional[List[FleetAccount]] = None
+) -> int:
+    """Serve /metrics for ``accounts`` (or the plants in ``args.fleet``)."""
+    if accounts is None:
+        try:
+            accounts = load_fleet(args.fleet)
+        except (OSError, ValueError, KeyError) as exc:
+            print(f"Failed to read fleet file {args.fleet}: {exc}", file=sys.stderr)
+            return 2
+
+    with stop_on_signals() as stop:
+        return await _serve_metrics(args, accounts, stop)
+
+
+async def _serve_metrics(
+    args: Any, accounts: List[FleetAccount], stop: asyncio.Event
+) -> int:
+    cache = MetricsCache()
+
+    async def metrics(request: web.Request) -> web.StreamResponse:
+        return web.Response(
+            body=cache.body(), headers={"Content-Type": CONTENT_TYPE}
+        )
+
+    app = web.Application()
+    app.router.add_get("/metrics", metrics)
+    runner = web.AppRunner(app)
+    await runner.setup()
+
+    async with aiohttp.ClientSession() as session:
+        semaphore = asyncio.Semaphore(max(args.concurrency, 1))
+        pollers = []
+        targets = [
+            (account, plant) for account in accounts for plant in account.plants
+        ]
+        auths: Dict[tuple, SolArkAuth] = {}
+        for index, (account, plant) in enumerate(targets):
+            key = (account.username, account.api_url)
+            if key not in auths:
+                auths[key] = SolArkAuth(
+                    username=account.username,
+                    password=account.password,
+                    base_url=account.base_url,
+                    api_url=account.api_url,
+                    session=session,
+                    legacy_url=account.legacy_url,
+                )
+            client = SolArkCloudAPI(
+                username=account.username,
+                password=account.password,
+                plant_id=plant["plant_id"],
+                base_url=account.base_url,
+                api_url=account.api_url,
+                session=session,
+                auth=auths[key],
+            )
+            # Spread the first polls over one interval
+            offset = args.interval * index / len(targets)
+            labels = {"name": plant["name"]} if plant["name"] else {}
+            pollers.append(
+                asyncio.ensure_future(
+                    _poll_plant(
+                        args, client, auths[key], labels, cache, semaphore, stop, offset
+                    )
+                )
+            )
+
+        site = web.TCPSite(runner, args.host, args.port)
+        await site.start()
+        print(
+            f"Exporting {len(targets)} plants on "
+            f"http://{args.host}:{args.port}/metrics",
+            file=sys.stderr,
+        )
+        try:
+            await stop.wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for poller in pollers:
+                poller.cancel()
+            await asyncio.gather(*pollers, return_exceptions=True)
+            await runner.cleanup()
+    return 0
+
+
+async def _poll_plant(
+    args: Any,
+    client: SolArkCloudAPI,
+    auth: SolArkAuth,
+    labels: Dict[str, str],
+    cache: MetricsCache,
+    semaphore: asyncio.Semaphore,
+    stop: asyncio.Event,
+    offset: float,
+) -> None:
+    """Poll one plant until stopped, caching every result."""
+    base = float(args.interval)
+    maximum = max(float(args.max_interval or base * 4), base)
+    plant = PlantMetrics(client.plant_id, labels=labels)
+    cache.update(plant)
+
+    def failed() -> None:
+        # Keep the last good values; solark_up reports the failure
+        nonlocal plant
+        plant = PlantMetrics(
+            client.plant_id,
+            up=False,
+            last_poll=plant.last_poll,
+            parsed=plant.parsed,
+            raw=plant.raw,
+            client=_client_health(client, auth),
+            labels=labels,
+        )
+        cache.update(plant)
+
+    def on_snapshot(
+        raw: Dict[str, Any], snapshot: Any, poll_ms: float
+    ) -> Optional[bool]:
+        nonlocal plant
+        # Legs fail without raising; the plant is up if any succeeded
+        legs = raw.get("legStatus") or {}
+        if legs and LEG_OK not in legs.values():
+            print(
+                f"Plant {client.plant_id}: poll failed (legs {legs})",
+                file=sys.stderr,
+            )
+            failed()
+            return None
+        plant = PlantMetrics(
+            client.plant_id,
+            up=True,
+            last_poll=time.time(),
+            parsed=snapshot.as_dict(),
+            raw=raw,
+            client=_client_health(client, auth),
+            labels=labels,
+        )
+        cache.update(plant)
+        # Scrapes read the cache, so keep the base interval
+        return True
+
+    def on_error(exc: SolArkCloudAPIError) -> None:
+        print(
+            f"Plant {client.plant_id}: poll failed ({exc.kind}): {exc}",
+            file=sys.stderr,
+        )
+        failed()
+
+    await poll_loop(
+        client,
+        base,
+        maximum,
+        stop,
+        on_snapshot,
+        on_error,
+        delay=offset,
+        semaphore=semaphore,
+        raise_fatal=False,
+    )
+
+
+def _client_health(client: SolArkCloudAPI, auth: SolArkAuth) -> Dict[str, Any]:
+    """Client metrics plus the login metrics kept by the shared account auth."""
+    health = client.metrics.as_dict()
+    logins = auth.metrics.as_dict()
+    health["groups"].update(logins["groups"])
+    health["logins"] = logins["logins"]
+    return health
@@ -0,0 +1,285 @@
+"""Fleet mode: run CLI sections across many accounts and plants."""
+from __future__ import annotations
+
+import asyncio
+import csv
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from custom_components.solark.const import (
+    DEFAULT_API_URL,
+    DEFAULT_BASE_URL,
+    LEGACY_API_URL,
+)
+from custom_components.solark.solark_auth import SolArkAuth
+from custom_components.solark.solark_client import SolArkCloudAPI
+from custom_components.solark.solark_errors import SolArkCloudAPIError
+from custom_components.solark.solark_metrics import RollingLatency
+from custom_components.solark.solark_snapshot import FIELDS as SNAPSHOT_FIELDS
+
+from .cli import EXIT_RETRYABLE, SECTIONS, _run_sections
+from .watch import NDJSONWriter
+
+# Plant-scoped sections that can run per fleet target, in output order
+FLEET_SECTIONS = ("live", "flow", "combined", "parsed")
+DEFAULT_FLEET_SECTIONS = ("parsed",)
+# Delay before the first retry of a failed target; doubles per attempt
+RETRY_BASE_DELAY = 2.0
+
+CSV_COLUMNS = (
+    "account",
+    "plant_id",
+    "name",
+    "ok",
+    "attempts",
+    "elapsed_ms",
+    "error_kind",
+    "error",
+)
+
+
+@dataclass
+class FleetAccount:
+    """One set of credentials and the plants to run against."""
+
+    username: str
+    password: str
+    base_url: str = DEFAULT_BASE_URL
+    api_url: str = DEFAULT_API_URL
+    legacy_url: str = LEGACY_API_URL
+    plants: List[Dict[str, str]] = field(default_factory=list)
+
+
+def load_fleet(path: str) -> List[FleetAccount]:
+    """Read accounts from JSON or CSV.
+
+    JSON is a list of accounts (or ``{"accounts": [...]}``), each with
+    ``username``, ``password``, optional ``base_url``/``api_url``/
+    ``legacy_url`` and ``plants`` as IDs or ``{"plant_id", "name"}`` objects.
+    CSV has one row per plant with ``username``, ``password``, ``plant_id``
+    and optional ``name``, ``base_url``, ``api_url`` and ``legacy_url``
+    columns; rows are grouped by account.
+    """
+    source = Path(path)
+    if source.suffix.lower() == ".csv":
+        with source.open(newline="", encoding="utf-8") as handle:
+            entries = [
+                {**row, "plants": [row]} for row in csv.DictReader(handle)
+            ]
+    else:
+        data = json.loads(source.read_text(encoding="utf-8"))
+        entries = data.get("accounts", []) if isinstance(data, dict) else data
+
+    accounts: Dict[tuple, FleetAccount] = {}
+    for entry in entries:
+        base_url = entry.get("base_url") or DEFAULT_BASE_URL
+        api_url = entry.get("api_url") or DEFAULT_API_URL
+        legacy_url = entry.get("legacy_url") or LEGACY_API_URL
+        key = (entry["username"], entry["password"], base_url, api_url, legacy_url)
+        account = accounts.get(key)
+        if account is None:
+            account = accounts[key] = FleetAccount(*key)
+        for plant in entry.get("plants", []):
+            if not isinstance(plant, dict):
+                plant = {"plant_id": plant}
+            account.plants.append(
+                {
+                    "plant_id": str(plant["plant_id"]),
+                    "name": plant.get("name") or "",
+                }
+            )
+    return list(accounts.values())
+
+
+class _CSVWriter:
+    """Stream result rows as CSV; parsed values get one column each."""
+
+    def __init__(self, path: Optional[str], parsed: bool) -> None:
+        self._file = open(path, "w", newline="", encoding="utf-8") if path else None
+        stream = self._file or sys.stdout
+        columns = CSV_COLUMNS + (SNAPSHOT_FIELDS if parsed else ())
+        self._writer = csv.DictWriter(stream, columns, extrasaction="ignore")
+        self._writer.writeheader()
+        self._stream = stream
+
+    def write(self, record: Dict[str, Any]) -> None:
+        error = record.get("error") or {}
+        row = {
+            **record,
+            **(record.get("data", {}).get("parsed") or {}),
+            "error_kind": error.get("kind", ""),
+            "error": error.get("message", ""),
+        }
+        self._writer.writerow(row)
+        self._stream.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+
+async def run_fleet(args: Any) -> int:
+    """Run the requested sections for every plant in ``args.fleet``."""
+    import aiohttp
+
+    if args.format == "parquet":
+        print("Fleet results are written as NDJSON or CSV.", file=sys.stderr)
+        return 2
+    sections = [name for name in FLEET_SECTIONS if getattr(args, name)]
+    sections = sections or list(DEFAULT_FLEET_SECTIONS)
+    requested = {name: name in sections for name, _title in SECTIONS}
+    try:
+        accounts = load_fleet(args.fleet)
+    except (OSError, ValueError, KeyError) as exc:
+        print(f"Failed to read fleet file {args.fleet}: {exc}", file=sys.stderr)
+        return 2
+
+    if args.format == "csv":
+        writer: Any = _CSVWriter(args.output, "parsed" in sections)
+    else:
+        writer = NDJSONWriter(args.output)
+    semaphore = asyncio.Semaphore(max(args.concurrency, 1))
+    latency = RollingLatency()
+    outcomes: List[Dict[str, Any]] = []
+    started = time.perf_counter()
+
+    async with aiohttp.ClientSession() as session:
+
+        async def _target(
+            account: FleetAccount, plant: Dict[str, str], auth: SolArkAuth
+        ) -> None:
+            record = await _run_target(
+                args, session, account, plant, auth, requested, semaphore
+            )
+            error = record.get("error") or {}
+            latency.add(record["elapsed_ms"] / 1000, error.get("kind"))
+            outcomes.append(record)
+            writer.write(record)
+
+        tasks = []
+        for account in accounts:
+            # One login per account, shared by all of its plants
+            auth = SolArkAuth(
+                username=account.username,
+                password=account.password,
+                base_url=account.base_url,
+                api_url=account.api_url,
+                session=session,
+                legacy_url=account.legacy_url,
+            )
+            tasks.extend(
+                asyncio.ensure_future(_target(account, plant, auth))
+                for plant in account.plants
+            )
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        finally:
+            writer.close()
+
+    return _print_summary(outcomes, latency, time.perf_counter() - started)
+
+
+async def _run_target(
+    args: Any,
+    session: Any,
+    account: FleetAccount,
+    plant: Dict[str, str],
+    auth: SolArkAuth,
+    requested: Dict[str, bool],
+    semaphore: asyncio.Semaphore,
+) -> Dict[str, Any]:
+    """Run one plant, retrying retryable failures up to ``args.retries``.
+
+    Each attempt holds a ``semaphore`` slot only while it runs, so the
+    backoff between attempts does not block other targets, and a retry
+    only re-fetches the sections that failed.
+    """
+    client = SolArkCloudAPI(
+        username=account.username,
+        password=account.password,
+        plant_id=plant["plant_id"],
+        base_url=account.base_url,
+        api_url=account.api_url,
+        session=session,
+        auth=auth,
+    )
+    record: Dict[str, Any] = {
+        "account": account.username,
+        "plant_id": plant["plant_id"],
+        "name": plant["name"],
+    }
+    start = time.perf_counter()
+    attempts = 0
+    results: Dict[str, Any] = {}
+    pending = dict(requested)
+    while True:
+        attempts += 1
+        error: Optional[SolArkCloudAPIError] = None
+        async with semaphore:
+            try:
+                results.update(await _run_sections(args, client, pending, {}))
+            except SolArkCloudAPIError as exc:
+                error = exc
+        failed = {
+            name
+            for name, value in results.items()
+            if isinstance(value, SolArkCloudAPIError)
+        }
+        if error is None and failed:
+            error = results[next(name for name, _ in SECTIONS if name in failed)]
+        if error is None or not error.retryable or attempts > args.retries:
+            break
+        if failed:
+            pending = {name: name in failed for name in requested}
+        delay = RETRY_BASE_DELAY * 2 ** (attempts - 1)
+        await asyncio.sleep(max(delay, getattr(error, "retry_after", None) or 0))
+
+    record.update(
+        ok=error is None,
+        attempts=attempts,
+        elapsed_ms=round((time.perf_counter() - start) * 1000, 1),
+        data={
+            name: value
+            for name, value in results.items()
+            if not isinstance(value, SolArkCloudAPIError)
+        },
+    )
+    if error is not None:
+        record["error"] = error.as_dict()
+    return record
+
+
+def _print_summary(
+    outcomes: List[Dict[str, Any]], latency: RollingLatency, wall: float
+) -> int:
+    """Success and latency summary to stderr; return the exit code."""
+    failed = [record for record in outcomes if not record["ok"]]
+    retried = sum(1 for record in outcomes if record["attempts"] > 1)
+    print("\n=== Fleet Summary ===", file=sys.stderr)
+    print(
+        f"targets {len(outcomes)}, ok {len(outcomes) - len(failed)}, "
+        f"failed {len(failed)}, retried {retried}, wall {wall:.1f} s",
+        file=sys.stderr,
+    )
+    stats = latency.as_dict()
+    if latency.count:
+        print(
+            f"latency p50 {stats['p50_ms']:.0f} ms, p95 {stats['p95_ms']:.0f} ms, "
+            f"p99 {stats['p99_ms']:.0f} ms",
+            file=sys.stderr,
+        )
+    for kind, count in sorted(stats["error_kinds"].items()):
+        print(f"  {kind}: {count}", file=sys.stderr)
+    if not failed:
+        return 0
+    if all(record["error"].get("retryable") for record in failed):
+        return EXIT_RETRYABLE
+    return 1
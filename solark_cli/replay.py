@@ -0,0 +1,87 @@
+"""Replay mode: run a recorded archive through the client and parser.
+
+Every cycle calls ``get_plant_data`` against a ``ReplaySession`` and parses
+the result, at full speed and without network access. The parsed snapshots
+can be written as NDJSON and diffed between versions, so a recorded
+archive doubles as a deterministic regression fixture; the summary gives
+poll and parse throughput on real data.
+"""
+from __future__ import annotations
+
+import json
+import sys
+import time
+from typing import Any, Callable, List
+
+from custom_components.solark.solark_client import SolArkCloudAPI
+from custom_components.solark.solark_errors import SolArkCloudAPIError
+from custom_components.solark.solark_recorder import ReplaySession, load_archive
+
+from .bench import _per_call_us
+
+
+async def run_replay(args: Any, report_error: Callable[[str, Exception], int]) -> int:
+    """Replay ``args.replay``; one cycle per recorded flow response by default."""
+    try:
+        header, records = load_archive(args.replay)
+    except (OSError, ValueError) as exc:
+        print(f"Failed to read archive {args.replay}: {exc}", file=sys.stderr)
+        return 2
+    plant_id = args.plant_id or (header.get("plants") or [None])[0]
+    if not plant_id:
+        print("The archive names no plant; pass --plant-id.", file=sys.stderr)
+        return 2
+
+    flows = sum(
+        1 for record in records if record.get("path", "").endswith("/flow")
+    )
+    cycles = args.count or max(flows, 1)
+    session = ReplaySession(records)
+    client = SolArkCloudAPI(
+        username="replay",
+        password="replay",
+        plant_id=str(plant_id),
+        base_url="http://replay.invalid",
+        api_url="http://replay.invalid",
+        session=session,  # type: ignore[arg-type]
+        legacy_url="http://replay.invalid",
+    )
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else None
+    combined_payloads: List[dict] = []
+    started = time.perf_counter()
+    try:
+        for _ in range(cycles):
+            combined = await client.get_plant_data()
+            combined_payloads.append(combined)
+            parsed = client.parse_plant_data(combined)
+            if output is not None:
+                output.write(
+                    json.dumps(parsed, sort_keys=True, default=str) + "\n"
+                )
+    except SolArkCloudAPIError as exc:
+        return report_error("Replay failed", exc)
+    finally:
+        if output is not None:
+            output.close()
+    elapsed = time.perf_counter() - started
+
+    parse_us = 0.0
+    if combined_payloads:
+        payloads = iter(combined_payloads * 1000)
+        parse_us = _per_call_us(
+            lambda: client.parse_plant_data(next(payloads)),
+            min(len(combined_payloads) * 100, 2000),
+        )
+    summary = {
+        "archive": args.replay,
+        "recorded": header.get("created"),
+        "exchanges": len(records),
+        "cycles": cycles,
+        "served": session.served,
+        "unmatched": dict(session.unmatched),
+        "cycles_per_s": round(cycles / elapsed, 1) if elapsed else None,
+        "parse_plant_data_us": round(parse_us, 2),
+    }
+    print(json.dumps(summary, indent=2))
+    return 1 if session.unmatched and not session.served else 0
@@ -0,0 +1,209 @@
+"""Serve mode: poll one plant and fan the latest snapshot out over local HTTP.
+
+One poll loop talks to the cloud; any number of local clients read the
+cached result, so they cost no extra cloud calls. Response bodies are
+serialized once per new snapshot and shared by every request.
+
+Endpoints:
+
+- ``GET /snapshot`` - parsed sensor values (``parse_plant_data`` shape)
+- ``GET /raw`` - combined plant data as returned by ``get_plant_data``
+- ``GET /events`` - Server-Sent Events, one ``snapshot`` event per change
+- ``GET /health`` - poll state, last error and client metrics
+
+``/snapshot`` and ``/raw`` send an ``ETag`` and answer ``If-None-Match`` with
+``304 Not Modified``. Adding ``?wait=SECONDS`` turns a matching request into
+a long poll that returns as soon as a newer snapshot arrives.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import sys
+import time
+from typing import Any, Callable, Dict, Optional
+
+from aiohttp import web
+
+from custom_components.solark.solark_errors import SolArkCloudAPIError
+
+from .watch import poll_loop, stop_on_signals
+
+# Longest accepted ?wait= for long polls, and the SSE keep-alive interval
+MAX_LONG_POLL = 300.0
+SSE_KEEPALIVE = 15.0
+
+
+def _dumps(payload: Any) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), default=str).encode()
+
+
+class SnapshotCache:
+    """Latest raw and parsed snapshot, pre-serialized, with change events."""
+
+    def __init__(self) -> None:
+        self.version = 0
+        self.etag: Optional[str] = None
+        self.bodies: Dict[str, bytes] = {}
+        self.updated_at: Optional[float] = None
+        self.polls = 0
+        self.errors = 0
+        self.last_error: Optional[Dict[str, Any]] = None
+        self.streams = 0
+        self._changed = asyncio.Event()
+
+    def publish(self, raw: Dict[str, Any], parsed: Dict[str, Any]) -> bool:
+        """Store a poll result; return whether it differs from the last one."""
+        self.polls += 1
+        self.last_error = None
+        bodies = {"raw": _dumps(raw), "snapshot": _dumps(parsed)}
+        if bodies == self.bodies:
+            return False
+        digest = hashlib.sha1(bodies["raw"] + bodies["snapshot"]).hexdigest()
+        self.bodies = bodies
+        self.etag = f'"{digest[:16]}"'
+        self.version += 1
+        self.updated_at = time.time()
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+        return True
+
+    def record_error(self, exc: SolArkCloudAPIError) -> None:
+        self.polls += 1
+        self.errors += 1
+        self.last_error = exc.as_dict()
+
+    async def wait_for_change(self, version: int, timeout: float) -> bool:
+        """Wait until a version newer than ``version`` exists."""
+        if self.version > version:
+            return True
+        changed = self._changed
+        try:
+            await asyncio.wait_for(changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+def build_app(cache: SnapshotCache, client: Any) -> web.Application:
+    """aiohttp application serving ``cache``."""
+
+    async def _cached(request: web.Request, name: str) -> web.StreamResponse:
+        if cache.etag is None:
+            raise web.HTTPServiceUnavailable(
+                text="No snapshot yet", headers={"Retry-After": "5"}
+            )
+        if request.headers.get("If-None-Match") == cache.etag:
+            try:
+                wait = min(float(request.query.get("wait", 0)), MAX_LONG_POLL)
+            except ValueError:
+                raise web.HTTPBadRequest(text="wait must be a number") from None
+            if wait <= 0 or not await cache.wait_for_change(cache.version, wait):
+                return web.Response(status=304, headers={"ETag": cache.etag})
+        return web.Response(
+            body=cache.bodies[name],
+            content_type="application/json",
+            headers={"ETag": cache.etag, "Cache-Control": "no-cache"},
+        )
+
+    async def snapshot(request: web.Request) -> web.StreamResponse:
+        return await _cached(request, "snapshot")
+
+    async def raw(request: web.Request) -> web.StreamResponse:
+        return await _cached(request, "raw")
+
+    async def events(request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse(
+            headers={
+                "Content-Type": "text/event-stream",
+                "Cache-Control": "no-cache",
+            }
+        )
+        await response.prepare(request)
+        cache.streams += 1
+        sent = 0
+        try:
+            while True:
+                if cache.version > sent:
+                    sent = cache.version
+                    await response.write(
+                        b"event: snapshot\nid: "
+                        + (cache.etag or "").encode()
+                        + b"\ndata: "
+                        + cache.bodies["snapshot"]
+                        + b"\n\n"
+                    )
+                elif not await cache.wait_for_change(sent, SSE_KEEPALIVE):
+                    await response.write(b": keep-alive\n\n")
+        except ConnectionResetError:
+            pass
+        finally:
+            cache.streams -= 1
+        return response
+
+    async def health(request: web.Request) -> web.StreamResponse:
+        age = None if cache.updated_at is None else time.time() - cache.updated_at
+        return web.json_response(
+            {
+                "version": cache.version,
+                "etag": cache.etag,
+                "updated_at": cache.updated_at,
+                "age": None if age is None else round(age, 1),
+                "polls": cache.polls,
+                "errors": cache.errors,
+                "last_error": cache.last_error,
+                "streams": cache.streams,
+                "metrics": client.metrics.as_dict(),
+            }
+        )
+
+    app = web.Application()
+    app.router.add_get("/snapshot", snapshot)
+    app.router.add_get("/raw", raw)
+    app.router.add_get("/events", events)
+    app.router.add_get("/health", health)
+    return app
+
+
+async def run_serve(
+    args: Any, client: Any, report_error: Callable[[str, Exception], int]
+) -> int:
+    """Poll until SIGINT/SIGTERM while serving the cache on args.host:args.port."""
+    base = float(args.interval)
+    maximum = max(float(args.max_interval or base * 4), base)
+    cache = SnapshotCache()
+
+    def on_snapshot(raw: Dict[str, Any], snapshot: Any, poll_ms: float) -> bool:
+        return cache.publish(raw, snapshot.as_dict())
+
+    def on_error(exc: SolArkCloudAPIError) -> None:
+        cache.record_error(exc)
+        if exc.retryable:
+            print(f"Poll failed ({exc.kind}): {exc}", file=sys.stderr)
+
+    with stop_on_signals() as stop:
+        try:
+            await client.login()
+        except SolArkCloudAPIError as exc:
+            return report_error("Login failed", exc)
+
+        runner = web.AppRunner(build_app(cache, client))
+        await runner.setup()
+        site = web.TCPSite(runner, args.host, args.port)
+        await site.start()
+        print(f"Serving on http://{args.host}:{args.port}/", file=sys.stderr)
+        try:
+            await poll_loop(client, base, maximum, stop, on_snapshot, on_error)
+        except SolArkCloudAPIError as exc:
+            return report_error("API error", exc)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            await runner.cleanup()
+            print(
+                f"Server stopped: {cache.polls} polls, {cache.version} snapshots, "
+                f"{cache.errors} failed polls",
+                file=sys.stderr,
+            )
+    return 0
@@ -0,0 +1,579 @@
+"""Local Sol-Ark cloud simulator for offline tests and benchmarks.
+
+An aiohttp application that answers the endpoints ``SolArkCloudAPI`` and
+``SolArkAuth`` use, with deterministic multi-plant, multi-inverter fixtures.
+Point a client at it with both ``api_url`` and ``legacy_url`` (legacy login
+and workdata use the latter). Latency, server errors, rate limiting and server-side
+token expiry can be injected to exercise retry and re-login paths.
+
+``GET /sim/stats`` reports request counts per route and status.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import secrets
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+from .watch import stop_on_signals
+
+# Field keys of simulated workdata records (``Name(unit)/id``)
+WORKDATA_FIELDS = {
+    "pv": "Total PV Power(W)/101",
+    "battery": "Battery Power(W)/102",
+    "grid": "Total Grid Power(W)/103",
+    "load": "Total Load Power(W)/104",
+    "soc": "SOC(%)/105",
+    "relay": "AcRelayStatus(NA)/194",
+    "temperature": "DC Temperature(℃)/57",
+}
+# Seconds between simulated workdata records
+RECORD_INTERVAL = 300
+# Advertised OAuth token lifetime (the server may expire tokens earlier)
+ADVERTISED_EXPIRES_IN = 3600
+
+
+@dataclass
+class SimulatorConfig:
+    """Fixtures and fault injection for one simulator."""
+
+    plants: int = 1
+    inverters: int = 1
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: int = 1
+    # Server-side token lifetime in seconds (None: honor the advertised one)
+    token_ttl: Optional[float] = None
+    # username -> password; None accepts any credentials
+    credentials: Optional[Dict[str, str]] = None
+    seed: int = 0
+    first_plant_id: int = 100001
+
+
+@dataclass
+class _Inverter:
+    sn: str
+    plant_id: str
+    peak: float
+    settings: Dict[str, Any] = field(default_factory=dict)
+
+
+def _default_settings(sn: str, master: bool) -> Dict[str, Any]:
+    settings: Dict[str, Any] = {
+        "sn": sn,
+        "equipMode": 1 if master else 2,
+        "safetyType": 2,
+        "battMode": -1,
+        "solarSell": 1,
+        "pvMaxLimit": 12000,
+        "energyMode": 0,
+        "peakAndVallery": 1,
+        "sysWorkMode": 2,
+        "zeroExportPower": 20,
+        "solarMaxSellPower": 9000,
+    }
+    for day in ("monday", "tuesday", "wednesday", "thursday", "friday"):
+        settings[f"{day}On"] = True
+    settings.update(saturdayOn=True, sundayOn=True)
+    for slot in range(1, 7):
+        settings[f"sellTime{slot}"] = f"{(slot - 1) * 4:02d}:00"
+        settings[f"sellTime{slot}Pac"] = 9000
+        settings[f"sellTime{slot}Volt"] = 49
+        settings[f"cap{slot}"] = 20
+        settings[f"time{slot}on"] = False
+        settings[f"genTime{slot}on"] = False
+    return settings
+
+
+class CloudSimulator:
+    """State and handlers of one simulated cloud."""
+
+    def __init__(self, config: Optional[SimulatorConfig] = None) -> None:
+        self.config = config or SimulatorConfig()
+        self.stats: Counter[str] = Counter()
+        self._tokens: Dict[str, float] = {}
+        self._random = random.Random(self.config.seed)
+        self.plants: Dict[str, List[_Inverter]] = {}
+        for p in range(self.config.plants):
+            plant_id = str(self.config.first_plant_id + p)
+            self.plants[plant_id] = [
+                _Inverter(
+                    sn=f"{plant_id}{i:03d}",
+                    plant_id=plant_id,
+                    peak=6000 + 500 * ((p + i) % 5),
+                    settings=_default_settings(f"{plant_id}{i:03d}", i == 1),
+                )
+                for i in range(1, self.config.inverters + 1)
+            ]
+        self.inverters = {
+            inverter.sn: inverter
+            for inverters in self.plants.values()
+            for inverter in inverters
+        }
+
+    # ------------------------------------------------------------------
+    # model
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def power(peak: float, when: datetime) -> Dict[str, float]:
+        """Plant power flows (W) and SOC at ``when`` for one inverter."""
+        hour = when.hour + when.minute / 60
+        pv = max(0.0, math.sin(math.pi * (hour - 6) / 12)) * peak
+        load = 700 + 500 * (1 + math.sin(math.pi * (hour - 15) / 12)) / 2
+        battery = max(-3000.0, min(3000.0, pv - load))
+        grid = load - pv + battery
+        soc = 55 + 35 * math.sin(math.pi * (hour - 9) / 12)
+        return {
+            "pv": round(pv, 1),
+            "load": round(load, 1),
+            "battery": round(battery, 1),
+            "grid": round(grid, 1),
+            "soc": round(soc, 1),
+        }
+
+    def _plant_power(self, plant_id: str, when: datetime) -> Dict[str, float]:
+        totals: Dict[str, float] = Counter()
+        inverters = self.plants[plant_id]
+        for inverter in inverters:
+            for key, value in self.power(inverter.peak, when).items():
+                totals[key] += value
+        totals["soc"] /= len(inverters)
+        return {key: round(value, 1) for key, value in totals.items()}
+
+    def _day_energy(self, peak: float, day: date) -> Dict[str, float]:
+        """kWh per flow for one inverter and day (hourly midpoint sums)."""
+        energy: Dict[str, float] = Counter()
+        for hour in range(24):
+            when = datetime.combine(day, datetime.min.time()) + timedelta(
+                hours=hour, minutes=30
+            )
+            flows = self.power(peak, when)
+            energy["pv"] += flows["pv"] / 1000
+            energy["load"] += flows["load"] / 1000
+            energy["import"] += max(flows["grid"], 0) / 1000
+            energy["export"] += max(-flows["grid"], 0) / 1000
+            energy["charge"] += max(flows["battery"], 0) / 1000
+            energy["discharge"] += max(-flows["battery"], 0) / 1000
+        return energy
+
+    def _etotal(self, peak: float, today: date) -> float:
+        # Roughly three years of production before the fixture's first day
+        return round(peak * 4.2 * 365 * 3 / 1000, 1) + today.toordinal() % 1000
+
+    # ------------------------------------------------------------------
+    # middleware and auth
+    # ------------------------------------------------------------------
+
+    @web.middleware
+    async def middleware(
+        self, request: web.Request, handler: Any
+    ) -> web.StreamResponse:
+        route = request.match_info.route.resource
+        name = route.canonical if route is not None else request.path
+        if name.startswith("/sim/"):
+            return await handler(request)
+        config = self.config
+        if config.latency or config.jitter:
+            jitter = self._random.uniform(0, config.jitter)
+            await asyncio.sleep(config.latency + jitter)
+        if self._random.random() < config.rate_limit_rate:
+            self.stats[f"{name} 429"] += 1
+            return web.json_response(
+                {"code": 429, "msg": "Too many requests"},
+                status=429,
+                headers={"Retry-After": str(config.retry_after)},
+            )
+        if self._random.random() < config.error_rate:
+            self.stats[f"{name} 500"] += 1
+            return web.Response(status=500, text="Simulated server error")
+        login = name in ("/oauth/token", "/rest/account/login")
+        if not login and not self._authorized(request):
+            self.stats[f"{name} 401"] += 1
+            return web.json_response({"code": 401, "msg": "Unauthorized"}, status=401)
+        response = await handler(request)
+        self.stats[f"{name} {response.status}"] += 1
+        return response
+
+    def _authorized(self, request: web.Request) -> bool:
+        header = request.headers.get("Authorization", "")
+        token = header[7:] if header.startswith("Bearer ") else ""
+        expiry = self._tokens.get(token)
+        return expiry is not None and time.monotonic() < expiry
+
+    def _issue_token(self) -> str:
+        token = secrets.token_hex(16)
+        ttl = self.config.token_ttl or ADVERTISED_EXPIRES_IN
+        self._tokens[token] = time.monotonic() + ttl
+        self.stats["logins"] += 1
+        return token
+
+    async def _credentials_ok(self, request: web.Request) -> bool:
+        try:
+            body = await request.json()
+        except ValueError:
+            return False
+        accounts = self.config.credentials
+        if accounts is None:
+            return bool(body.get("username"))
+        return accounts.get(body.get("username")) == body.get("password")
+
+    # ------------------------------------------------------------------
+    # handlers
+    # ------------------------------------------------------------------
+
+    async def oauth_token(self, request: web.Request) -> web.StreamResponse:
+        if not await self._credentials_ok(request):
+            return web.json_response(
+                {"code": 102, "msg": "Incorrect username or password"}
+            )
+        return web.json_response(
+            {
+                "code": 0,
+                "msg": "Success",
+                "data": {
+                    "access_token": self._issue_token(),
+                    "token_type": "bearer",
+                    "refresh_token": secrets.token_hex(16),
+                    "expires_in": ADVERTISED_EXPIRES_IN,
+                },
+            }
+        )
+
+    async def legacy_login(self, request: web.Request) -> web.StreamResponse:
+        if not await self._credentials_ok(request):
+            return web.json_response(
+                {"code": 102, "msg": "Incorrect username or password"}, status=401
+            )
+        return web.json_response({"code": 0, "data": {"token": self._issue_token()}})
+
+    def _plant_or_404(self, plant_id: str) -> List[_Inverter]:
+        inverters = self.plants.get(plant_id)
+        if inverters is None:
+            raise web.HTTPNotFound(text=f"Unknown plant {plant_id}")
+        return inverters
+
+    def _inverter_or_404(self, sn: str) -> _Inverter:
+        inverter = self.inverters.get(sn)
+        if inverter is None:
+            raise web.HTTPNotFound(text=f"Unknown inverter {sn}")
+        return inverter
+
+    def _inverter_info(self, inverter: _Inverter) -> Dict[str, Any]:
+        now = datetime.now()
+        today = self._day_energy(inverter.peak, now.date())
+        return {
+            "sn": inverter.sn,
+            "alias": f"Inverter {inverter.sn[-3:]}",
+            "plantId": inverter.plant_id,
+            "model": "SIM-12K",
+            "status": 1,
+            "pac": self.power(inverter.peak, now)["pv"],
+            "etoday": round(today["pv"], 1),
+            "etotal": self._etotal(inverter.peak, now.date()),
+        }
+
+    @staticmethod
+    def _page(items: List[Any], request: web.Request) -> Dict[str, Any]:
+        page = max(int(request.query.get("page", 1)), 1)
+        limit = max(int(request.query.get("limit", 10)), 1)
+        start = (page - 1) * limit
+        return {
+            "total": len(items),
+            "pageSize": limit,
+            "pageNumber": page,
+            "infos": items[start : start + limit],
+        }
+
+    async def plants_list(self, request: web.Request) -> web.StreamResponse:
+        now = datetime.now()
+        plants = [
+            {
+                "id": int(plant_id),
+                "name": f"Simulated plant {plant_id}",
+                "status": 1,
+                "pac": self._plant_power(plant_id, now)["pv"],
+            }
+            for plant_id in self.plants
+        ]
+        return web.json_response({"code": 0, "data": self._page(plants, request)})
+
+    async def plant_inverters(self, request: web.Request) -> web.StreamResponse:
+        inverters = self._plant_or_404(request.match_info["plant_id"])
+        infos = [self._inverter_info(inverter) for inverter in inverters]
+        return web.json_response({"code": 0, "data": self._page(infos, request)})
+
+    async def inverters_list(self, request: web.Request) -> web.StreamResponse:
+        plant_id = request.query.get("plantId", "")
+        infos = [
+            self._inverter_info(inverter)
+            for inverter in self.inverters.values()
+            if not plant_id or inverter.plant_id == plant_id
+        ]
+        return web.json_response({"code": 0, "data": self._page(infos, request)})
+
+    async def gateways_list(self, request: web.Request) -> web.StreamResponse:
+        plant_id = request.query.get("plantId", "")
+        inv_sn = request.query.get("invSn", "")
+        infos = [
+            {"sn": f"GW{inverter.sn}", "invSn": inverter.sn, "status": 1}
+            for inverter in self.inverters.values()
+            if (not plant_id or inverter.plant_id == plant_id)
+            and (not inv_sn or inverter.sn == inv_sn)
+        ]
+        return web.json_response({"code": 0, "data": self._page(infos, request)})
+
+    async def flow(self, request: web.Request) -> web.StreamResponse:
+        plant_id = request.match_info["plant_id"]
+        self._plant_or_404(plant_id)
+        flows = self._plant_power(plant_id, datetime.now())
+        return web.json_response(
+            {
+                "code": 0,
+                "data": {
+                    "pvPower": flows["pv"],
+                    "battPower": abs(flows["battery"]),
+                    "gridOrMeterPower": abs(flows["grid"]),
+                    "loadOrEpsPower": flows["load"],
+                    "soc": flows["soc"],
+                    "pvTo": flows["pv"] > 0,
+                    "toLoad": True,
+                    "toBat": flows["battery"] > 0,
+                    "batTo": flows["battery"] < 0,
+                    "gridTo": flows["grid"] > 0,
+                    "toGrid": flows["grid"] < 0,
+                    "existsMeter": False,
+                    "genOn": False,
+                },
+            }
+        )
+
+    async def energy(self, request: web.Request) -> web.StreamResponse:
+        plant_id = request.match_info["plant_id"]
+        inverters = self._plant_or_404(plant_id)
+        period = request.match_info["period"]
+        when = request.query.get("date", "")
+        labels = ("PV", "Load", "Import", "Export", "Charge", "Discharge")
+        keys = ("pv", "load", "import", "export", "charge", "discharge")
+        records: Dict[str, List[Dict[str, Any]]] = {key: [] for key in keys}
+        try:
+            if period == "day":
+                day = date.fromisoformat(when)
+                for minute in range(0, 24 * 60, 5):
+                    moment = datetime.combine(day, datetime.min.time()) + timedelta(
+                        minutes=minute
+                    )
+                    flows = self._plant_power(plant_id, moment)
+                    values = {
+                        "pv": flows["pv"],
+                        "load": flows["load"],
+                        "import": max(flows["grid"], 0),
+                        "export": max(-flows["grid"], 0),
+                        "charge": max(flows["battery"], 0),
+                        "discharge": max(-flows["battery"], 0),
+                    }
+                    stamp = moment.strftime("%H:%M")
+                    for key in keys:
+                        records[key].append({"time": stamp, "value": values[key]})
+            elif period == "month":
+                first = date.fromisoformat(f"{when}-01")
+                day = first
+                while day.month == first.month and day <= date.today():
+                    totals = self._energy_for(inverters, [day])
+                    for key in keys:
+                        records[key].append(
+                            {"time": day.isoformat(), "value": round(totals[key], 1)}
+                        )
+                    day += timedelta(days=1)
+            else:
+                year = int(when)
+                for month in range(1, 13):
+                    first = date(year, month, 1)
+                    if first > date.today():
+                        break
+                    days = [
+                        first + timedelta(days=n)
+                        for n in range(31)
+                        if (first + timedelta(days=n)).month == month
+                        and first + timedelta(days=n) <= date.today()
+                    ]
+                    totals = self._energy_for(inverters, days)
+                    for key in keys:
+                        records[key].append(
+                            {
+                                "time": first.strftime("%Y-%m"),
+                                "value": round(totals[key], 1),
+                            }
+                        )
+        except ValueError:
+            raise web.HTTPBadRequest(text=f"Invalid date {when!r}") from None
+        unit = "W" if period == "day" else "kWh"
+        infos = [
+            {"label": label, "unit": unit, "records": records[key]}
+            for label, key in zip(labels, keys)
+        ]
+        return web.json_response({"code": 0, "data": {"infos": infos}})
+
+    def _energy_for(self, inverters: List[_Inverter], days: List[date]) -> Counter:
+        totals: Counter = Counter()
+        for day in days:
+            for inverter in inverters:
+                totals.update(self._day_energy(inverter.peak, day))
+        return totals
+
+    async def live(self, request: web.Request) -> web.StreamResponse:
+        inverter = self._inverter_or_404(request.match_info["sn"])
+        flows = self.power(inverter.peak, datetime.now())
+        data: Dict[str, Any] = {"sn": inverter.sn}
+        for string in range(1, 5):
+            volt = 380.0 if flows["pv"] else 0.0
+            data[f"volt{string}"] = volt
+            data[f"current{string}"] = round(flows["pv"] / 4 / 380, 2) if volt else 0.0
+        data.update(
+            meterA=round(flows["grid"] / 2, 1),
+            meterB=round(flows["grid"] / 2, 1),
+            meterC=0,
+            curVolt=52.4,
+            chargeCurrent=round(flows["battery"] / 52.4, 1),
+            curCap=round(flows["soc"] * 2, 1),
+            batteryCap=200,
+            soc=flows["soc"],
+        )
+        return web.json_response({"code": 0, "data": data})
+
+    async def settings_read(self, request: web.Request) -> web.StreamResponse:
+        inverter = self._inverter_or_404(request.match_info["sn"])
+        return web.json_response({"code": 0, "data": dict(inverter.settings)})
+
+    async def settings_set(self, request: web.Request) -> web.StreamResponse:
+        inverter = self._inverter_or_404(request.match_info["sn"])
+        try:
+            updates = await request.json()
+        except ValueError:
+            raise web.HTTPBadRequest(text="Invalid JSON") from None
+        updates.pop("sn", None)
+        inverter.settings.update(updates)
+        return web.json_response({"code": 0, "msg": "Success"})
+
+    async def workdata(self, request: web.Request) -> web.StreamResponse:
+        query = request.query
+        inverter = self._inverter_or_404(query.get("sn", ""))
+        try:
+            day = date.fromisoformat(query.get("dateRange", "").split(",")[0])
+            page = max(int(query.get("page", 1)), 1)
+            limit = max(int(query.get("limit", 1)), 1)
+        except ValueError:
+            raise web.HTTPBadRequest(text="Invalid workdata query") from None
+        wanted = [f for f in query.get("fields", "").split(",") if f]
+
+        midnight = datetime.combine(day, datetime.min.time())
+        count = 24 * 3600 // RECORD_INTERVAL
+        if day == date.today():
+            elapsed = (datetime.now() - midnight).total_seconds()
+            count = int(elapsed // RECORD_INTERVAL) + 1
+        elif day > date.today():
+            count = 0
+        # Newest first, like the cloud
+        indexes = range(count - 1, -1, -1)[(page - 1) * limit : page * limit]
+        records = []
+        for index in indexes:
+            moment = midnight + timedelta(seconds=index * RECORD_INTERVAL)
+            flows = self.power(inverter.peak, moment)
+            values = {
+                WORKDATA_FIELDS["pv"]: flows["pv"],
+                WORKDATA_FIELDS["battery"]: flows["battery"],
+                WORKDATA_FIELDS["grid"]: flows["grid"],
+                WORKDATA_FIELDS["load"]: flows["load"],
+                WORKDATA_FIELDS["soc"]: flows["soc"],
+                WORKDATA_FIELDS["relay"]: 1,
+                WORKDATA_FIELDS["temperature"]: round(25 + flows["pv"] / 400, 1),
+            }
+            if wanted:
+                values = {key: values[key] for key in wanted if key in values}
+            records.append({"time": moment.strftime("%Y-%m-%d %H:%M:%S"), **values})
+        return web.json_response(
+            {"code": 0, "data": {"total": count, "record": records}}
+        )
+
+    async def sim_stats(self, request: web.Request) -> web.StreamResponse:
+        return web.json_response(dict(self.stats))
+
+    # ------------------------------------------------------------------
+    # application
+    # ------------------------------------------------------------------
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self.middleware])
+        add = app.router.add_route
+        add("POST", "/oauth/token", self.oauth_token)
+        add("POST", "/rest/account/login", self.legacy_login)
+        add("GET", "/api/v1/plants", self.plants_list)
+        add("GET", "/api/v1/plant/{plant_id}/inverters", self.plant_inverters)
+        add("GET", "/api/v1/inverters", self.inverters_list)
+        add("GET", "/api/v1/gateways", self.gateways_list)
+        add("GET", "/api/v1/plant/energy/{plant_id}/flow", self.flow)
+        add(
+            "GET",
+            "/api/v1/plant/energy/{plant_id}/{period:day|month|year}",
+            self.energy,
+        )
+        add("GET", "/api/v1/dy/store/{sn}/read", self.live)
+        add("GET", "/api/v1/common/setting/{sn}/read", self.settings_read)
+        add("POST", "/api/v1/common/setting/{sn}/set", self.settings_set)
+        add("GET", "/api/v1/workdata/dynamic", self.workdata)
+        add("GET", "/sim/stats", self.sim_stats)
+        return app
+
+
+async def start_simulator(
+    config: Optional[SimulatorConfig] = None, host: str = "127.0.0.1", port: int = 0
+) -> tuple[CloudSimulator, web.AppRunner, str]:
+    """Start a simulator; return it, its runner and its base URL.
+
+    ``port=0`` picks a free port. Stop it with ``await runner.cleanup()``.
+    """
+    simulator = CloudSimulator(config)
+    runner = web.AppRunner(simulator.app())
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound = runner.addresses[0][1] if runner.addresses else port
+    return simulator, runner, f"http://{host}:{bound}"
+
+
+async def run_simulator(args: Any) -> int:
+    """Serve a simulator until interrupted (``--simulate``)."""
+    config = SimulatorConfig(
+        plants=args.sim_plants,
+        inverters=args.sim_inverters,
+        latency=args.sim_latency,
+        jitter=args.sim_latency / 2,
+        error_rate=args.sim_error_rate,
+        rate_limit_rate=args.sim_rate_limit,
+        token_ttl=args.sim_token_ttl,
+    )
+    with stop_on_signals() as stop:
+        simulator, runner, url = await start_simulator(config, args.host, args.port)
+        print(
+            f"Simulated cloud on {url} (use --api-url {url} --legacy-url {url})",
+            file=sys.stderr,
+        )
+        print(f"Plants: {', '.join(simulator.plants)}", file=sys.stderr)
+        try:
+            await stop.wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            await runner.cleanup()
+            print(f"Simulator stopped: {dict(simulator.stats)}", file=sys.stderr)
+    return 0
@@ -0,0 +1,248 @@
+"""Watch mode: poll one plant and stream parsed snapshots as NDJSON."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import os
+import signal
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, TextIO
+
+from custom_components.solark.const import POLL_DEADLINE_FRACTION, POLL_DEADLINE_MIN
+from custom_components.solark.solark_deadline import deadline_scope
+from custom_components.solark.solark_errors import SolArkCloudAPIError
+
+# Interval growth while the data is unchanged, and the error backoff factor
+ADAPTIVE_FACTOR = 1.5
+ERROR_BACKOFF_FACTOR = 2.0
+
+
+class NDJSONWriter:
+    """Append compact JSON lines to stdout or a size-rotated file.
+
+    Rotation works like ``logging.handlers.RotatingFileHandler``: ``path``
+    becomes ``path.1`` (older files shift up) once it would exceed
+    ``max_bytes``, keeping at most ``backups`` old files.
+    """
+
+    def __init__(
+        self, path: Optional[str], max_bytes: int = 0, backups: int = 5
+    ) -> None:
+        self._path = Path(path) if path else None
+        self._max_bytes = max_bytes
+        self._backups = backups
+        self._stream: TextIO = sys.stdout
+        if self._path is not None:
+            self._stream = self._path.open("a", encoding="utf-8")
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, separators=(",", ":"), default=str) + "\n"
+        if self._should_rotate(len(line.encode("utf-8"))):
+            self._rotate()
+        self._stream.write(line)
+        self._stream.flush()
+
+    def close(self) -> None:
+        if self._path is not None:
+            self._stream.close()
+
+    def _should_rotate(self, size: int) -> bool:
+        if self._path is None or self._max_bytes <= 0:
+            return False
+        return self._stream.tell() + size > self._max_bytes
+
+    def _backup(self, index: int) -> Path:
+        assert self._path is not None
+        return self._path.with_name(f"{self._path.name}.{index}")
+
+    def _rotate(self) -> None:
+        assert self._path is not None
+        self._stream.close()
+        for index in range(self._backups - 1, 0, -1):
+            source = self._backup(index)
+            if source.exists():
+                os.replace(source, self._backup(index + 1))
+        if self._backups > 0:
+            os.replace(self._path, self._backup(1))
+        else:
+            self._path.unlink()
+        self._stream = self._path.open("a", encoding="utf-8")
+
+
+def next_delay(
+    base: float,
+    current: float,
+    maximum: float,
+    changed: Optional[bool],
+    retry_after: Optional[float] = None,
+) -> float:
+    """Delay before the next poll.
+
+    Unchanged data stretches the interval by ADAPTIVE_FACTOR up to
+    ``maximum``; changed data resets it to ``base``. After an error
+    (``changed`` is None) the delay doubles, but never drops below a
+    server ``retry_after``.
+    """
+    if changed is None:
+        delay = min(max(current, base) * ERROR_BACKOFF_FACTOR, maximum)
+        return max(delay, retry_after or 0.0)
+    if changed:
+        return base
+    return min(current * ADAPTIVE_FACTOR, maximum)
+
+
+def snapshot_record(
+    snapshot: Any, raw: Dict[str, Any], poll_ms: float
+) -> Dict[str, Any]:
+    """One NDJSON line: wall time, sample time, poll latency, leg status, values."""
+    return {
+        "ts": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "sampled_at": snapshot.sampled_at,
+        "poll_ms": round(poll_ms, 1),
+        "legs": raw.get("legStatus"),
+        "data": snapshot.as_dict(),
+    }
+
+
+@contextlib.contextmanager
+def stop_on_signals() -> Iterator[asyncio.Event]:
+    """Event set by SIGINT/SIGTERM while the block runs.
+
+    Where the loop has no signal support (Windows), KeyboardInterrupt still
+    ends the run.
+    """
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    signals = (signal.SIGINT, signal.SIGTERM)
+    for signum in signals:
+        with contextlib.suppress(NotImplementedError, RuntimeError):
+            loop.add_signal_handler(signum, stop.set)
+    try:
+        yield stop
+    finally:
+        for signum in signals:
+            with contextlib.suppress(NotImplementedError, RuntimeError):
+                loop.remove_signal_handler(signum)
+
+
+async def poll_snapshot(client: Any, interval: float) -> tuple[Dict[str, Any], Any]:
+    """One deadline-bounded poll: combined plant data and its snapshot."""
+    with deadline_scope(max(interval * POLL_DEADLINE_FRACTION, POLL_DEADLINE_MIN)):
+        raw = await client.get_plant_data()
+    return raw, client.parse_plant_snapshot(raw)
+
+
+async def poll_loop(
+    client: Any,
+    base: float,
+    maximum: float,
+    stop: asyncio.Event,
+    on_snapshot: Callable[[Dict[str, Any], Any, float], Optional[bool]],
+    on_error: Callable[[SolArkCloudAPIError], None],
+    *,
+    delay: float = 0.0,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    raise_fatal: bool = True,
+) -> None:
+    """Poll ``client`` until ``stop`` is set, paced by ``next_delay``.
+
+    The first poll runs after ``delay``. ``on_snapshot(raw, snapshot,
+    poll_ms)`` returns whether the data changed, or None to back off as
+    after an error; ``on_error`` sees every failed poll. Non-retryable errors
+    are re-raised unless ``raise_fatal`` is False. Setting ``stop`` cancels a
+    poll in flight. A ``semaphore`` bounds polls shared by several loops.
+    """
+    current = base
+    while not await _wait(stop, delay):
+        started = time.perf_counter()
+        poll = asyncio.ensure_future(_guarded_poll(client, base, semaphore))
+        stopper = asyncio.ensure_future(stop.wait())
+        await asyncio.wait({poll, stopper}, return_when=asyncio.FIRST_COMPLETED)
+        stopper.cancel()
+        if not poll.done():
+            poll.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await poll
+            return
+        try:
+            raw, snapshot = poll.result()
+        except SolArkCloudAPIError as exc:
+            on_error(exc)
+            if raise_fatal and not exc.retryable:
+                raise
+            current = next_delay(
+                base, current, maximum, None, getattr(exc, "retry_after", None)
+            )
+        else:
+            poll_ms = (time.perf_counter() - started) * 1000
+            changed = on_snapshot(raw, snapshot, poll_ms)
+            current = next_delay(base, current, maximum, changed)
+        delay = current
+
+
+async def _guarded_poll(
+    client: Any, interval: float, semaphore: Optional[asyncio.Semaphore]
+) -> tuple[Dict[str, Any], Any]:
+    if semaphore is None:
+        return await poll_snapshot(client, interval)
+    async with semaphore:
+        return await poll_snapshot(client, interval)
+
+
+async def _wait(stop: asyncio.Event, delay: float) -> bool:
+    """Wait up to ``delay`` seconds for ``stop``; return whether it is set."""
+    if delay > 0 and not stop.is_set():
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(stop.wait(), timeout=delay)
+    return stop.is_set()
+
+
+async def run_watch(
+    args: Any, client: Any, report_error: Callable[[str, Exception], int]
+) -> int:
+    """Poll until SIGINT/SIGTERM (or ``--count`` snapshots), one line each."""
+    base = float(args.interval)
+    maximum = max(float(args.max_interval or base * 4), base)
+    writer = NDJSONWriter(args.output, args.rotate_bytes, args.rotate_keep)
+    written = 0
+    errors = 0
+    previous = None
+
+    def on_snapshot(raw: Dict[str, Any], snapshot: Any, poll_ms: float) -> bool:
+        nonlocal written, previous
+        writer.write(snapshot_record(snapshot, raw, poll_ms))
+        written += 1
+        changed = snapshot != previous
+        previous = snapshot
+        if args.count and written >= args.count:
+            stop.set()
+        return changed
+
+    def on_error(exc: SolArkCloudAPIError) -> None:
+        nonlocal errors
+        errors += 1
+        if exc.retryable:
+            print(f"Poll failed ({exc.kind}): {exc}", file=sys.stderr)
+
+    with stop_on_signals() as stop:
+        try:
+            try:
+                await client.login()
+            except SolArkCloudAPIError as exc:
+                return report_error("Login failed", exc)
+            await poll_loop(client, base, maximum, stop, on_snapshot, on_error)
+        except SolArkCloudAPIError as exc:
+            return report_error("API error", exc)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            writer.close()
+            print(
+                f"Watch stopped: {written} snapshots, {errors} failed polls",
+                file=sys.stderr,
+            )
+    return 0
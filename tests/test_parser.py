@@ -0,0 +1,18 @@
+"""Plant parser against the reference implementation."""
+from custom_components.solark.solark_parser import PlantDataParser
+from solark_cli.bench import (
+    _sample_payloads,
+    check_parser_equivalence,
+    reference_parse_plant_data,
+)
+
+
+def test_parser_matches_reference() -> None:
+    assert check_parser_equivalence(5000) == 0
+
+
+def test_parser_repeated_calls_match_reference() -> None:
+    parser = PlantDataParser()
+    live = _sample_payloads()[1]
+    for payload in (live, dict(live, pvPower=100), live, {}, live):
+        assert parser.parse(payload) == reference_parse_plant_data(payload)
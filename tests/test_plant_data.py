@@ -0,0 +1,170 @@
+"""Poll cycles of SolArkCloudAPI.get_plant_data."""
+import asyncio
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Sequence
+
+import aiohttp
+import pytest
+
+from custom_components.solark.solark_client import LEG_ERROR, SolArkCloudAPI
+from custom_components.solark.solark_errors import (
+    SolArkAPICodeError,
+    SolArkRateLimitError,
+    SolArkServerError,
+)
+from custom_components.solark.solark_snapshot import PlantSnapshot
+from solark_cli.simulator import SimulatorConfig, start_simulator
+
+Responder = Callable[[str], Dict[str, Any]]
+
+
+def _client(respond: Responder) -> SolArkCloudAPI:
+    client = SolArkCloudAPI(
+        username="user",
+        password="secret",
+        plant_id="100001",
+        base_url="http://cloud.invalid",
+        api_url="http://cloud.invalid",
+        session=None,  # type: ignore[arg-type]
+        legacy_url="http://cloud.invalid",
+    )
+
+    async def ensure_token() -> None:
+        return None
+
+    async def request(method: str, endpoint: str, *args: Any, **kwargs: Any) -> Any:
+        return respond(endpoint)
+
+    client._auth.ensure_token = ensure_token  # type: ignore[method-assign]
+    client._request = request  # type: ignore[method-assign]
+    return client
+
+
+def _failing(exc: Exception, only: str = "") -> Responder:
+    def respond(endpoint: str) -> Dict[str, Any]:
+        if only in endpoint:
+            raise exc
+        return {"code": 0, "data": {}}
+
+    return respond
+
+
+def test_flow_failure_is_reported_as_leg_error() -> None:
+    error = SolArkServerError("HTTP 500", status=500)
+    client = _client(_failing(error, only="/flow"))
+    combined = asyncio.run(client.get_plant_data())
+    assert combined["legStatus"]["flow"] == LEG_ERROR
+    assert client.last_cycle["errors"]["flow"]["kind"] == "server"
+
+
+def test_rate_limited_cycle_raises() -> None:
+    error = SolArkRateLimitError("HTTP 429", status=429, retry_after=30)
+    client = _client(_failing(error))
+    with pytest.raises(SolArkRateLimitError) as raised:
+        asyncio.run(client.get_plant_data())
+    assert raised.value.retry_after == 30
+    assert LEG_ERROR in client.last_cycle["legs"].values()
+
+
+def test_partial_rate_limit_returns_data() -> None:
+    error = SolArkRateLimitError("HTTP 429", status=429)
+    client = _client(_failing(error, only="/inverters"))
+    combined = asyncio.run(client.get_plant_data())
+    assert combined["legStatus"]["flow"] == "ok"
+    assert combined["legStatus"]["inverters"] == LEG_ERROR
+
+
+def test_get_flow_data_keeps_empty_fallback() -> None:
+    client = _client(_failing(SolArkServerError("HTTP 500", status=500)))
+    assert asyncio.run(client.get_flow_data()) == {}
+
+
+def _poll_simulator(
+    polls: int, config: SimulatorConfig, fields: Sequence[str] = ()
+) -> List[PlantSnapshot]:
+    async def run() -> List[PlantSnapshot]:
+        _sim, runner, url = await start_simulator(config)
+        try:
+            async with aiohttp.ClientSession() as session:
+                client = SolArkCloudAPI(
+                    username="user",
+                    password="secret",
+                    plant_id=str(config.first_plant_id),
+                    base_url=url,
+                    api_url=url,
+                    session=session,
+                    legacy_url=url,
+                )
+                client.set_workdata_fields(list(fields))
+                return [
+                    client.parse_plant_snapshot(await client.get_plant_data())
+                    for _ in range(polls)
+                ]
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(run())
+
+
+def test_ac_relay_stays_current_between_records() -> None:
+    first, second = _poll_simulator(2, SimulatorConfig())
+    assert first.ac_relay_status is not None
+    assert second.ac_relay_status == first.ac_relay_status
+    assert not second.is_stale("ac_relay_status")
+
+
+def test_workdata_values_stay_current_between_records() -> None:
+    field = "DC Temperature(℃)/57"
+    first, second = _poll_simulator(2, SimulatorConfig(), fields=[field])
+    assert first.get("workdata_values")[field] is not None
+    assert second.get("workdata_values") == first.get("workdata_values")
+    assert not second.get("workdata_stale")
+
+
+def test_failed_catalog_discovery_is_throttled() -> None:
+    client = _client(lambda endpoint: {"data": {"infos": [{"sn": "S1", "model": "X"}]}})
+    calls = []
+
+    async def get_workdata(sn: str, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        calls.append(sn)
+        return {}
+
+    client.get_workdata = get_workdata  # type: ignore[method-assign]
+
+    async def discover_twice() -> None:
+        assert await client.get_workdata_catalog("S1") == {}
+        assert await client.get_workdata_catalog("S1") == {}
+
+    asyncio.run(discover_twice())
+    assert calls == ["S1"]
+
+
+def test_workdata_history_raises_on_api_error_code() -> None:
+    client = _client(lambda endpoint: {"code": 0, "data": {}})
+
+    async def send_workdata(params: Dict[str, Any]) -> Dict[str, Any]:
+        raise SolArkAPICodeError("Workdata API error", code=1)
+
+    client._send_workdata = send_workdata  # type: ignore[method-assign]
+    assert asyncio.run(client.get_workdata("S1")) == {}
+    with pytest.raises(SolArkAPICodeError):
+        asyncio.run(client.get_workdata_history("S1", date(2024, 6, 1)))
+
+
+def test_reseeded_workdata_cursor_reports_the_skipped_range() -> None:
+    client = _client(lambda endpoint: {"code": 0, "data": {}})
+    now = datetime.now(client._timezone).replace(microsecond=0)
+    old = now - timedelta(hours=3)
+
+    async def get_workdata_catalog(sn: str) -> Dict[str, Any]:
+        return {}
+
+    async def get_workdata(sn: str, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        return {"record": [{"time": now.strftime("%Y-%m-%d %H:%M:%S")}]}
+
+    client.get_workdata_catalog = get_workdata_catalog  # type: ignore[method-assign]
+    client.get_workdata = get_workdata  # type: ignore[method-assign]
+    client._workdata_cursors["S1"] = old
+    asyncio.run(client.sync_workdata("S1"))
+    assert client.pop_workdata_gap("S1") == (old, now)
+    assert client.pop_workdata_gap("S1") is None
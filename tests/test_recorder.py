@@ -0,0 +1,38 @@
+"""Archive redaction of recorded exchanges."""
+import json
+
+from custom_components.solark.solark_recorder import REDACTED, Redactor
+
+
+def test_pseudonyms_leave_payload_numbers_alone() -> None:
+    redactor = Redactor(["12345"])
+    body = {
+        "etotal": 12345.6,
+        "pv": 212345,
+        "etoday": "12345.6",
+        "id": 12345,
+        "name": "Plant 12345",
+        "infos": [{"sn": "2107000001", "note": "inverter 2107000001"}],
+    }
+    record = redactor.record(
+        {
+            "method": "GET",
+            "path": "/api/v1/plant/12345/inverters",
+            "params": {"stationId": "12345", "date": "2024-01-01"},
+            "json": {"password": "secret"},
+            "body": json.dumps(body),
+        }
+    )
+    plant = redactor.pseudonyms["12345"]
+    inverter = redactor.pseudonyms["2107000001"]
+    assert record["path"] == f"/api/v1/plant/{plant}/inverters"
+    assert record["params"] == {"stationId": plant, "date": "2024-01-01"}
+    assert record["json"] == {"password": REDACTED}
+    assert json.loads(record["body"]) == {
+        "etotal": 12345.6,
+        "pv": 212345,
+        "etoday": "12345.6",
+        "id": int(plant),
+        "name": f"Plant {plant}",
+        "infos": [{"sn": inverter, "note": f"inverter {inverter}"}],
+    }
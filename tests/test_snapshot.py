@@ -0,0 +1,20 @@
+"""PlantSnapshot change detection."""
+from custom_components.solark.solark_snapshot import PlantSnapshot
+
+
+def test_staleness_is_part_of_equality() -> None:
+    fresh = PlantSnapshot({"pv_power": 100.0}, sampled_at=1.0)
+    retained = PlantSnapshot({"pv_power": 100.0}, sampled_at=1.0, stale={"pv_power"})
+    assert fresh != retained
+    assert fresh.diff(retained) == {"pv_power"}
+    assert fresh == PlantSnapshot({"pv_power": 100.0}, sampled_at=2.0)
+
+
+def test_compact_round_trip() -> None:
+    snapshot = PlantSnapshot(
+        {"pv_power": 5.0, "grid_status": "Buy", "custom": 1}, stale={"grid_status"}
+    )
+    restored = PlantSnapshot.from_compact(snapshot.to_compact())
+    assert restored == snapshot
+    assert restored.is_stale("grid_status")
+    assert not restored.is_stale("pv_power")